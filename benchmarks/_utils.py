@@ -0,0 +1,35 @@
+import time
+from typing import Awaitable, Callable
+
+
+async def time_calls(func: Callable[[], Awaitable], calls: int, repeat: int = 5) -> float:
+    """
+    Average seconds per call of an async function, the best of repeat runs
+    """
+    # warm up caches
+    await func()
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await func()
+
+        seconds = (time.perf_counter() - start) / calls
+        if best is None or seconds < best:
+            best = seconds
+
+    return best
+
+
+def print_row(name: str, seconds: float, reads: int = None):
+    if seconds < 1e-3:
+        timing = f"{seconds * 1e9:>12,.0f} ns"
+    else:
+        timing = f"{seconds * 1e3:>12,.2f} ms"
+
+    line = f"{name:<40}{timing}"
+    if reads is not None:
+        line += f"{reads:>10,} reads"
+
+    print(line)
@@ -0,0 +1,118 @@
+"""
+Time and read count of decoding vectors and linked lists
+
+Run with ``poetry run python benchmarks/containers.py [elements]``; the containers are
+built in a SimulatedProcess with list nodes allocated in a shuffled order like a
+fragmented heap
+"""
+import asyncio
+import random
+import struct
+import sys
+
+from wizwalker.memory import HookHandler, SimulatedProcess
+from wizwalker.memory.memory_object import DynamicMemoryObject
+
+from _utils import print_row, time_calls
+
+
+CALLS = 5
+
+# offsets in the object holding the containers
+DYNAMIC_VECTOR = 0x10
+SHARED_VECTOR = 0x28
+LINKED_LIST = 0x40
+SHARED_LINKED_LIST = 0x60
+
+# next, previous, shared pointer
+NODE_SIZE = 32
+
+
+def _make_object(count: int):
+    random.seed(0)
+    process = SimulatedProcess()
+    base = process.allocate(0x1000)
+
+    vector = process.allocate(count * 8)
+    process.write_bytes(vector, struct.pack(f"<{count}q", *range(0, count * 3, 3)))
+    process.write_bytes(base + DYNAMIC_VECTOR, struct.pack("<qq", vector, vector + count * 8))
+
+    shared_vector = process.allocate(count * 16)
+    process.write_bytes(
+        shared_vector,
+        b"".join(struct.pack("<qq", 0x5000 + index, 0) for index in range(count)),
+    )
+    process.write_bytes(
+        base + SHARED_VECTOR, struct.pack("<qq", shared_vector, shared_vector + count * 16)
+    )
+
+    # the first node is the list's sentinel
+    heap = process.allocate((count + 1) * NODE_SIZE)
+    order = list(range(1, count + 1))
+    random.shuffle(order)
+    nodes = [heap] + [heap + index * NODE_SIZE for index in order]
+    for index, node in enumerate(nodes):
+        next_node = nodes[(index + 1) % len(nodes)]
+        process.write_bytes(node, struct.pack("<qqq", next_node, 0, 0x5000 + index))
+
+    process.write_bytes(base + LINKED_LIST, struct.pack("<qi", heap, count))
+    process.write_bytes(base + SHARED_LINKED_LIST, struct.pack("<qi", heap, count))
+
+    return process, DynamicMemoryObject(HookHandler(process, None), base)
+
+
+async def _read_dynamic_vector_each(memory_object: DynamicMemoryObject) -> list:
+    # how read_dynamic_vector read before, one read per element
+    start, end = await memory_object.read_vector(DYNAMIC_VECTOR, 2, "long long")
+    return [
+        await memory_object.read_typed(address, "long long")
+        for address in range(start, end, 8)
+    ]
+
+
+async def _read_shared_linked_list_each(memory_object: DynamicMemoryObject) -> list:
+    # how read_shared_linked_list read before, two reads per node
+    list_addr = await memory_object.read_value_from_offset(SHARED_LINKED_LIST, "long long")
+    list_size = await memory_object.read_value_from_offset(SHARED_LINKED_LIST + 8, "int")
+
+    addrs = []
+    next_node_addr = await memory_object.read_typed(list_addr, "long long")
+    for _ in range(list_size):
+        addrs.append(await memory_object.read_typed(next_node_addr + 16, "long long"))
+        next_node_addr = await memory_object.read_typed(next_node_addr, "long long")
+
+    return addrs
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    process, memory_object = _make_object(count)
+
+    print(f"{count:,} elements, per call")
+
+    for name, func in (
+        ("dynamic vector per element", lambda: _read_dynamic_vector_each(memory_object)),
+        ("read_dynamic_vector", lambda: memory_object.read_dynamic_vector(DYNAMIC_VECTOR)),
+        (
+            "read_shared_vector",
+            lambda: memory_object.read_shared_vector(SHARED_VECTOR, max_size=count),
+        ),
+        (
+            "shared linked list per node",
+            lambda: _read_shared_linked_list_each(memory_object),
+        ),
+        (
+            "read_shared_linked_list",
+            lambda: memory_object.read_shared_linked_list(SHARED_LINKED_LIST),
+        ),
+        ("read_linked_list", lambda: memory_object.read_linked_list(LINKED_LIST)),
+    ):
+        seconds = await time_calls(func, CALLS)
+
+        process.reads = 0
+        await func()
+        print_row(name, seconds, process.reads)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
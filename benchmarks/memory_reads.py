@@ -0,0 +1,123 @@
+"""
+Per call overhead of typed decoding and reads, and the number of reads saved by read_many
+
+Precompiled structs only speed up decoding, which the decode only rows measure;
+full reads go through read_bytes which costs more than the decode
+
+Run with ``poetry run python benchmarks/memory_reads.py``; everything is read from a
+SimulatedProcess so the results don't depend on a running client
+"""
+import asyncio
+import random
+import struct
+import timeit
+
+from wizwalker.constants import get_vector_struct, type_format_dict, type_struct_dict
+from wizwalker.memory import HookHandler, MemoryReader, SimulatedProcess
+from wizwalker.memory.memory_object import DynamicMemoryObject
+
+from _utils import print_row, time_calls
+
+
+CALLS = 100_000
+# ranges read by read_many, about the number of fields of a combat member
+RANGES = 64
+
+
+async def _read_typed_uncached(reader: MemoryReader, address: int, data_type: str):
+    # how read_typed decoded before structs were precompiled
+    format_string = type_format_dict[data_type]
+    data = await reader.read_bytes(address, struct.calcsize(format_string))
+    return struct.unpack(format_string, data)[0]
+
+
+async def _read_vector_uncached(memory_object: DynamicMemoryObject, offset: int):
+    # how read_vector decoded before structs were precompiled
+    format_string = "<" + type_format_dict["float"].replace("<", "") * 3
+    base_address = await memory_object._resolve_base_address()
+    data = await memory_object.read_bytes(
+        base_address + offset, struct.calcsize(format_string)
+    )
+    return struct.unpack(format_string, data)
+
+
+def bench_decode():
+    print("decode only, per call")
+
+    value_data = bytes(4)
+    vector_data = bytes(12)
+    float_struct = type_struct_dict["float"]
+
+    for name, statement in (
+        (
+            "format string float",
+            lambda: struct.unpack(
+                type_format_dict["float"],
+                value_data[: struct.calcsize(type_format_dict["float"])],
+            ),
+        ),
+        ("precompiled float", lambda: float_struct.unpack(value_data)),
+        (
+            "format string vector",
+            lambda: struct.unpack(
+                "<" + type_format_dict["float"].replace("<", "") * 3, vector_data
+            ),
+        ),
+        (
+            "precompiled vector",
+            lambda: get_vector_struct("float", 3).unpack(vector_data),
+        ),
+    ):
+        # best of several runs like timeit recommends
+        seconds = min(timeit.repeat(statement, number=CALLS, repeat=5)) / CALLS
+        print_row(name, seconds)
+
+
+async def bench_typed(process: SimulatedProcess, reader: MemoryReader, address: int):
+    print("\ntyped reads, per call")
+
+    memory_object = DynamicMemoryObject(HookHandler(process, None), address)
+
+    for name, func in (
+        ("format string float", lambda: _read_typed_uncached(reader, address, "float")),
+        ("read_typed float", lambda: reader.read_typed(address, "float")),
+        ("write_typed float", lambda: reader.write_typed(address, 1.0, "float")),
+        ("format string vector", lambda: _read_vector_uncached(memory_object, 0)),
+        ("read_vector 3 floats", lambda: memory_object.read_vector(0)),
+    ):
+        print_row(name, await time_calls(func, CALLS))
+
+
+async def bench_read_many(process: SimulatedProcess, reader: MemoryReader, address: int):
+    print(f"\n{RANGES} fields of one object")
+
+    random.seed(0)
+    offsets = random.sample(range(0, 0x800, 8), RANGES)
+    ranges = [(address + offset, 8) for offset in offsets]
+
+    async def _read_each():
+        return [await reader.read_bytes(*range_) for range_ in ranges]
+
+    for name, func in (
+        ("read_bytes each", _read_each),
+        ("read_many", lambda: reader.read_many(ranges, max_gap=0x100)),
+    ):
+        seconds = await time_calls(func, CALLS // 100)
+
+        process.reads = 0
+        await func()
+        print_row(name, seconds, process.reads)
+
+
+async def main():
+    process = SimulatedProcess()
+    address = process.allocate(0x1000)
+    reader = MemoryReader(process)
+
+    bench_decode()
+    await bench_typed(process, reader, address)
+    await bench_read_many(process, reader, address)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Time of full memory and module pattern scans
+
+Run with ``poetry run python benchmarks/pattern_scan.py [MiB]``; the scanned memory is
+random bytes in a SimulatedProcess with the pattern planted in every region, one match
+straddling a scan chunk boundary. The default scans 2 GiB, which needs about as much free RAM
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+import regex
+
+from wizwalker.memory import MemoryReader, SimulatedProcess
+
+from _utils import print_row
+
+
+REGION_SIZE = 16 * 1024 * 1024
+MODULE_SIZE = 32 * 1024 * 1024
+MODULE_NAME = "WizardGraphicalClient.exe"
+
+PATTERN = b"\x11\x22\x33\x44\x55\x66\x77\x88"
+WILDCARD_PATTERN = rb"\x11\x22\x33\x44..\x77\x88"
+
+
+def _make_process(total_size: int) -> SimulatedProcess:
+    random.seed(0)
+    process = SimulatedProcess()
+    noise = os.urandom(REGION_SIZE)
+
+    for index in range(max(total_size // REGION_SIZE, 1)):
+        region = process.add_region(0x10000000 + index * (REGION_SIZE + 0x10000), noise)
+        offset = random.randrange(REGION_SIZE - len(PATTERN))
+        region[offset : offset + len(PATTERN)] = PATTERN
+
+    # scans read at most 4 MiB at a time
+    region = process.regions[0x10000000]
+    region[0x400000 - 3 : 0x400000 + 5] = PATTERN
+
+    module = process.add_region(0x7FF600000000, os.urandom(MODULE_SIZE))
+    module[MODULE_SIZE // 2 : MODULE_SIZE // 2 + len(PATTERN)] = PATTERN
+    process.add_module(MODULE_NAME, 0x7FF600000000, MODULE_SIZE)
+
+    return process
+
+
+def _scan_per_region(process: SimulatedProcess, pattern: bytes) -> list:
+    # how the previous scanner searched, one read and uncompiled search per region
+    found = []
+    for address, data in process.regions.items():
+        data = process.read_bytes(address, len(data))
+        found += [
+            address + match.start() for match in regex.finditer(pattern, data, regex.DOTALL)
+        ]
+
+    return found
+
+
+async def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2048
+    process = _make_process(size * 1024 * 1024)
+    reader = MemoryReader(process)
+    # keep results out of the user's pattern cache
+    reader.use_pattern_cache = False
+
+    print(f"{size} MiB of regions, {MODULE_SIZE // 1024 // 1024} MiB module")
+
+    for name, func in (
+        ("per region scan", lambda: reader.run_in_executor(_scan_per_region, process, PATTERN)),
+        ("pattern_scan", lambda: reader.pattern_scan(PATTERN, return_multiple=True)),
+        (
+            "pattern_scan wildcard",
+            lambda: reader.pattern_scan(WILDCARD_PATTERN, return_multiple=True),
+        ),
+        ("pattern_scan module", lambda: reader.pattern_scan(PATTERN, module=MODULE_NAME)),
+        (
+            "pattern_scan_many module",
+            lambda: reader.pattern_scan_many(
+                {"exact": PATTERN, "wildcard": WILDCARD_PATTERN}, module=MODULE_NAME
+            ),
+        ),
+    ):
+        process.reads = 0
+        start = time.perf_counter()
+        await func()
+        print_row(name, time.perf_counter() - start, process.reads)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
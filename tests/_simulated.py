@@ -0,0 +1,590 @@
+"""
+Builders for client structures in a SimulatedProcess, shared by the tests
+"""
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from wizwalker import Client
+from wizwalker.combat import DuelWatcher
+from wizwalker.memory import (
+    CurrentClientObject,
+    CurrentDuel,
+    CurrentRootWindow,
+    DuelPhase,
+    HookHandler,
+    SimulatedProcess,
+    WindowIndex,
+)
+
+
+# Window
+WINDOW_NAME = 80
+WINDOW_CHILDREN = 112
+WINDOW_PARENT = 136
+WINDOW_FLAGS = 156
+WINDOW_RECTANGLE = 160
+WINDOW_TEXT = 584
+WINDOW_GRAPHICAL_SPELL = 952
+WINDOW_SPELL_GRAYED = 1024
+WINDOW_COMBAT_PARTICIPANT = 1656
+WINDOW_SIZE = 0x700
+
+# ClientObject
+GLOBAL_ID = 72
+OBJECT_TEMPLATE = 88
+TEMPLATE_ID = 96
+LOCATION = 168
+PARENT = 208
+BEHAVIORS = 224
+CHILDREN = 384
+CLIENT_OBJECT_SIZE = 0x200
+
+# WizGameObjectTemplate
+OBJECT_NAME = 96
+DISPLAY_NAME = 168
+
+# BehaviorInstance
+BEHAVIOR_TEMPLATE = 0x58
+ACTOR_BODY = 0x70
+
+# BehaviorTemplate
+BEHAVIOR_NAME = 72
+
+# ActorBody
+POSITION = 88
+
+# Duel
+DUEL_ID = 72
+PLANNING_TIMER = 144
+DISABLE_TIMER = 178
+ROUND_NUM = 188
+DUEL_SIZE = 0x400
+
+# Spell
+SPELL_ENCHANTMENT = 80
+SPELL_TEMPLATE = 120
+SPELL_TEMPLATE_ID = 128
+SPELL_SIZE = 0x180
+
+# SpellTemplate
+SPELL_NAME = 96
+SPELL_DISPLAY_NAME = 136
+SPELL_EFFECTS = 240
+SPELL_SCHOOL_NAME = 272
+SPELL_TYPE_NAME = 312
+SPELL_TEMPLATE_SIZE = 0x300
+
+# SpellEffect
+EFFECT_TYPE = 72
+EFFECT_PARAM = 76
+EFFECT_TARGET = 140
+EFFECT_LIST = 224
+EFFECT_SIZE = 0x100
+
+# CombatParticipant
+OWNER_ID = 112
+IS_PLAYER = 128
+PLAYER_HEALTH = 236
+GAME_STATS = 312
+PARTICIPANT_SIZE = 0x400
+
+# GameStats
+CURRENT_HITPOINTS = 108
+GAME_STATS_SIZE = 0x300
+
+
+class HeapProcess(SimulatedProcess):
+    """
+    SimulatedProcess that packs allocations together in large regions like a heap
+
+    Args:
+        heap_size: Size of each heap region
+    """
+
+    def __init__(self, *, heap_size: int = 0x400000):
+        super().__init__()
+        self._heap_size = heap_size
+        self._heap_next = 0
+        self._heap_end = 0
+
+    def allocate(self, size: int) -> int:
+        size = (max(size, 1) + 15) & ~15
+        if self._heap_next + size > self._heap_end:
+            region_size = max(self._heap_size, size)
+            self._heap_next = super().allocate(region_size)
+            self._heap_end = self._heap_next + region_size
+
+        address = self._heap_next
+        self._heap_next += size
+        return address
+
+
+def write_string(process: SimulatedProcess, address: int, string: str):
+    """
+    Write a std::string, strings of 16 bytes or more are put in a new allocation
+    """
+    encoded = string.encode()
+    if len(encoded) < 16:
+        process.write_bytes(address, encoded + b"\x00")
+    else:
+        data = process.allocate(len(encoded) + 1)
+        process.write_bytes(data, encoded + b"\x00")
+        process.write_bytes(address, struct.pack("<q", data))
+
+    process.write_bytes(address + 16, struct.pack("<qq", len(encoded), max(len(encoded), 15)))
+
+
+def write_wide_string(process: SimulatedProcess, address: int, string: str):
+    """
+    Write a std::wstring, strings of 8 bytes or more are put in a new allocation
+    """
+    encoded = string.encode("utf-16-le")
+    if len(encoded) < 8:
+        process.write_bytes(address, encoded + b"\x00\x00")
+    else:
+        data = process.allocate(len(encoded) + 2)
+        process.write_bytes(data, encoded + b"\x00\x00")
+        process.write_bytes(address, struct.pack("<q", data))
+
+    process.write_bytes(address + 16, struct.pack("<qq", len(string), max(len(string), 7)))
+
+
+def write_vtable(process: SimulatedProcess, type_name: str) -> int:
+    """
+    Write a vtable whose first function loads type_name like a PropertyClass's
+    """
+    # type names are read 60 bytes at a time
+    name = process.allocate(64)
+    process.write_bytes(name, type_name.encode() + b"\x00")
+
+    # the type name is loaded by a lea 63 bytes into the function
+    function = process.allocate(0x100)
+    process.write_bytes(function + 63, b"\x48\x8d\x0d")
+    process.write_bytes(function + 66, struct.pack("<i", name - (function + 63 + 7)))
+
+    vtable = process.allocate(8)
+    process.write_bytes(vtable, struct.pack("<q", function))
+    return vtable
+
+
+def write_shared_vector(process: SimulatedProcess, address: int, pointers) -> int:
+    """
+    Write a vector of shared pointers, returns the address of its elements
+    """
+    pointers = list(pointers)
+    elements = process.allocate(len(pointers) * 16)
+    process.write_bytes(
+        elements, b"".join(struct.pack("<qq", pointer, 0) for pointer in pointers)
+    )
+    process.write_bytes(
+        address, struct.pack("<qq", elements, elements + len(pointers) * 16)
+    )
+    return elements
+
+
+def write_shared_linked_list(process: SimulatedProcess, address: int, pointers):
+    """
+    Write a linked list of shared pointers, its head node holds nothing
+    """
+    pointers = list(pointers)
+    nodes = [process.allocate(32) for _ in range(len(pointers) + 1)]
+    for index, node in enumerate(nodes):
+        # next, previous
+        process.write_bytes(
+            node, struct.pack("<qq", nodes[(index + 1) % len(nodes)], nodes[index - 1])
+        )
+
+    for node, pointer in zip(nodes[1:], pointers):
+        process.write_bytes(node + 16, struct.pack("<qq", pointer, 0))
+
+    process.write_bytes(address, struct.pack("<qi", nodes[0], len(pointers)))
+
+
+class WindowTree:
+    """
+    A window tree, each window's children vector is rewritten when it changes
+
+    Args:
+        process: The process to build in, a new one if not passed
+    """
+
+    def __init__(self, process: Optional[SimulatedProcess] = None):
+        self.process = process or HeapProcess()
+        self.hook_handler = HookHandler(self.process, None)
+        self.children: Dict[int, List[int]] = {}
+        self._vtables: Dict[str, int] = {}
+        # window -> children vector elements and capacity
+        self._children_vectors: Dict[int, Tuple[int, int]] = {}
+        self.root = self.add_window(0, "WorldView")
+
+    def add_window(
+        self,
+        parent: int,
+        name: str,
+        type_name: str = "Window",
+        *,
+        flags: int = 0,
+        rectangle: Tuple[int, int, int, int] = (0, 0, 0, 0),
+        text: str = "",
+    ) -> int:
+        """
+        Add a window as the last child of parent, returns its address
+        """
+        if type_name not in self._vtables:
+            self._vtables[type_name] = write_vtable(self.process, type_name)
+
+        window = self.process.allocate(WINDOW_SIZE)
+        self.process.write_bytes(window, struct.pack("<q", self._vtables[type_name]))
+        write_string(self.process, window + WINDOW_NAME, name)
+        self.process.write_bytes(window + WINDOW_PARENT, struct.pack("<q", parent))
+        self.process.write_bytes(window + WINDOW_FLAGS, struct.pack("<I", flags))
+        self.process.write_bytes(window + WINDOW_RECTANGLE, struct.pack("<4i", *rectangle))
+        write_wide_string(self.process, window + WINDOW_TEXT, text)
+
+        self.children[window] = []
+        if parent:
+            self.children[parent].append(window)
+            self._write_children(parent)
+
+        return window
+
+    def remove_window(self, parent: int, window: int):
+        self.children[parent].remove(window)
+        self._write_children(parent)
+
+    def rename(self, window: int, name: str):
+        write_string(self.process, window + WINDOW_NAME, name)
+
+    def _write_children(self, window: int):
+        children = self.children[window]
+        elements, capacity = self._children_vectors.get(window, (0, 0))
+        # grown like a std::vector so adding a child usually only moves its end
+        if len(children) > capacity:
+            capacity = max(capacity * 2, 4)
+            elements = self.process.allocate(capacity * 16)
+            self._children_vectors[window] = elements, capacity
+
+        self.process.write_bytes(
+            elements, b"".join(struct.pack("<qq", child, 0) for child in children)
+        )
+        self.process.write_bytes(
+            window + WINDOW_CHILDREN,
+            struct.pack("<qq", elements, elements + len(children) * 16),
+        )
+
+
+class EntityWorld:
+    """
+    A root client object with entities as its children
+
+    Args:
+        process: The process to build in, a new one if not passed
+    """
+
+    def __init__(self, process: Optional[SimulatedProcess] = None):
+        self.process = process or HeapProcess()
+        self.hook_handler = HookHandler(self.process, None)
+        self.root = self.process.allocate(CLIENT_OBJECT_SIZE)
+        # the client's own object, its parent is the root
+        self.client_object = self.process.allocate(CLIENT_OBJECT_SIZE)
+        self.process.write_bytes(self.client_object + PARENT, struct.pack("<q", self.root))
+        self.entities = []
+
+        self._animation_template = self.process.allocate(0x100)
+        write_string(self.process, self._animation_template + BEHAVIOR_NAME, "AnimationBehavior")
+        self._templates = {}
+
+    def template(self, template_id: int, object_name: str, display_name: str = "") -> int:
+        """
+        Get the object template with an id, creating it if needed
+        """
+        if template_id not in self._templates:
+            template = self.process.allocate(0x100)
+            write_string(self.process, template + OBJECT_NAME, object_name)
+            write_string(self.process, template + DISPLAY_NAME, display_name)
+            self._templates[template_id] = template
+
+        return self._templates[template_id]
+
+    def add_entity(
+        self,
+        global_id: int,
+        position: Tuple[float, float, float],
+        *,
+        template_id: int = 0,
+        object_name: str = "",
+        display_name: str = "",
+        with_body: bool = True,
+    ) -> int:
+        """
+        Add an entity, returns its address
+
+        Entities with a body have their position in their actor body,
+        others only have a location
+        """
+        entity = self.process.allocate(CLIENT_OBJECT_SIZE)
+        template = self.template(template_id, object_name, display_name) if template_id else 0
+        self.process.write_bytes(
+            entity + GLOBAL_ID, struct.pack("<Q8xqQ", global_id, template, template_id)
+        )
+        self.process.write_bytes(entity + LOCATION, struct.pack("<fff", *position))
+        if with_body:
+            self.add_body(entity, position)
+
+        self.entities.append(entity)
+        self.update_children()
+        return entity
+
+    def add_body(self, entity: int, position: Tuple[float, float, float]) -> int:
+        """
+        Give an entity an AnimationBehavior with an actor body, returns the body
+        """
+        body = self.process.allocate(0x100)
+        self.move(body, position)
+
+        behavior = self.process.allocate(0x100)
+        self.process.write_bytes(
+            behavior + BEHAVIOR_TEMPLATE, struct.pack("<q", self._animation_template)
+        )
+        self.process.write_bytes(behavior + ACTOR_BODY, struct.pack("<q", body))
+        write_shared_vector(self.process, entity + BEHAVIORS, [behavior])
+        return body
+
+    def move(self, body: int, position: Tuple[float, float, float]):
+        """
+        Set the position of an actor body
+        """
+        self.process.write_bytes(body + POSITION, struct.pack("<fff", *position))
+
+    def remove_entity(self, entity: int):
+        self.entities.remove(entity)
+        self.update_children()
+
+    def update_children(self):
+        write_shared_vector(self.process, self.root + CHILDREN, self.entities)
+
+
+class LangcodeNames:
+    """
+    The part of CacheHandler that snapshots use
+
+    Args:
+        names: Langcode to name, langcodes not in it have no name
+    """
+
+    def __init__(self, names: Optional[Dict[str, str]] = None):
+        self.names = names or {}
+        self.calls = 0
+
+    async def get_langcode_names(self, langcodes: Iterable[str]) -> Dict[str, Optional[str]]:
+        self.calls += 1
+        return {langcode: self.names.get(langcode) for langcode in langcodes}
+
+
+class ClickRecorder:
+    """
+    The part of MouseHandler that combat uses, records what was clicked
+    """
+
+    def __init__(self):
+        # window addresses and names in click order
+        self.clicks = []
+
+    async def click_window(self, window, **kwargs):
+        self.clicks.append(window.base_address)
+
+    async def click_window_with_name(self, name: str, **kwargs):
+        self.clicks.append(name)
+
+    async def set_mouse_position_to_window(self, window, **kwargs):
+        pass
+
+
+class SimulatedClient(Client):
+    """
+    A Client over a SimulatedProcess with the hooks' exports already written
+
+    Set the duel with set_duel and add combat windows with add_card and add_member
+
+    Args:
+        process: The process to build in, a new one if not passed
+        global_id: Global id of the client's object
+        interval: duel_watcher's interval, its idle_interval is twice this
+    """
+
+    def __init__(
+        self,
+        process: Optional[SimulatedProcess] = None,
+        *,
+        global_id: int = 0xAA00,
+        interval: float = 0.01,
+    ):
+        # Client.__init__ opens the game's process
+        self.window_handle = 0
+        self.process = process or HeapProcess()
+        self.windows = WindowTree(self.process)
+
+        self.hook_handler = HookHandler(self.process, self)
+        self.cache_handler = LangcodeNames()
+        self.mouse_handler = ClickRecorder()
+
+        self.duel = CurrentDuel(self.hook_handler)
+        self.duel_watcher = DuelWatcher(self, interval=interval, idle_interval=interval * 2)
+        self.client_object = CurrentClientObject(self.hook_handler)
+        self.root_window = CurrentRootWindow(self.hook_handler)
+        self.window_index = WindowIndex(self.root_window)
+
+        client_object = self.process.allocate(CLIENT_OBJECT_SIZE)
+        self.process.write_bytes(client_object + GLOBAL_ID, struct.pack("<Q", global_id))
+        self.duel_address = self.process.allocate(DUEL_SIZE)
+
+        self._exports = {}
+        for name, value, format_ in (
+            ("current_root_window", self.windows.root, "<q"),
+            ("current_client", client_object, "<q"),
+            ("current_duel", 0, "<q"),
+            ("current_duel_phase", DuelPhase.ended.value, "<I"),
+        ):
+            export = self.process.allocate(8)
+            self.process.write_bytes(export, struct.pack(format_, value))
+            self.hook_handler._base_addrs[name] = export
+            self._exports[name] = export
+
+    def set_duel(
+        self,
+        *,
+        phase: Optional[DuelPhase] = None,
+        round_number: Optional[int] = None,
+        planning_timer: Optional[float] = None,
+        disable_timer: Optional[bool] = None,
+        duel_id: Optional[int] = None,
+    ):
+        """
+        Set the fields of the current duel that are passed, the first call starts it
+        """
+        self.process.write_bytes(
+            self._exports["current_duel"], struct.pack("<q", self.duel_address)
+        )
+        if phase is not None:
+            self.process.write_bytes(
+                self._exports["current_duel_phase"], struct.pack("<I", phase.value)
+            )
+
+        for offset, format_, value in (
+            (ROUND_NUM, "<i", round_number),
+            (PLANNING_TIMER, "<f", planning_timer),
+            (DISABLE_TIMER, "<?", disable_timer),
+            (DUEL_ID, "<Q", duel_id),
+        ):
+            if value is not None:
+                self.process.write_bytes(self.duel_address + offset, struct.pack(format_, value))
+
+    def spell_effect(
+        self,
+        effect_type: int,
+        effect_param: int = 0,
+        effect_target: int = 0,
+        *,
+        type_name: str = "SpellEffect",
+        effects: Iterable[int] = (),
+    ) -> int:
+        """
+        Write a spell effect, effects are held by Random and Variable effects
+        """
+        effect = self.process.allocate(EFFECT_SIZE)
+        self.process.write_bytes(effect, struct.pack("<q", self._vtable(type_name)))
+        self.process.write_bytes(
+            effect + EFFECT_TYPE, struct.pack("<ii", effect_type, effect_param)
+        )
+        self.process.write_bytes(effect + EFFECT_TARGET, struct.pack("<i", effect_target))
+        if effects:
+            write_shared_linked_list(self.process, effect + EFFECT_LIST, effects)
+
+        return effect
+
+    def spell_template(
+        self,
+        name: str,
+        type_name: str,
+        effects: Iterable[int] = (),
+        *,
+        display_name_code: str = "",
+        school_name: str = "Fire",
+    ) -> int:
+        """
+        Write a spell template
+        """
+        template = self.process.allocate(SPELL_TEMPLATE_SIZE)
+        write_string(self.process, template + SPELL_NAME, name)
+        write_string(self.process, template + SPELL_DISPLAY_NAME, display_name_code)
+        write_string(self.process, template + SPELL_SCHOOL_NAME, school_name)
+        write_string(self.process, template + SPELL_TYPE_NAME, type_name)
+        write_shared_vector(self.process, template + SPELL_EFFECTS, effects)
+        return template
+
+    def add_card(
+        self,
+        parent: int,
+        template: int,
+        template_id: int,
+        *,
+        visible: bool = True,
+        grayed: bool = False,
+        enchantment: int = 0,
+    ) -> int:
+        """
+        Add a card's SpellCheckBox window as the last child of parent, returns the window
+        """
+        spell = self.process.allocate(SPELL_SIZE)
+        self.process.write_bytes(spell + SPELL_ENCHANTMENT, struct.pack("<I", enchantment))
+        self.process.write_bytes(
+            spell + SPELL_TEMPLATE, struct.pack("<qI", template, template_id)
+        )
+
+        window = self.windows.add_window(
+            parent, "", "SpellCheckBox", flags=1 if visible else 0
+        )
+        self.process.write_bytes(window + WINDOW_GRAPHICAL_SPELL, struct.pack("<q", spell))
+        self.process.write_bytes(window + WINDOW_SPELL_GRAYED, struct.pack("<?", grayed))
+        return window
+
+    def add_member(
+        self,
+        name: str,
+        owner_id: int,
+        *,
+        is_player: bool = False,
+        hitpoints: int = 500,
+    ) -> int:
+        """
+        Add a member's CombatantControl window to the root window, returns the window
+
+        The member's name is in a Name window nested in the control like the game's
+        """
+        stats = self.process.allocate(GAME_STATS_SIZE)
+        self.process.write_bytes(stats + CURRENT_HITPOINTS, struct.pack("<i", hitpoints))
+
+        participant = self.process.allocate(PARTICIPANT_SIZE)
+        self.process.write_bytes(participant + OWNER_ID, struct.pack("<Q", owner_id))
+        self.process.write_bytes(participant + IS_PLAYER, struct.pack("<?", is_player))
+        self.process.write_bytes(participant + PLAYER_HEALTH, struct.pack("<i", hitpoints))
+        self.process.write_bytes(participant + GAME_STATS, struct.pack("<q", stats))
+
+        control = self.windows.add_window(
+            self.windows.root, "CombatantControl", "CombatantDataControl", flags=1
+        )
+        self.process.write_bytes(
+            control + WINDOW_COMBAT_PARTICIPANT, struct.pack("<q", participant)
+        )
+        inner = self.windows.add_window(control, "Inner")
+        self.windows.add_window(inner, "Health", "ControlText")
+        self.windows.add_window(inner, "Name", "ControlText", text=name)
+        return control
+
+    def _vtable(self, type_name: str) -> int:
+        # shared with the window tree's so each type has one vtable
+        vtables = self.windows._vtables
+        if type_name not in vtables:
+            vtables[type_name] = write_vtable(self.process, type_name)
+
+        return vtables[type_name]
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from wizwalker.combat import CombatCoordinator, CombatHandler, RoundBudget
+from wizwalker.memory import DuelPhase
+
+from _simulated import SimulatedClient
+
+
+class CountingHandler(CombatHandler):
+    def __init__(self, client, *, delay: float = 0.0, fail: bool = False):
+        super().__init__(client)
+        self.delay = delay
+        self.fail = fail
+        self.snapshots = 0
+        # (round number, name of the client's member) of each handled round
+        self.rounds = []
+
+    async def get_combat_snapshot(self, **kwargs):
+        self.snapshots += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("snapshot failed")
+
+        return await super().get_combat_snapshot(**kwargs)
+
+    async def handle_round(self):
+        self.rounds.append(
+            (self.shared_round.round_number, self.shared_round.client_member.name)
+        )
+
+
+def _make_clients(count: int = 3):
+    global_ids = [0xAA00 + index for index in range(count)]
+    clients = []
+    for global_id in global_ids:
+        client = SimulatedClient(global_id=global_id)
+        client.set_duel(
+            phase=DuelPhase.planning, round_number=1, planning_timer=30.0, duel_id=9
+        )
+        for index, member_id in enumerate(global_ids):
+            client.add_member(f"Wizard {index}", member_id, is_player=True)
+
+        clients.append(client)
+
+    return clients
+
+
+def test_shared_round_read_once():
+    handlers = [CountingHandler(client, delay=0.01) for client in _make_clients()]
+    coordinator = CombatCoordinator(handlers)
+
+    async def _get(round_number: int):
+        budget = RoundBudget(round_number, 30.0, duel_id=9)
+        return await asyncio.gather(
+            *(coordinator._get_shared_round(handler, budget) for handler in handlers)
+        )
+
+    async def _rounds():
+        return await _get(1), await _get(1), await _get(2)
+
+    first, again, second = asyncio.run(_rounds())
+
+    assert first[0] is first[1] is first[2] is again[0]
+    assert (first[0].duel_id, first[0].round_number) == (9, 1)
+    assert [member.name for member in first[0].members] == [
+        "Wizard 0",
+        "Wizard 1",
+        "Wizard 2",
+    ]
+    assert second[0].round_number == 2
+    # once for each round
+    assert sum(handler.snapshots for handler in handlers) == 2
+    # earlier rounds are dropped once a later one is read
+    assert list(coordinator._rounds) == [(9, 2)]
+
+
+def _read_after_first(first: CountingHandler, second: CountingHandler, *, cancel: bool):
+    coordinator = CombatCoordinator([first, second])
+
+    async def _read():
+        budget = RoundBudget(1, 30.0, duel_id=9)
+        first_read = asyncio.ensure_future(coordinator._get_shared_round(first, budget))
+        await asyncio.sleep(0.02)
+        # waits for the first read
+        second_read = asyncio.ensure_future(coordinator._get_shared_round(second, budget))
+        await asyncio.sleep(0.02)
+        if cancel:
+            first_read.cancel()
+
+        shared_round = await asyncio.wait_for(second_read, 1)
+        with pytest.raises((asyncio.CancelledError, RuntimeError)):
+            await first_read
+
+        return shared_round
+
+    return asyncio.run(_read())
+
+
+@pytest.mark.parametrize("cancel", (False, True))
+def test_shared_round_survives_first_client(cancel):
+    first_client, second_client = _make_clients(2)
+    # the first read fails or is cancelled before it finishes
+    first = CountingHandler(first_client, delay=0.1, fail=not cancel)
+    second = CountingHandler(second_client)
+
+    shared_round = _read_after_first(first, second, cancel=cancel)
+
+    assert (first.snapshots, second.snapshots) == (1, 1)
+    assert shared_round.round_number == 1
+    assert len(shared_round.members) == 2
+
+
+def test_handle_combat():
+    clients = _make_clients()
+    handlers = [CountingHandler(client) for client in clients]
+
+    async def _end_combat():
+        # the last client to handle the round ends the duel
+        while not all(handler.rounds for handler in handlers):
+            await asyncio.sleep(0.01)
+
+        for client in clients:
+            client.set_duel(phase=DuelPhase.ended)
+
+    async def _combat():
+        await asyncio.gather(
+            asyncio.wait_for(CombatCoordinator(handlers).handle_combat(), 2),
+            _end_combat(),
+        )
+
+    asyncio.run(_combat())
+
+    assert sum(handler.snapshots for handler in handlers) == 1
+    # each client is given its own member
+    assert [handler.rounds for handler in handlers] == [
+        [(1, "Wizard 0")],
+        [(1, "Wizard 1")],
+        [(1, "Wizard 2")],
+    ]
+    assert all(handler.shared_round is None for handler in handlers)
+    assert [len(handler.round_metrics) for handler in handlers] == [1, 1, 1]
@@ -0,0 +1,155 @@
+import asyncio
+
+from wizwalker.combat import CombatHandler
+from wizwalker.memory import DuelPhase, EffectTarget, SpellEffects
+
+from _simulated import SimulatedClient
+
+
+def _make_combat():
+    client = SimulatedClient(global_id=0xAA00)
+    client.set_duel(phase=DuelPhase.planning, round_number=3)
+    client.cache_handler.names = {"Spells_Meteor": "Meteor", "Spells_Sharpen": "Sharpened Blade"}
+
+    damage = SpellEffects.damage.value
+    enemy_team = EffectTarget.enemy_team.value
+    meteor = client.spell_template(
+        "Meteor",
+        "AOE",
+        [client.spell_effect(damage, 300, enemy_team)],
+        display_name_code="Spells_Meteor",
+    )
+    random_aoe = client.spell_template(
+        "RandomAoe",
+        "AOE",
+        [
+            client.spell_effect(
+                0,
+                type_name="RandomSpellEffect",
+                effects=[
+                    client.spell_effect(damage, 100, enemy_team),
+                    client.spell_effect(damage, 200, enemy_team),
+                ],
+            )
+        ],
+    )
+    sharpen = client.spell_template(
+        "Sharpen",
+        "Enchantment",
+        [client.spell_effect(SpellEffects.modify_card_damage.value, 100)],
+        display_name_code="Spells_Sharpen",
+    )
+    bolt = client.spell_template(
+        "Bolt", "Attack", [client.spell_effect(damage, 200, EffectTarget.enemy_single.value)]
+    )
+
+    hand = client.windows.add_window(client.windows.root, "Hand", flags=1)
+    # added left to right so the snapshot has them right to left
+    cards = [
+        client.add_card(hand, bolt, 4, grayed=True),
+        client.add_card(hand, meteor, 1, enchantment=77),
+        client.add_card(hand, sharpen, 3),
+        client.add_card(hand, meteor, 1, visible=False),
+        client.add_card(hand, random_aoe, 2),
+    ]
+    members = [
+        client.add_member("Wizard", 0xAA00, is_player=True),
+        client.add_member("Goblin", 0xBB00),
+        client.add_member("Dead Goblin", 0xBB01, hitpoints=0),
+    ]
+    return client, cards, members
+
+
+def test_capture_cards():
+    client, cards, _ = _make_combat()
+    handler = CombatHandler(client)
+
+    snapshot = asyncio.run(handler.get_combat_snapshot(members=False))
+
+    assert snapshot.round_number == 3
+    assert snapshot.members == []
+    # hidden cards are left out
+    assert [card.window_address for card in snapshot.cards] == [
+        cards[4],
+        cards[2],
+        cards[1],
+        cards[0],
+    ]
+    assert [card.name for card in snapshot.cards] == ["RandomAoe", "Sharpen", "Meteor", "Bolt"]
+    assert [card.display_name for card in snapshot.cards] == [
+        "",
+        "Sharpened Blade",
+        "Meteor",
+        "",
+    ]
+    assert [card.is_castable for card in snapshot.cards] == [True, True, True, False]
+    assert [card.is_enchanted for card in snapshot.cards] == [False, False, True, False]
+    assert [card.spell.template_id for card in snapshot.cards] == [2, 3, 1, 4]
+
+    random_effect = snapshot.cards[0].effects[0]
+    assert random_effect.type_name == "RandomSpellEffect"
+    assert [effect.fields.effect_param for effect in random_effect.effects] == [100, 200]
+
+    async def _legacy_cards():
+        return [
+            (card._spell_window.base_address, await card.name())
+            for card in await handler.get_cards()
+        ]
+
+    # the same cards in the same order as reading them one by one
+    assert asyncio.run(_legacy_cards()) == [
+        (card.window_address, card.name) for card in snapshot.cards
+    ]
+
+
+def test_capture_members():
+    client, _, members = _make_combat()
+    handler = CombatHandler(client)
+
+    snapshot = asyncio.run(handler.get_combat_snapshot(cards=False))
+
+    assert snapshot.cards == []
+    assert [member.window_address for member in snapshot.members] == members
+    assert [member.name for member in snapshot.members] == ["Wizard", "Goblin", "Dead Goblin"]
+    assert [member.is_client for member in snapshot.members] == [True, False, False]
+    assert [member.is_dead for member in snapshot.members] == [False, False, True]
+    assert snapshot.client_member == snapshot.members[0]
+    assert snapshot.members[0].is_player and snapshot.members[1].is_monster
+    assert snapshot.members[1].participant.player_health == 500
+
+    async def _legacy_members():
+        return [
+            (member._combatant_control.base_address, await member.name())
+            for member in await handler.get_members()
+        ]
+
+    # the same members and names as reading them one by one
+    assert asyncio.run(_legacy_members()) == [
+        (member.window_address, member.name) for member in snapshot.members
+    ]
+
+
+def test_find():
+    client, cards, _ = _make_combat()
+    snapshot = asyncio.run(CombatHandler(client).get_combat_snapshot())
+
+    assert [card.name for card in snapshot.find_cards(type_name="AOE")] == [
+        "RandomAoe",
+        "Meteor",
+    ]
+    assert [card.name for card in snapshot.find_cards(name="bolt")] == ["Bolt"]
+    assert [card.name for card in snapshot.find_cards(display_name="blade")] == ["Sharpen"]
+    assert snapshot.find_cards(name="missing") == []
+
+    assert [member.name for member in snapshot.find_members(name="goblin")] == [
+        "Goblin",
+        "Dead Goblin",
+    ]
+    assert snapshot.find_members(predicate=lambda member: member.is_dead)[0].name == (
+        "Dead Goblin"
+    )
+
+    assert [card.name for card in snapshot.damaging_aoes()] == ["RandomAoe", "Meteor"]
+    assert [card.name for card in snapshot.damaging_aoes(check_enchanted=True)] == ["Meteor"]
+    assert [card.name for card in snapshot.damage_enchants()] == ["Sharpen"]
+    assert snapshot.card(snapshot.cards[0])._spell_window.base_address == cards[4]
@@ -0,0 +1,113 @@
+import asyncio
+
+from wizwalker.combat import DuelState
+from wizwalker.memory import DuelPhase
+
+from _simulated import SimulatedClient
+
+
+async def _later(coroutine, delay: float = 0.05):
+    # let the watcher tick a few times before the change
+    await asyncio.sleep(delay)
+    return await coroutine
+
+
+async def _change(client: SimulatedClient, **fields):
+    client.set_duel(**fields)
+
+
+def test_wait_for_phase():
+    client = SimulatedClient()
+    client.set_duel(phase=DuelPhase.pre_planning, round_number=1)
+
+    async def _wait():
+        waiter = asyncio.create_task(
+            client.duel_watcher.wait_for_phase(DuelPhase.planning, timeout=1)
+        )
+        await _later(_change(client, phase=DuelPhase.planning))
+        return await waiter
+
+    state = asyncio.run(_wait())
+
+    assert state == DuelState(client.duel_address, DuelPhase.planning, 1)
+    assert not client.duel_watcher.running
+
+
+def test_wait_for_round_change():
+    client = SimulatedClient()
+    client.set_duel(phase=DuelPhase.planning, round_number=1)
+
+    async def _wait(**fields):
+        waiter = asyncio.create_task(client.duel_watcher.wait_for_round_change(1, timeout=1))
+        await _later(_change(client, **fields))
+        return await waiter
+
+    async def _wait_both():
+        next_round = await _wait(round_number=2)
+        client.set_duel(round_number=1)
+        # also wakes when combat ends
+        ended = await _wait(phase=DuelPhase.ended)
+        return next_round, ended
+
+    next_round, ended = asyncio.run(_wait_both())
+
+    assert (next_round.phase, next_round.round_number) == (DuelPhase.planning, 2)
+    assert not ended.in_combat
+    assert ended.round_number == 1
+
+
+def test_wait_for_combat():
+    client = SimulatedClient()
+
+    async def _wait():
+        waiter = asyncio.create_task(client.duel_watcher.wait_for_combat(timeout=1))
+        await _later(_change(client, phase=DuelPhase.starting, round_number=0))
+        return await waiter
+
+    state = asyncio.run(_wait())
+
+    assert state.base_address == client.duel_address
+    assert state.in_combat
+
+
+def test_unreadable_phase_is_out_of_combat():
+    client = SimulatedClient()
+    client.set_duel(phase=DuelPhase.planning, round_number=1)
+    # not a DuelPhase
+    client.process.write_bytes(
+        client.hook_handler._base_addrs["current_duel_phase"], (99).to_bytes(4, "little")
+    )
+
+    state = asyncio.run(client.duel_watcher.wait_for(lambda state: True, timeout=1))
+
+    assert not state.in_combat
+    assert state.base_address == 0
+
+
+def test_events():
+    client = SimulatedClient()
+    client.set_duel(phase=DuelPhase.planning, round_number=1)
+
+    async def _events():
+        events = []
+
+        async def _collect():
+            async for event in client.duel_watcher.events():
+                events.append(event)
+                if len(events) == 2:
+                    return
+
+        collector = asyncio.create_task(_collect())
+        await _later(_change(client, phase=DuelPhase.execution))
+        await _later(_change(client, phase=DuelPhase.planning, round_number=2))
+        await asyncio.wait_for(collector, 1)
+        return events
+
+    phase_event, round_event = asyncio.run(_events())
+
+    assert phase_event.phase_changed and not phase_event.round_changed
+    assert phase_event.current.phase is DuelPhase.execution
+    assert round_event.phase_changed and round_event.round_changed
+    assert round_event.previous.round_number == 1
+    assert round_event.current.round_number == 2
+    assert not round_event.base_changed
@@ -0,0 +1,103 @@
+import asyncio
+import random
+
+import pytest
+
+from wizwalker import XYZ
+from wizwalker.memory.memory_objects.client_object import DynamicClientObject
+from wizwalker.memory.memory_objects.entity_index import EntityIndex
+
+from _simulated import EntityWorld
+
+
+def _make_index(count: int, *, cell_size: float = 250.0):
+    random.seed(0)
+    world = EntityWorld()
+    positions = {}
+    for global_id in range(count):
+        position = (random.uniform(-5000, 5000), random.uniform(-5000, 5000), 0.0)
+        entity = world.add_entity(
+            global_id + 1,
+            position,
+            template_id=global_id % 3 + 1,
+            with_body=global_id % 4 != 0,
+        )
+        positions[entity] = XYZ(*position)
+
+    index = EntityIndex(
+        DynamicClientObject(world.hook_handler, world.client_object), cell_size=cell_size
+    )
+    asyncio.run(index.refresh())
+    return world, index, positions
+
+
+def _by_distance(positions, xyz: XYZ):
+    return sorted(
+        (
+            (position.x - xyz.x) ** 2 + (position.y - xyz.y) ** 2 + (position.z - xyz.z) ** 2,
+            entity,
+        )
+        for entity, position in positions.items()
+    )
+
+
+def test_queries_match_brute_force():
+    _, index, positions = _make_index(300)
+    assert len(index) == 300
+
+    random.seed(1)
+    for _ in range(50):
+        xyz = XYZ(random.uniform(-6000, 6000), random.uniform(-6000, 6000), 0.0)
+        by_distance = _by_distance(positions, xyz)
+
+        count = random.randint(1, 10)
+        nearest = [record.address for record in index.nearest(xyz, count)]
+        assert nearest == [entity for _, entity in by_distance[:count]]
+
+        # the largest radius covers more cells than the index holds
+        radius = random.choice([10.0, 400.0, 2000.0, 50_000.0])
+        within = [record.address for record in index.within_radius(xyz, radius)]
+        assert within == [
+            entity for distance, entity in by_distance if distance <= radius ** 2
+        ]
+
+
+def test_nearest_rejects_bad_count():
+    _, index, _ = _make_index(10)
+
+    with pytest.raises(ValueError):
+        index.nearest(XYZ(0, 0, 0), 0)
+
+
+def test_refresh_tracks_changes():
+    world, index, _ = _make_index(20)
+    moved, removed = world.entities[1], world.entities[2]
+    body = index.get(moved).actor_body
+
+    world.move(body, (9000.0, 9000.0, 0.0))
+    world.remove_entity(removed)
+    added = world.add_entity(100, (-9000.0, -9000.0, 0.0))
+    asyncio.run(index.refresh())
+
+    assert len(index) == 20
+    assert index.get(removed) is None
+    assert index.nearest(XYZ(9000, 9000, 0), 1)[0].address == moved
+    assert index.nearest(XYZ(-9000, -9000, 0), 1)[0].address == added
+
+
+def test_refresh_recaptures_entities_without_body():
+    world, index, _ = _make_index(4)
+    entity = world.entities[0]
+    assert index.get(entity).actor_body == 0
+
+    body = world.add_body(entity, (9000.0, 9000.0, 0.0))
+    asyncio.run(index.refresh())
+
+    assert index.get(entity).actor_body == body
+    assert index.nearest(XYZ(9000, 9000, 0), 1)[0].address == entity
+
+    # the body is read directly from now on
+    world.move(body, (-9000.0, 9000.0, 0.0))
+    asyncio.run(index.refresh())
+
+    assert index.nearest(XYZ(-9000, 9000, 0), 1)[0].address == entity
@@ -0,0 +1,91 @@
+import asyncio
+
+from wizwalker import XYZ
+from wizwalker.memory.memory_objects.client_object import DynamicClientObject
+from wizwalker.memory.memory_objects.entity_snapshot import EntitySnapshot
+
+from _simulated import EntityWorld, LangcodeNames
+
+
+def _make_world():
+    world = EntityWorld()
+    world.add_entity(
+        1,
+        (10.0, 0.0, 0.0),
+        template_id=7,
+        object_name="Mob_GoblinWarrior_Large",
+        display_name="MobNames_Goblin",
+    )
+    world.add_entity(
+        2,
+        (20.0, 0.0, 0.0),
+        template_id=7,
+        object_name="Mob_GoblinWarrior_Large",
+        display_name="MobNames_Goblin",
+        with_body=False,
+    )
+    world.add_entity(
+        3, (-5.0, 5.0, 0.0), template_id=8, object_name="Npc", display_name="NpcNames_Bob"
+    )
+    world.add_entity(4, (100.0, 100.0, 0.0))
+    return world
+
+
+def _capture(world: EntityWorld, **kwargs) -> EntitySnapshot:
+    root = DynamicClientObject(world.hook_handler, world.root)
+    return asyncio.run(EntitySnapshot.capture(root, **kwargs))
+
+
+def test_capture():
+    world = _make_world()
+    cache_handler = LangcodeNames({"MobNames_Goblin": "Goblin Warrior"})
+
+    snapshot = _capture(world, cache_handler=cache_handler)
+
+    assert [record.address for record in snapshot] == world.entities
+    assert [record.global_id for record in snapshot] == [1, 2, 3, 4]
+    assert [record.template_id for record in snapshot] == [7, 7, 8, 0]
+    assert [record.object_name for record in snapshot] == [
+        "Mob_GoblinWarrior_Large",
+        "Mob_GoblinWarrior_Large",
+        "Npc",
+        "",
+    ]
+    # langcodes without a name are left empty
+    assert [record.display_name for record in snapshot] == [
+        "Goblin Warrior",
+        "Goblin Warrior",
+        "",
+        "",
+    ]
+    assert cache_handler.calls == 1
+
+    # entities without a body are at their location
+    assert [
+        (record.position.x, record.position.y, record.position.z) for record in snapshot
+    ] == [(10.0, 0.0, 0.0), (20.0, 0.0, 0.0), (-5.0, 5.0, 0.0), (100.0, 100.0, 0.0)]
+    assert snapshot[0].actor_body and not snapshot[1].actor_body
+
+
+def test_capture_addresses():
+    world = _make_world()
+
+    snapshot = _capture(world, addresses=world.entities[2:] + [0])
+
+    assert [record.global_id for record in snapshot] == [3, 4]
+    assert snapshot[0].display_name_code == "NpcNames_Bob"
+    assert snapshot[0].display_name == ""
+
+
+def test_find_and_nearest():
+    world = _make_world()
+    snapshot = _capture(world, cache_handler=LangcodeNames({"NpcNames_Bob": "Bob"}))
+
+    assert snapshot.find(object_name="Mob_GoblinWarrior_Large") == [0, 1]
+    assert snapshot.find(object_name="missing") == []
+    assert snapshot.find(display_name="bOB") == [2]
+    assert snapshot.find(template_id=7, predicate=lambda record: record.global_id == 2) == [1]
+
+    assert snapshot.nearest(XYZ(0, 0, 0), 2) == [2, 0]
+    assert snapshot.nearest(XYZ(0, 0, 0), 1, rows=snapshot.find(template_id=7)) == [0]
+    assert snapshot.entity(3).base_address == world.entities[3]
@@ -0,0 +1,333 @@
+import asyncio
+import struct
+from array import array
+from enum import Enum
+
+import pytest
+
+from wizwalker import ReadingEnumFailed
+from wizwalker.memory import HookHandler, SimulatedProcess
+from wizwalker.memory.memory_object import (
+    DynamicMemoryObject,
+    MemoryField,
+    SnapshotLayout,
+)
+
+from _simulated import write_string
+
+
+class Color(Enum):
+    red = 1
+    blue = 2
+
+
+class Thing(DynamicMemoryObject):
+    snapshot_fields = (
+        MemoryField("position", 0x20, "float", 3),
+        MemoryField("health", 0x10, "int"),
+        MemoryField("color", 0x14, "int", enum=Color),
+        MemoryField("flags", 0x40, "unsigned char"),
+    )
+
+
+class SubThing(Thing):
+    pass
+
+
+def _make_things(count: int, *, spacing: int = 0x80):
+    process = SimulatedProcess()
+    hook_handler = HookHandler(process, None)
+    base = process.allocate(count * spacing)
+
+    addresses = []
+    for index in range(count):
+        address = base + index * spacing
+        process.write_bytes(address + 0x10, struct.pack("<ii", 100 + index, 1))
+        process.write_bytes(address + 0x20, struct.pack("<fff", index, 2.0, 3.0))
+        process.write_bytes(address + 0x40, bytes([index]))
+        addresses.append(address)
+
+    return process, hook_handler, addresses
+
+
+def test_snapshot_reads_once():
+    process, hook_handler, addresses = _make_things(1)
+    process.reads = 0
+
+    record = asyncio.run(Thing(hook_handler, addresses[0]).snapshot())
+
+    assert process.reads == 1
+    assert record == (100, Color.red, (0.0, 2.0, 3.0), 0)
+    assert (record.health, record.color, record.position, record.flags) == (
+        100,
+        Color.red,
+        (0.0, 2.0, 3.0),
+        0,
+    )
+    assert type(record).__name__ == "ThingSnapshot"
+
+
+def test_snapshot_layout_is_inherited():
+    assert SubThing._get_snapshot_layout() is Thing._get_snapshot_layout()
+    assert SubThing.get_snapshot_field("health") == MemoryField("health", 0x10, "int")
+
+    with pytest.raises(ValueError):
+        SubThing.get_snapshot_field("mana")
+
+
+def test_snapshot_layout_rejects_overlaps():
+    with pytest.raises(ValueError):
+        SnapshotLayout(
+            "Overlapping", (MemoryField("a", 0, "long long"), MemoryField("b", 4, "int"))
+        )
+
+
+def test_snapshot_bad_enum_raises():
+    process, hook_handler, addresses = _make_things(1)
+    process.write_bytes(addresses[0] + 0x14, struct.pack("<i", 7))
+
+    with pytest.raises(ReadingEnumFailed):
+        asyncio.run(Thing(hook_handler, addresses[0]).snapshot())
+
+
+def test_snapshot_many():
+    process, hook_handler, addresses = _make_things(16)
+    # a bad enum and an unmapped address are left out
+    process.write_bytes(addresses[3] + 0x14, struct.pack("<i", 7))
+    addresses.append(addresses[-1] + 0x100000)
+    process.reads = 0
+
+    records = asyncio.run(Thing.snapshot_many(hook_handler, addresses))
+
+    # the mapped objects are next to each other so they are read together
+    assert process.reads == 2
+    assert records[3] is None and records[-1] is None
+    assert [record.health for record in records if record is not None] == [
+        100 + index for index in range(16) if index != 3
+    ]
+
+
+class PointedThing(Thing):
+    def __init__(self, hook_handler: HookHandler, pointer: int):
+        super().__init__(hook_handler, pointer)
+        self.base_reads = 0
+
+    async def read_base_address(self) -> int:
+        self.base_reads += 1
+        return await self.read_typed(self.base_address, "long long")
+
+
+def _make_pointed_thing():
+    process, hook_handler, addresses = _make_things(2)
+    pointer = process.allocate(8)
+    process.write_bytes(pointer, struct.pack("<q", addresses[0]))
+    return process, PointedThing(hook_handler, pointer), addresses, pointer
+
+
+def test_pin_reads_base_address_once():
+    _, thing, addresses, _ = _make_pointed_thing()
+
+    async def _read_pinned():
+        async with thing.pinned() as base_address:
+            assert thing.is_pinned
+            # nested pins share the outer pin's address
+            async with thing.pinned():
+                values = [
+                    await thing.read_value_from_offset(0x10, "int"),
+                    await thing.read_value_from_offset(0x40, "unsigned char"),
+                ]
+
+            assert thing.is_pinned
+            return base_address, values
+
+    assert asyncio.run(_read_pinned()) == (addresses[0], [100, 0])
+    assert thing.base_reads == 1
+    assert not thing.is_pinned
+
+    # unpinned reads resolve the base address every time
+    asyncio.run(thing.read_value_from_offset(0x10, "int"))
+    asyncio.run(thing.read_value_from_offset(0x10, "int"))
+    assert thing.base_reads == 3
+
+
+def test_repin_follows_moved_object():
+    process, thing, addresses, pointer = _make_pointed_thing()
+
+    async def _move_and_repin():
+        await thing.pin()
+        process.write_bytes(pointer, struct.pack("<q", addresses[1]))
+        stale = await thing.read_value_from_offset(0x10, "int")
+        await thing.repin()
+        moved = await thing.read_value_from_offset(0x10, "int")
+        thing.unpin()
+        return stale, moved
+
+    assert asyncio.run(_move_and_repin()) == (100, 101)
+    assert not thing.is_pinned
+
+
+def test_unpin_without_pin_raises():
+    _, thing, _, _ = _make_pointed_thing()
+
+    with pytest.raises(RuntimeError):
+        thing.unpin()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(thing.repin())
+
+
+# offsets in the object holding the containers
+DYNAMIC_VECTOR = 0x10
+SHARED_VECTOR = 0x28
+LINKED_LIST = 0x40
+# next, previous, shared pointer
+NODE_SIZE = 32
+
+
+def _make_containers(count: int):
+    process = SimulatedProcess()
+    base = process.allocate(0x100)
+
+    vector = process.allocate(count * 8)
+    process.write_bytes(vector, struct.pack(f"<{count}q", *range(0, count * 3, 3)))
+    process.write_bytes(base + DYNAMIC_VECTOR, struct.pack("<qq", vector, vector + count * 8))
+
+    shared_vector = process.allocate(count * 16)
+    process.write_bytes(
+        shared_vector,
+        b"".join(struct.pack("<qq", 0x5000 + index, 0x9999) for index in range(count)),
+    )
+    process.write_bytes(
+        base + SHARED_VECTOR, struct.pack("<qq", shared_vector, shared_vector + count * 16)
+    )
+
+    # the first node is the list's sentinel, the rest are out of order like on a heap
+    # a whole page like a real heap so the frame's page reads don't run off the end
+    heap = process.allocate(((count + 1) * NODE_SIZE + 0xFFF) & ~0xFFF)
+    nodes = [heap] + [heap + index * NODE_SIZE for index in reversed(range(1, count + 1))]
+    for index, node in enumerate(nodes):
+        next_node = nodes[(index + 1) % len(nodes)]
+        process.write_bytes(node, struct.pack("<qqq", next_node, 0, 0x5000 + index))
+
+    process.write_bytes(base + LINKED_LIST, struct.pack("<qi", heap, count))
+
+    return process, DynamicMemoryObject(HookHandler(process, None), base), nodes
+
+
+def test_read_dynamic_vector():
+    process, memory_object, _ = _make_containers(100)
+    process.reads = 0
+
+    values = asyncio.run(memory_object.read_dynamic_vector(DYNAMIC_VECTOR))
+
+    assert values == list(range(0, 300, 3))
+    # the bounds then the elements
+    assert process.reads == 2
+
+    with pytest.raises(ValueError):
+        asyncio.run(memory_object.read_dynamic_vector(DYNAMIC_VECTOR, max_size=99))
+
+
+def test_read_linked_lists():
+    process, memory_object, nodes = _make_containers(100)
+
+    assert asyncio.run(memory_object.read_shared_linked_list(LINKED_LIST)) == [
+        0x5000 + index for index in range(1, 101)
+    ]
+    assert asyncio.run(memory_object.read_linked_list(LINKED_LIST)) == [
+        node + 16 for node in nodes[1:]
+    ]
+
+    # nodes are read by page instead of one read per node
+    process.reads = 0
+    asyncio.run(memory_object.read_shared_linked_list(LINKED_LIST))
+    assert process.reads < 10
+
+    with pytest.raises(ValueError):
+        asyncio.run(memory_object.read_shared_linked_list(LINKED_LIST, max_size=99))
+
+    with pytest.raises(ValueError):
+        asyncio.run(memory_object.read_linked_list(LINKED_LIST, max_size=99))
+
+
+def test_read_linked_lists_stop_at_cycles():
+    process, memory_object, nodes = _make_containers(10)
+    # the fifth node points back to the second, the walk stops before repeating it
+    process.write_bytes(nodes[5], struct.pack("<q", nodes[2]))
+
+    assert asyncio.run(memory_object.read_shared_linked_list(LINKED_LIST)) == [
+        0x5000 + index for index in range(1, 6)
+    ]
+    assert asyncio.run(memory_object.read_linked_list(LINKED_LIST)) == [
+        node + 16 for node in nodes[1:6]
+    ]
+
+
+def test_read_shared_vector():
+    process, memory_object, _ = _make_containers(100)
+    process.reads = 0
+
+    pointers = asyncio.run(memory_object.read_shared_vector(SHARED_VECTOR))
+
+    # only the pointer half of each shared pointer is kept
+    assert pointers == [0x5000 + index for index in range(100)]
+    assert process.reads == 2
+
+    pointer_array = asyncio.run(
+        memory_object.read_shared_vector(SHARED_VECTOR, as_array=True)
+    )
+    assert pointer_array == array("q", pointers)
+
+    with pytest.raises(ValueError):
+        asyncio.run(memory_object.read_shared_vector(SHARED_VECTOR, max_size=99))
+
+
+def test_read_shared_vector_empty():
+    process, memory_object, _ = _make_containers(1)
+    process.write_bytes(memory_object.base_address + SHARED_VECTOR, bytes(16))
+
+    assert asyncio.run(memory_object.read_shared_vector(SHARED_VECTOR)) == []
+    assert asyncio.run(
+        memory_object.read_shared_vector(SHARED_VECTOR, as_array=True)
+    ) == array("q")
+
+
+def test_read_string_single_read():
+    process = SimulatedProcess()
+    memory_object = DynamicMemoryObject(HookHandler(process, None), process.allocate(0x100))
+    address = memory_object.base_address
+    write_string(process, address, "inline")
+    write_string(process, address + 0x20, "a string too long to be stored inline")
+    write_string(process, address + 0x40, "")
+
+    process.reads = 0
+    assert asyncio.run(memory_object.read_string(address)) == "inline"
+    # small strings are in the header
+    assert process.reads == 1
+
+    process.reads = 0
+    assert (
+        asyncio.run(memory_object.read_string(address + 0x20))
+        == "a string too long to be stored inline"
+    )
+    assert process.reads == 2
+
+    assert asyncio.run(memory_object.read_string(address + 0x40)) == ""
+
+
+def test_read_strings():
+    process = SimulatedProcess()
+    memory_object = DynamicMemoryObject(HookHandler(process, None), process.allocate(0x1000))
+    strings = [f"string {index}" * (index % 3 + 1) for index in range(32)]
+    for index, string in enumerate(strings):
+        write_string(process, memory_object.base_address + index * 0x20, string)
+
+    addresses = [memory_object.base_address + index * 0x20 for index in range(32)]
+    # an unmapped string is read as empty
+    addresses.append(memory_object.base_address + 0x100000)
+    process.reads = 0
+
+    read = asyncio.run(memory_object.read_strings(addresses, max_gap=0x1000))
+
+    assert read == strings + [""]
+    assert process.reads < len(strings)
@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+
+from wizwalker import MemoryReadError
+from wizwalker.memory import MemoryReader, SimulatedProcess
+from wizwalker.memory.memory_reader import _open_page_caches
+
+
+def _make_reader():
+    process = SimulatedProcess()
+    address = process.allocate(0x3000)
+    process.write_bytes(address, bytes(range(256)) * 0x30)
+    return process, MemoryReader(process), address
+
+
+def test_read_many_coalesces():
+    process, reader, address = _make_reader()
+
+    datas = asyncio.run(
+        reader.read_many([(address + 16, 4), (address, 8), (address + 24, 8)], max_gap=8)
+    )
+
+    assert datas == [bytes(range(16, 20)), bytes(range(8)), bytes(range(24, 32))]
+    assert process.reads == 1
+
+
+def test_read_many_gap_splits():
+    process, reader, address = _make_reader()
+
+    asyncio.run(reader.read_many([(address, 8), (address + 0x100, 8)], max_gap=8))
+
+    assert process.reads == 2
+
+
+def test_read_many_ignore_errors():
+    process, reader, address = _make_reader()
+    unmapped = address + 0x10000
+
+    datas = asyncio.run(
+        reader.read_many([(address, 4), (unmapped, 4)], ignore_errors=True)
+    )
+    assert datas == [bytes(range(4)), None]
+
+    with pytest.raises(MemoryReadError):
+        asyncio.run(reader.read_many([(unmapped, 4)]))
+
+
+def test_frame_caches_pages():
+    process, reader, address = _make_reader()
+
+    async def _read_in_frame():
+        async with reader.frame() as cache:
+            first = await reader.read_bytes(address + 4, 4)
+            second = await reader.read_bytes(address + 100, 4)
+            return first, second, cache.hits, cache.misses
+
+    first, second, hits, misses = asyncio.run(_read_in_frame())
+
+    assert first == bytes(range(4, 8))
+    assert second == bytes(range(100, 104))
+    assert (hits, misses) == (1, 1)
+    assert process.reads == 1
+
+
+def test_frame_write_invalidates():
+    process, reader, address = _make_reader()
+
+    async def _write_in_frame():
+        async with reader.frame():
+            await reader.read_bytes(address, 4)
+            await reader.write_bytes(address, b"\xff" * 4)
+            return await reader.read_bytes(address, 4)
+
+    assert asyncio.run(_write_in_frame()) == b"\xff" * 4
+
+
+def test_frame_pages_dropped_on_exit():
+    process, reader, address = _make_reader()
+
+    async def _read_twice():
+        async with reader.frame():
+            await reader.read_bytes(address, 4)
+
+        process.write_bytes(address, b"\xee" * 4)
+        return await reader.read_bytes(address, 4)
+
+    assert asyncio.run(_read_twice()) == b"\xee" * 4
+
+
+def test_frame_not_seen_by_other_tasks():
+    process, reader, address = _make_reader()
+
+    async def _other_task_reads_fresh():
+        opened = asyncio.Event()
+        done = asyncio.Event()
+
+        async def _hold_frame():
+            async with reader.frame():
+                await reader.read_bytes(address, 4)
+                opened.set()
+                await done.wait()
+                return await reader.read_bytes(address, 4)
+
+        holder = asyncio.create_task(_hold_frame())
+        await opened.wait()
+
+        process.write_bytes(address, b"\xee" * 4)
+        # this task never opened a frame so it reads the process
+        fresh = await reader.read_bytes(address, 4)
+
+        done.set()
+        return fresh, await holder
+
+    fresh, cached = asyncio.run(_other_task_reads_fresh())
+
+    assert fresh == b"\xee" * 4
+    assert cached == bytes(range(4))
+
+
+def test_frame_shared_with_nested_readers():
+    process, reader, address = _make_reader()
+    other_reader = MemoryReader(process)
+
+    async def _nested():
+        async with reader.frame() as outer:
+            async with other_reader.frame() as inner:
+                await other_reader.read_bytes(address, 4)
+                await reader.read_bytes(address + 8, 4)
+
+            return outer is inner, outer.active, reader.page_cache
+
+    same, active, cache = asyncio.run(_nested())
+
+    assert same and active and cache is not None
+    assert process.reads == 1
+    assert other_reader.page_cache is None
+
+
+def test_frame_dropped_by_last_nested_exit():
+    process, reader, address = _make_reader()
+
+    async def _outlive_outer():
+        inner_opened = asyncio.Event()
+        outer_closed = asyncio.Event()
+
+        async def _child():
+            async with reader.frame() as inner:
+                inner_opened.set()
+                await outer_closed.wait()
+                await reader.read_bytes(address, 4)
+
+            return inner
+
+        async with reader.frame() as outer:
+            # the child task inherits the frame and outlives it
+            task = asyncio.ensure_future(_child())
+            await inner_opened.wait()
+
+        open_after_outer = outer in _open_page_caches[process]
+        outer_closed.set()
+        inner = await task
+
+        return outer is inner, open_after_outer, outer.active, outer.pages
+
+    same, open_after_outer, active, pages = asyncio.run(_outlive_outer())
+
+    assert same and open_after_outer
+    assert not active and not pages
+    assert not _open_page_caches[process]
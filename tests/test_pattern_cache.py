@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+from wizwalker.memory.pattern_cache import PatternCache
+
+
+class CountingPatternCache(PatternCache):
+    def __init__(self, path):
+        super().__init__(path)
+        self.saves = 0
+
+    async def save(self):
+        self.saves += 1
+        await super().save()
+
+
+def test_set_many_saves_once(tmp_path):
+    path = tmp_path / "pattern_cache.json"
+    cache = CountingPatternCache(path)
+
+    asyncio.run(
+        cache.set_many("module.exe:1:2", {b"\x01\x02": (16, 2), b"\x03": (32, 1)})
+    )
+
+    assert cache.saves == 1
+    assert json.loads(path.read_text()) == {
+        "module.exe:1:2": {"0102": [16, 2], "03": [32, 1]}
+    }
+
+
+def test_set_drops_old_module_versions(tmp_path):
+    path = tmp_path / "pattern_cache.json"
+    cache = PatternCache(path)
+
+    async def _set():
+        await cache.set("module.exe:1:2", b"\x01", 16, 1)
+        await cache.set("module.exe:3:4", b"\x01", 32, 1)
+        return await cache.get("module.exe:1:2", b"\x01")
+
+    assert asyncio.run(_set()) is None
+    assert json.loads(path.read_text()) == {"module.exe:3:4": {"01": [32, 1]}}
+
+
+def test_remove_persists(tmp_path):
+    path = tmp_path / "pattern_cache.json"
+    cache = CountingPatternCache(path)
+
+    async def _set_and_remove():
+        await cache.set("module.exe:1:2", b"\x01", 16, 1)
+        await cache.remove("module.exe:1:2", b"\x01")
+        # nothing to remove so nothing is written
+        await cache.remove("module.exe:1:2", b"\x01")
+
+    asyncio.run(_set_and_remove())
+
+    assert cache.saves == 2
+    assert asyncio.run(PatternCache(path).get("module.exe:1:2", b"\x01")) is None
+
+
+def test_save_replaces_file(tmp_path):
+    path = tmp_path / "pattern_cache.json"
+    path.write_text("not json")
+    cache = PatternCache(path)
+
+    async def _save_concurrently():
+        await asyncio.gather(
+            *(cache.set("module.exe:1:2", bytes([index]), index, 1) for index in range(8))
+        )
+
+    asyncio.run(_save_concurrently())
+
+    # no temp files are left behind
+    assert [child.name for child in tmp_path.iterdir()] == ["pattern_cache.json"]
+    assert len(json.loads(path.read_text())["module.exe:1:2"]) == 8
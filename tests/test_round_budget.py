@@ -0,0 +1,196 @@
+import asyncio
+
+from wizwalker.combat import CombatHandler, RoundBudget, RoundFallback
+from wizwalker.memory import DuelPhase, DynamicWindow, EffectTarget, SpellEffects
+
+from _simulated import WINDOW_FLAGS, SimulatedClient
+
+
+def test_budget_times():
+    # budgets use the running loop's time
+    async def _check():
+        now = asyncio.get_event_loop().time()
+        budget = RoundBudget(2, 30.0, margin=1.0, started=now - 10)
+
+        assert budget.deadline == now + 19
+        assert 18 < budget.remaining() <= 19
+        assert 19 < budget.timer_remaining() <= 20
+        assert not budget.expired()
+
+        # past the margin but not the timer
+        late = RoundBudget(2, 30.0, margin=1.0, started=now - 29.5)
+        assert late.remaining() == 0
+        assert 0 < late.timer_remaining() <= 0.5
+        assert late.expired()
+
+        # duels with their timer disabled are never out of time
+        untimed = RoundBudget.from_duel(2, 30.0, True, 9)
+        assert untimed.duel_id == 9
+        assert not untimed.has_timer
+        assert untimed.deadline is None and untimed.remaining() is None
+        assert not untimed.expired()
+
+    asyncio.run(_check())
+
+
+def test_budget_phases():
+    async def _phases():
+        budget = RoundBudget(1, 30.0)
+        for _ in range(2):
+            with budget.phase("select"):
+                await asyncio.sleep(0.01)
+
+        return budget.metrics()
+
+    metrics = asyncio.run(_phases())
+
+    assert metrics.round_number == 1
+    assert metrics.phases["select"] >= 0.02
+    assert metrics.elapsed >= metrics.phases["select"]
+    assert not metrics.timed_out and metrics.fallback is None
+
+
+def test_start_round_budget():
+    client = SimulatedClient()
+    client.set_duel(
+        phase=DuelPhase.planning,
+        round_number=3,
+        planning_timer=30.0,
+        disable_timer=False,
+        duel_id=9,
+    )
+    handler = CombatHandler(client)
+
+    budget = asyncio.run(handler.start_round_budget(margin=2.0))
+
+    assert (budget.round_number, budget.planning_timer, budget.duel_id) == (3, 30.0, 9)
+    assert budget.margin == 2.0
+    assert "read_timer" in budget.phases
+
+    client.set_duel(disable_timer=True)
+    assert not asyncio.run(handler.start_round_budget()).has_timer
+
+
+class SlowHandler(CombatHandler):
+    round_fallback = RoundFallback.pass_round
+
+    def __init__(self, client, card_window: int = 0):
+        super().__init__(client)
+        self.card_window = card_window
+        self.cancelled = False
+
+    async def handle_round(self):
+        try:
+            if self.card_window:
+                # stopped between clicking a card and its target
+                window = DynamicWindow(self.client.hook_handler, self.card_window)
+                await self.mark_card_selected(window)
+                await self.client.mouse_handler.click_window(window)
+
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+def _run_round(handler: CombatHandler, planning_timer: float = 0.2):
+    async def _run():
+        return await handler.run_round(RoundBudget(1, planning_timer, margin=0.1))
+
+    return asyncio.run(_run())
+
+
+def test_run_round_times_out_to_fallback():
+    client = SimulatedClient()
+    handler = SlowHandler(client)
+
+    metrics = _run_round(handler)
+
+    assert handler.cancelled
+    assert metrics.timed_out
+    assert metrics.fallback is RoundFallback.pass_round
+    # cancelled at the deadline, a margin before the timer ends
+    assert metrics.phases["handle_round"] < 0.2
+    assert "fallback" in metrics.phases
+    assert list(handler.round_metrics) == [metrics]
+    assert handler.round_budget is None
+    # no DoneWindow so the Focus button passes
+    assert client.mouse_handler.clicks == ["Focus"]
+
+
+def _make_hand(client: SimulatedClient):
+    untargeted = client.spell_template(
+        "Meteor",
+        "AOE",
+        [client.spell_effect(SpellEffects.damage.value, 300, EffectTarget.enemy_team.value)],
+    )
+    targeted = client.spell_template(
+        "Bolt",
+        "Attack",
+        [client.spell_effect(SpellEffects.damage.value, 200, EffectTarget.enemy_single.value)],
+    )
+    hand = client.windows.add_window(client.windows.root, "Hand", flags=1)
+    # right to left: a targeted card, a grayed card and then a castable untargeted card
+    return [
+        client.add_card(hand, untargeted, 1),
+        client.add_card(hand, untargeted, 1, grayed=True),
+        client.add_card(hand, targeted, 2),
+    ]
+
+
+def test_run_round_unselects_stopped_cast():
+    client = SimulatedClient()
+    card = _make_hand(client)[2]
+
+    _run_round(SlowHandler(client, card))
+
+    # the card was clicked again to unselect it before passing
+    assert client.mouse_handler.clicks == [card, card, "Focus"]
+
+
+def test_run_round_skips_unselecting_cast_card():
+    client = SimulatedClient()
+    card = _make_hand(client)[2]
+    handler = SlowHandler(client, card)
+
+    async def _run():
+        budget = RoundBudget(1, 0.2, margin=0.1)
+        round_ = asyncio.create_task(handler.run_round(budget))
+        await asyncio.sleep(0.05)
+        # the cast went through so the card's window was hidden
+        client.process.write_bytes(card + WINDOW_FLAGS, (0).to_bytes(4, "little"))
+        return await round_
+
+    asyncio.run(_run())
+
+    assert client.mouse_handler.clicks == [card, "Focus"]
+
+
+def test_run_round_first_castable_fallback():
+    client = SimulatedClient()
+    client.set_duel(phase=DuelPhase.planning, round_number=1)
+    cards = _make_hand(client)
+    handler = SlowHandler(client)
+    handler.round_fallback = RoundFallback.first_castable
+
+    metrics = _run_round(handler)
+
+    assert metrics.fallback is RoundFallback.first_castable
+    # the first castable card that doesn't need a target
+    assert client.mouse_handler.clicks == [cards[0]]
+
+
+def test_run_round_without_fallback_is_not_cancelled():
+    client = SimulatedClient()
+
+    class ShortHandler(CombatHandler):
+        async def handle_round(self):
+            await asyncio.sleep(0.2)
+
+    handler = ShortHandler(client)
+
+    metrics = _run_round(handler, planning_timer=0.1)
+
+    assert not metrics.timed_out and metrics.fallback is None
+    assert metrics.phases["handle_round"] >= 0.2
+    assert client.mouse_handler.clicks == []
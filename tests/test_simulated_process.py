@@ -0,0 +1,51 @@
+import asyncio
+import struct
+
+import pytest
+
+from wizwalker import MemoryReadError
+from wizwalker.memory import MemoryReader, SimulatedProcess
+
+
+def test_write_read_round_trip():
+    process = SimulatedProcess()
+    address = process.allocate(64)
+
+    process.write_bytes(address + 8, b"wizwalker")
+
+    assert process.read_bytes(address + 8, 9) == b"wizwalker"
+    assert process.read_bytes(address, 8) == bytes(8)
+
+
+def test_unmapped_read_raises():
+    process = SimulatedProcess()
+    address = process.allocate(16)
+
+    with pytest.raises(MemoryReadError):
+        process.read_bytes(address + 8, 16)
+
+
+def test_save_load_round_trip(tmp_path):
+    process = SimulatedProcess()
+    address = process.allocate(32)
+    process.write_bytes(address, struct.pack("<qd", 1234, 5.5))
+    process.add_module("Test.dll", address, 32)
+
+    path = tmp_path / "image.bin"
+    process.save(path)
+    loaded = SimulatedProcess.load(path)
+
+    assert loaded.read_bytes(address, 16) == struct.pack("<qd", 1234, 5.5)
+    assert loaded.module_from_name("Test.dll").base_address == address
+
+
+async def _read_typed(process, address):
+    return await MemoryReader(process).read_typed(address, "long long")
+
+
+def test_reader_round_trip():
+    process = SimulatedProcess()
+    address = process.allocate(8)
+    process.write_bytes(address, struct.pack("<q", -42))
+
+    assert asyncio.run(_read_typed(process, address)) == -42
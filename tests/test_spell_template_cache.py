@@ -0,0 +1,78 @@
+import asyncio
+
+from wizwalker.memory import SpellEffects, SpellTemplateCache
+
+from _simulated import EFFECT_LIST, SimulatedClient, write_shared_linked_list
+
+
+def _make_templates():
+    client = SimulatedClient()
+    damage = SpellEffects.damage.value
+
+    leaf = client.spell_effect(damage, 100)
+    first = client.spell_effect(0, 1, type_name="RandomSpellEffect")
+    second = client.spell_effect(0, 2, type_name="VariableSpellEffect")
+    # each holds the other so one of them is reached again on every path
+    write_shared_linked_list(client.process, first + EFFECT_LIST, [leaf, second])
+    write_shared_linked_list(client.process, second + EFFECT_LIST, [leaf, first])
+
+    templates = {
+        1: client.spell_template("First", "AOE", [first]),
+        2: client.spell_template("Second", "AOE", [second, leaf]),
+    }
+    return client, templates
+
+
+def _shape(effect):
+    return effect.fields.effect_param, tuple(_shape(child) for child in effect.effects)
+
+
+def _read(client, templates):
+    return asyncio.run(SpellTemplateCache().read(client.hook_handler, templates))
+
+
+def test_effect_trees():
+    client, templates = _make_templates()
+
+    records = _read(client, templates)
+
+    # the cycle back to an effect on the path is dropped
+    assert [_shape(effect) for effect in records[1].effects] == [
+        (1, ((100, ()), (2, ((100, ()),))))
+    ]
+    assert [_shape(effect) for effect in records[2].effects] == [
+        (2, ((100, ()), (1, ((100, ()),)))),
+        (100, ()),
+    ]
+    assert [effect.type_name for effect in records[1].flat_effects] == [
+        "RandomSpellEffect",
+        "SpellEffect",
+        "VariableSpellEffect",
+        "SpellEffect",
+    ]
+
+
+def test_effect_trees_independent_of_read_order():
+    client, templates = _make_templates()
+
+    together = _read(client, templates)
+    reversed_ = _read(client, dict(reversed(list(templates.items()))))
+    alone = {
+        template_id: _read(client, {template_id: address})[template_id]
+        for template_id, address in templates.items()
+    }
+
+    assert together == reversed_ == alone
+
+
+def test_cached_templates_are_not_read_again():
+    client, templates = _make_templates()
+    cache = SpellTemplateCache()
+    asyncio.run(cache.read(client.hook_handler, templates))
+
+    client.process.reads = 0
+    records = asyncio.run(cache.read(client.hook_handler, {**templates, 3: 0}))
+
+    assert client.process.reads == 0
+    assert set(records) == {1, 2}
+    assert records[1].name == "First" and records[2].type_name == "AOE"
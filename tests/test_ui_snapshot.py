@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from wizwalker.memory.memory_objects.enums import WindowFlags
+from wizwalker.memory.memory_objects.ui_snapshot import UITreeSnapshot
+from wizwalker.memory.memory_objects.window import DynamicWindow
+
+from _simulated import WindowTree
+
+
+def _make_snapshot():
+    tree = WindowTree()
+    hand = tree.add_window(tree.root, "Hand", flags=1, rectangle=(1, 2, 3, 4))
+    button = tree.add_window(
+        hand, "btnOk", "ControlButton", flags=3, rectangle=(5, 6, 7, 8), text="Okay then"
+    )
+    # only controls have their text read
+    window = tree.add_window(tree.root, "Hand", text="ignored")
+    snapshot = asyncio.run(DynamicWindow(tree.hook_handler, tree.root).snapshot_ui_tree())
+    return tree, snapshot, (hand, window, button)
+
+
+def test_snapshot_ui_tree():
+    tree, snapshot, (hand, window, button) = _make_snapshot()
+
+    assert [record.address for record in snapshot] == [tree.root, hand, window, button]
+    assert snapshot[0].parent == -1
+    assert snapshot[3] == (
+        button,
+        1,
+        "btnOk",
+        "ControlButton",
+        WindowFlags(3),
+        (5, 6, 7, 8),
+        "Okay then",
+    )
+    assert snapshot[2].text == ""
+    assert snapshot.children(0) == [1, 2]
+    assert snapshot.find(name="Hand") == [1, 2]
+    assert snapshot.find(name="Hand", flags=WindowFlags.visible) == [1]
+    assert snapshot.find(type_name="missing") == []
+
+
+def test_save_load_round_trip(tmp_path):
+    _, snapshot, _ = _make_snapshot()
+    path = tmp_path / "ui.wwui"
+
+    snapshot.save(path)
+    loaded = UITreeSnapshot.load(path)
+
+    assert list(loaded) == list(snapshot)
+    assert loaded.find(name="btnOk") == [3]
+    assert snapshot.diff(loaded) == {"added": [], "removed": [], "changed": []}
+
+
+def test_diff():
+    tree, snapshot, (hand, window, button) = _make_snapshot()
+    tree.remove_window(tree.root, window)
+    added = tree.add_window(hand, "New")
+    tree.rename(button, "btnCancel")
+
+    later = asyncio.run(DynamicWindow(tree.hook_handler, tree.root).snapshot_ui_tree())
+
+    assert snapshot.diff(later) == {
+        "added": [added],
+        "removed": [window],
+        "changed": [button],
+    }
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "ui.wwui"
+    path.write_bytes(b"not a snapshot")
+
+    with pytest.raises(ValueError):
+        UITreeSnapshot.load(path)
+
+    _, snapshot, _ = _make_snapshot()
+    snapshot.save(path)
+    path.write_bytes(path.read_bytes()[:-1])
+
+    with pytest.raises(ValueError):
+        UITreeSnapshot.load(path)
@@ -0,0 +1,198 @@
+import asyncio
+import random
+
+from wizwalker.memory.memory_objects.enums import WindowFlags
+from wizwalker.memory.memory_objects.window import DynamicWindow, WindowIndex
+
+from _simulated import WindowTree
+
+
+NAMES = ("Hand", "btn", "ControlSprite", "a window name too long to be inline", "Txt")
+TYPE_NAMES = ("Window", "ControlButton", "ControlText")
+
+
+def _make_tree(count: int = 300) -> WindowTree:
+    random.seed(0)
+    tree = WindowTree()
+    windows = [tree.root]
+    for _ in range(count):
+        windows.append(
+            tree.add_window(
+                random.choice(windows),
+                random.choice(NAMES),
+                random.choice(TYPE_NAMES),
+                flags=random.choice((0, 1, 3)),
+                rectangle=tuple(random.randrange(1000) for _ in range(4)),
+                text=random.choice(("", "Ok", "a longer control text")),
+            )
+        )
+
+    return tree
+
+
+def _levels(tree: WindowTree):
+    # expected walk order, each level's windows in child order
+    levels = []
+    level = [tree.root]
+    while level:
+        level = [child for window in level for child in tree.children[window]]
+        if level:
+            levels.append(level)
+
+    return levels
+
+
+def test_walk_tree_level_order():
+    tree = _make_tree()
+    root = DynamicWindow(tree.hook_handler, tree.root)
+
+    async def _walk():
+        return [level async for level in root.walk_tree(read_type_names=True)]
+
+    levels = asyncio.run(_walk())
+
+    assert [[node.window.base_address for node in level] for level in levels] == _levels(
+        tree
+    )
+    for depth, level in enumerate(levels, 1):
+        for node in level:
+            assert node.depth == depth
+            assert node.children == tuple(tree.children[node.window.base_address])
+            assert node.type_name in TYPE_NAMES
+
+
+def test_walk_tree_batches_reads():
+    tree = _make_tree()
+    root = DynamicWindow(tree.hook_handler, tree.root)
+
+    async def _walk():
+        return [level async for level in root.walk_tree()]
+
+    async def _is_hand(window) -> bool:
+        return await window.name() == "Hand"
+
+    tree.process.reads = 0
+    asyncio.run(_walk())
+    walk_reads = tree.process.reads
+
+    # the recursive walk reads each window's children and name separately
+    tree.process.reads = 0
+    asyncio.run(root.get_windows_with_predicate(_is_hand))
+
+    assert walk_reads * 2 < tree.process.reads
+
+
+def test_find_windows_matches_predicate_search():
+    tree = _make_tree()
+    root = DynamicWindow(tree.hook_handler, tree.root)
+
+    async def _is_hand(window) -> bool:
+        return await window.name() == "Hand"
+
+    async def _find():
+        return (
+            await root.find_windows(name="Hand"),
+            await root.get_windows_with_predicate(_is_hand),
+        )
+
+    found, expected = asyncio.run(_find())
+
+    assert found
+    assert [window.base_address for window in found] == [
+        window.base_address for window in expected
+    ]
+
+
+def test_find_windows_filters():
+    tree = _make_tree()
+    root = DynamicWindow(tree.hook_handler, tree.root)
+
+    async def _find():
+        return (
+            await root.find_windows(type_name="ControlText", flags=WindowFlags(3)),
+            await root.find_windows(name="btn", first=True),
+            await root.find_windows(name="missing"),
+        )
+
+    controls, (first,), missing = asyncio.run(_find())
+
+    async def _check():
+        for window in controls:
+            assert await window.read_type_name() == "ControlText"
+            assert await window.flags() == WindowFlags(3)
+
+        assert await first.name() == "btn"
+
+    asyncio.run(_check())
+    assert controls
+    assert missing == []
+
+
+def _addresses(windows):
+    return [window.base_address for window in windows]
+
+
+def test_window_index_matches_find_windows():
+    tree = _make_tree()
+    root = DynamicWindow(tree.hook_handler, tree.root)
+    index = WindowIndex(root)
+
+    assert asyncio.run(index.refresh()) == 1
+    assert len(index) == 300
+
+    for name in NAMES:
+        assert _addresses(index.get_windows_with_name(name)) == _addresses(
+            asyncio.run(root.find_windows(name=name))
+        )
+
+    for type_name in TYPE_NAMES:
+        assert _addresses(index.get_windows_with_type(type_name)) == _addresses(
+            asyncio.run(root.find_windows(type_name=type_name))
+        )
+
+
+def test_window_index_refresh_rewalks_changed_subtrees():
+    tree = _make_tree()
+    root = DynamicWindow(tree.hook_handler, tree.root)
+    index = WindowIndex(root)
+    asyncio.run(index.refresh())
+
+    # nothing changed so nothing is read again
+    assert asyncio.run(index.refresh()) == 0
+
+    parent = next(window for window in tree.children if len(tree.children[window]) > 1)
+    removed = tree.children[parent][0]
+    # the children vector keeps its bounds when a child is replaced
+    tree.remove_window(parent, removed)
+    added = tree.add_window(parent, "NewWindow")
+    # a change inside a changed subtree is rewalked with it
+    nested = tree.add_window(added, "NestedWindow")
+
+    assert asyncio.run(index.refresh()) == 1
+    assert _addresses(index.get_windows_with_name("NewWindow")) == [added]
+    assert _addresses(index.get_windows_with_name("NestedWindow")) == [nested]
+    assert index.get_node(removed) is None
+    assert len(index) == 300 + 2 - 1 - _subtree_size(tree, removed)
+
+    for name in NAMES:
+        assert _addresses(index.get_windows_with_name(name)) == _addresses(
+            asyncio.run(root.find_windows(name=name))
+        )
+
+
+def _subtree_size(tree: WindowTree, window: int) -> int:
+    return sum(1 + _subtree_size(tree, child) for child in tree.children[window])
+
+
+def test_window_index_keeps_renamed_windows():
+    tree = _make_tree(20)
+    index = WindowIndex(DynamicWindow(tree.hook_handler, tree.root))
+    asyncio.run(index.refresh())
+
+    window = tree.children[tree.root][0]
+    old_name = index.get_node(window).name
+    tree.rename(window, "Renamed")
+
+    # renames don't change the children vectors refresh compares
+    assert asyncio.run(index.refresh()) == 0
+    assert index.get_node(window).name == old_name
@@ -8,10 +8,9 @@ import aioconsole
 import terminaltables
 from aiomonitor import Monitor, cli, start_monitor
 from aiomonitor.utils import close_server, console_proxy
-from pymem import Pymem
 
 from wizwalker import XYZ
-from wizwalker.memory import InstanceFinder
+from wizwalker.memory import InstanceIndex
 
 
 def init_console_server(host: str, port: int, _locals, loop):
@@ -62,7 +61,7 @@ class NoBannerConsole(aioconsole.AsynchronousConsole):
 class WizWalkerConsole(Monitor):
     intro = "WizWalkerCLI\n{tasknum} task{s} running. Use help (?) for commands.\n"
     prompt = "WW > "
-    instance_finders = {}
+    instance_index = None
 
     def write(self, message: str):
         self._sout.write(message + "\n")
@@ -210,20 +209,37 @@ class WizWalkerConsole(Monitor):
 
         self.write("Completed click")
 
-    def do_findinstances(self, class_name: str):
-        """Find instances of a class"""
-        if self.instance_finders.get(class_name):
-            finder = self.instance_finders[class_name]
+    def _get_instance_index(self, refresh: bool = False) -> InstanceIndex:
+        if self.instance_index is None:
+            # pymem is imported here so wizwalker can be imported without windows
+            from pymem import Pymem
 
-        else:
             pm = Pymem("WizardGraphicalClient.exe")
-            finder = InstanceFinder(pm, class_name)
-            self.instance_finders[class_name] = finder
+            WizWalkerConsole.instance_index = InstanceIndex(pm)
+
+        if refresh or not self.instance_index.is_built:
+            self.run_coro(self.instance_index.build(), None)
+
+        return self.instance_index
+
+    def do_findinstances(self, class_name: str):
+        """Find instances of a class
 
-        instances = self.run_coro(finder.get_instances(), None)
+        answers from the instance index, use refreshinstances to rescan
+        """
+        instances = self._get_instance_index().get_instances(class_name)
 
         self.write(str(instances))
 
+    def do_refreshinstances(self):
+        """Rescan memory for instances of every class"""
+        index = self._get_instance_index(refresh=True)
+        instance_count = sum(
+            len(index.get_instances(class_name)) for class_name in index.get_class_names()
+        )
+
+        self.write(f"Indexed {instance_count} instances")
+
 
 def test_monitor():
     cli.monitor_client(cli.MONITOR_HOST, cli.MONITOR_PORT)
@@ -4,8 +4,6 @@ import warnings
 from functools import cached_property
 from typing import Callable, List, Optional
 
-import pymem
-
 from . import (
     CacheHandler,
     Keycode,
@@ -13,6 +11,7 @@ from . import (
     ReadingEnumFailed,
     utils, ExceptionalTimeout,
 )
+from .combat import DuelWatcher
 from .constants import WIZARD_SPEED
 from .memory import (
     CurrentActorBody,
@@ -24,9 +23,13 @@ from .memory import (
     CurrentGameClient,
     DuelPhase,
     HookHandler,
+    PymemBackend,
     CurrentRenderContext,
     TeleportHelper,
     MovementTeleportHook,
+    WindowIndex,
+    EntityIndex,
+    EntitySnapshot,
 )
 from .mouse_handler import MouseHandler
 from .utils import (
@@ -36,7 +39,7 @@ from .utils import (
     set_window_title,
     get_window_rectangle,
     wait_for_value,
-    maybe_wait_for_any_value_with_timeout, maybe_wait_for_value_with_timeout,
+    maybe_wait_for_value_with_timeout,
 )
 
 
@@ -51,9 +54,12 @@ class Client:
     def __init__(self, window_handle: int):
         self.window_handle = window_handle
 
+        # pymem is imported here so wizwalker can be imported without windows
+        import pymem
+
         self._pymem = pymem.Pymem()
         self._pymem.open_process_from_id(self.process_id)
-        self.hook_handler = HookHandler(self._pymem, self)
+        self.hook_handler = HookHandler(PymemBackend(self._pymem), self)
 
         self.cache_handler = CacheHandler()
         self.mouse_handler = MouseHandler(self)
@@ -61,9 +67,14 @@ class Client:
         self.stats = CurrentGameStats(self.hook_handler)
         self.body = CurrentActorBody(self.hook_handler)
         self.duel = CurrentDuel(self.hook_handler)
+        self.duel_watcher = DuelWatcher(self)
         self.quest_position = CurrentQuestPosition(self.hook_handler)
         self.client_object = CurrentClientObject(self.hook_handler)
+        self.entity_index = EntityIndex(
+            self.client_object, cache_handler=self.cache_handler
+        )
         self.root_window = CurrentRootWindow(self.hook_handler)
+        self.window_index = WindowIndex(self.root_window)
         self.render_context = CurrentRenderContext(self.hook_handler)
         self.game_client = CurrentGameClient(self.hook_handler)
 
@@ -172,6 +183,16 @@ class Client:
 
         return entities
 
+    async def get_entity_snapshot(self) -> EntitySnapshot:
+        """
+        Read every loaded entity into an EntitySnapshot with batched reads
+
+        Returns:
+            The snapshot
+        """
+        root_client = await self.client_object.parent()
+        return await EntitySnapshot.capture(root_client, cache_handler=self.cache_handler)
+
     async def get_base_entities_with_name(self, name: str):
         """
         Get entities with a name
@@ -182,11 +203,8 @@ class Client:
         Returns:
             List of the matching entities
         """
-        async def _pred(entity):
-            object_template = await entity.object_template()
-            return await object_template.object_name() == name
-
-        return await self.get_base_entities_with_predicate(_pred)
+        snapshot = await self.get_entity_snapshot()
+        return [snapshot.entity(row) for row in snapshot.find(object_name=name)]
 
     async def get_base_entities_with_display_name(self, display_name: str):
         """
@@ -198,19 +216,8 @@ class Client:
         Returns:
             List of the matching entities
         """
-        async def predicate(entity):
-            try:
-                mob_display_name = await maybe_wait_for_any_value_with_timeout(
-                    entity.display_name,
-                    0.1,
-                    timeout=1
-                )
-            except ExceptionalTimeout:
-                return False
-
-            return display_name.lower() in mob_display_name.lower()
-
-        return await self.get_base_entities_with_predicate(predicate)
+        snapshot = await self.get_entity_snapshot()
+        return [snapshot.entity(row) for row in snapshot.find(display_name=display_name)]
 
     async def get_world_view_window(self):
         """
@@ -576,7 +583,7 @@ class Client:
             return self._je_instruction_forward_backwards
 
         movement_state_instruction_addr = await self.hook_handler.pattern_scan(
-            rb"\x8B\x5F\x70\xF3",
+            MovementTeleportHook.MOVEMENT_STATE_PATTERN,
             module="WizardGraphicalClient.exe"
         )
 
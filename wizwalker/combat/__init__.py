@@ -1,3 +1,7 @@
 from .card import CombatCard
 from .member import CombatMember
+from .budget import RoundBudget, RoundFallback, RoundMetrics
 from .handler import CombatHandler, AoeHandler
+from .coordinator import CombatCoordinator, SharedRound
+from .snapshot import CombatCardRecord, CombatMemberRecord, CombatSnapshot
+from .watcher import DuelEvent, DuelState, DuelWatcher
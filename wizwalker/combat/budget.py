@@ -0,0 +1,201 @@
+import asyncio
+from contextlib import contextmanager
+from enum import Enum
+from typing import Dict, NamedTuple, Optional
+
+
+class RoundFallback(Enum):
+    """
+    What CombatHandler does when handle_round runs out of time
+    """
+
+    # handle_round isn't cancelled, it runs until it returns like before rounds were budgeted
+    none = 0
+    pass_round = 1
+    # cast the first castable card that doesn't need a target, otherwise pass
+    first_castable = 2
+
+
+class RoundMetrics(NamedTuple):
+    """
+    Timings of one handled round
+
+    Args:
+        round_number: The round that was handled
+        planning_timer: Length of the planning phase in seconds, 0 if the duel has no timer
+        elapsed: Seconds from the planning phase being seen to the round being handled
+        timed_out: If handle_round was cancelled for running past the budget
+        fallback: The fallback that was done, None if handle_round didn't time out
+        phases: Seconds spent in each named phase of the round
+    """
+
+    round_number: int
+    planning_timer: float
+    elapsed: float
+    timed_out: bool
+    fallback: Optional[RoundFallback]
+    phases: Dict[str, float]
+
+
+class RoundBudget:
+    """
+    Time a round has before the planning timer runs out
+
+    Times are event loop times so they can be passed to asyncio.wait_for
+
+    Args:
+        round_number: The round being budgeted
+        planning_timer: Length of the planning phase in seconds, 0 or less if the duel has no timer
+        margin: Seconds before the planning timer ends that the budget runs out at
+        started: Event loop time the planning phase was seen at, now if None
+        duel_id: Id of the duel the round is in, 0 if unknown
+
+    Examples:
+        .. code-block:: py
+
+            async def handle_round(self):
+                with self.round_budget.phase("select"):
+                    snapshot = await self.get_combat_snapshot()
+
+                remaining = self.round_budget.remaining()
+                if remaining is not None and remaining < 2:
+                    return await self.pass_button()
+    """
+
+    def __init__(
+        self,
+        round_number: int,
+        planning_timer: float,
+        *,
+        margin: float = 1.0,
+        started: Optional[float] = None,
+        duel_id: int = 0,
+    ):
+        self.round_number = round_number
+        self.planning_timer = max(planning_timer, 0.0)
+        self.margin = margin
+        self.started = started if started is not None else self._now()
+        self.duel_id = duel_id
+
+        # phase name -> seconds spent in it
+        self.phases: Dict[str, float] = {}
+
+    @classmethod
+    def from_duel(
+        cls,
+        round_num: int,
+        planning_timer: float,
+        disable_timer: bool,
+        duel_id_full: int = 0,
+        *,
+        margin: float = 1.0,
+        started: Optional[float] = None,
+    ) -> "RoundBudget":
+        """
+        Budget a round from the Duel fields the budget needs
+
+        Args:
+            round_num: The duel's round_num
+            planning_timer: The duel's planning_timer
+            disable_timer: The duel's disable_timer
+            duel_id_full: The duel's duel_id_full
+            margin: Seconds before the planning timer ends that the budget runs out at
+            started: Event loop time the planning phase was seen at, now if None
+        """
+        if disable_timer:
+            planning_timer = 0.0
+
+        return cls(
+            round_num,
+            planning_timer,
+            margin=margin,
+            started=started,
+            duel_id=duel_id_full,
+        )
+
+    @staticmethod
+    def _now() -> float:
+        return asyncio.get_event_loop().time()
+
+    @property
+    def has_timer(self) -> bool:
+        return self.planning_timer > 0
+
+    @property
+    def timer_end(self) -> Optional[float]:
+        """
+        Event loop time the planning timer ends at, None if there is no timer
+        """
+        if not self.has_timer:
+            return None
+
+        return self.started + self.planning_timer
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """
+        Event loop time the budget runs out at, None if there is no timer
+        """
+        if not self.has_timer:
+            return None
+
+        return self.timer_end - self.margin
+
+    def elapsed(self) -> float:
+        """
+        Seconds since the planning phase was seen
+        """
+        return self._now() - self.started
+
+    def remaining(self) -> Optional[float]:
+        """
+        Seconds until the budget runs out, None if there is no timer
+        """
+        if not self.has_timer:
+            return None
+
+        return max(self.deadline - self._now(), 0.0)
+
+    def timer_remaining(self) -> Optional[float]:
+        """
+        Seconds until the planning timer ends, None if there is no timer
+        """
+        if not self.has_timer:
+            return None
+
+        return max(self.timer_end - self._now(), 0.0)
+
+    def expired(self) -> bool:
+        """
+        If the budget has run out
+        """
+        return self.has_timer and self.remaining() == 0
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Add the time spent in the block to phase name's time
+
+        Args:
+            name: Name of the phase
+        """
+        start = self._now()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + self._now() - start
+
+    def metrics(
+        self, *, timed_out: bool = False, fallback: Optional[RoundFallback] = None
+    ) -> RoundMetrics:
+        """
+        The round's timings so far
+        """
+        return RoundMetrics(
+            self.round_number,
+            self.planning_timer,
+            self.elapsed(),
+            timed_out,
+            fallback,
+            dict(self.phases),
+        )
@@ -39,6 +39,7 @@ class CombatCard:
         if isinstance(target, CombatCard):
             cards_len_before = len(await self.combat_handler.get_cards())
 
+            await self.combat_handler.mark_card_selected(self._spell_window)
             await self.combat_handler.client.mouse_handler.click_window(
                 self._spell_window
             )
@@ -57,6 +58,7 @@ class CombatCard:
             await self.combat_handler.client.mouse_handler.click_window(
                 target._spell_window
             )
+            self.combat_handler.mark_card_unselected()
 
             # wait until card number goes down
             while len(await self.combat_handler.get_cards()) > cards_len_before:
@@ -73,6 +75,7 @@ class CombatCard:
             # we don't need to sleep because nothing will be casted after
 
         else:
+            await self.combat_handler.mark_card_selected(self._spell_window)
             await self.combat_handler.client.mouse_handler.click_window(
                 self._spell_window
             )
@@ -84,6 +87,7 @@ class CombatCard:
             await self.combat_handler.client.mouse_handler.click_window(
                 await target.get_health_text_window()
             )
+            self.combat_handler.mark_card_unselected()
 
     async def discard(self, *, sleep_time: Optional[float] = 1.0):
         """
@@ -136,21 +140,37 @@ class CombatCard:
         spell = await self.wait_for_graphical_spell()
         return await spell.spell_effects()
 
+    async def spell_template_record(
+        self,
+    ) -> "wizwalker.memory.memory_objects.spell_template_cache.SpellTemplateRecord":
+        """
+        This card's decoded spell template, only read the first time a template id is seen
+
+        Raises:
+            ValueError: If this card has no spell template
+        """
+        graphical_spell = await self.wait_for_graphical_spell()
+        template_cache = wizwalker.memory.SpellTemplateCache.get_for(
+            graphical_spell.hook_handler
+        )
+
+        record = await template_cache.read_for_spell(graphical_spell)
+        if record is None:
+            raise ValueError("Spell template not found")
+
+        return record
+
     async def name(self) -> str:
         """
         The name of this card
         """
-        graphical_spell = await self.wait_for_graphical_spell()
-        spell_template = await graphical_spell.spell_template()
-        return await spell_template.name()
+        return (await self.spell_template_record()).name
 
     async def display_name_code(self) -> str:
         """
         The display name code of this card
         """
-        graphical_spell = await self.wait_for_graphical_spell()
-        spell_template = await graphical_spell.spell_template()
-        return await spell_template.display_name()
+        return (await self.spell_template_record()).display_name_code
 
     async def display_name(self) -> str:
         """
@@ -163,9 +183,7 @@ class CombatCard:
         """
         The type name of this card
         """
-        graphical_spell = await self.wait_for_graphical_spell()
-        spell_template = await graphical_spell.spell_template()
-        return await spell_template.type_name()
+        return (await self.spell_template_record()).type_name
 
     async def template_id(self) -> int:
         """
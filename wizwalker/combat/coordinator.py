@@ -0,0 +1,222 @@
+import asyncio
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .budget import RoundBudget
+from .handler import CombatHandler
+from .snapshot import CombatMemberRecord
+
+
+class SharedRound(NamedTuple):
+    """
+    Duel state of a round read once for every coordinated client in the duel
+
+    Member window addresses are of the client that read them; use
+    CombatHandler.get_member_named with a member's name to get one that can be targeted
+
+    Args:
+        duel_id: The duel's id, the same for every client in it
+        round_number: The round this state was read in
+        planning_timer: Length of the planning phase in seconds, 0 if the duel has no timer
+        members: Members of the duel, is_client is set for the client this was given to
+    """
+
+    duel_id: int
+    round_number: int
+    planning_timer: float
+    members: Tuple[CombatMemberRecord, ...]
+
+    @property
+    def client_member(self) -> Optional[CombatMemberRecord]:
+        """
+        The member of the client this was given to, None if it wasn't found
+        """
+        for member in self.members:
+            if member.is_client:
+                return member
+
+        return None
+
+
+class _SharedRoundFailed(Exception):
+    # the client reading a shared round didn't finish reading it
+    pass
+
+
+class CombatCoordinator:
+    """
+    Handles the combat of several clients at once
+
+    Each client still has its own round loop and handle_round, but duel state
+    shared by clients in the same duel is read once per round, from whichever client
+    gets to the round first, and given to every handler as CombatHandler.shared_round.
+    Rounds are budgeted and timed the same as CombatHandler.handle_combat, from
+    when each client saw the planning phase
+
+    Like with CombatHandler.handle_combat a handler's rounds are only cancelled if its
+    round_fallback is set, which defaults to none; set it on the handlers for
+    deadline_margin to have an effect
+
+    Args:
+        handlers: Handlers of the clients to coordinate
+        deadline_margin: Seconds before the planning timer ends that rounds of handlers
+            with a round_fallback are cancelled at, None to use each handler's deadline_margin
+
+    Examples:
+        .. code-block:: py
+
+            class MyHandler(CombatHandler):
+                round_fallback = RoundFallback.pass_round
+
+                async def handle_round(self):
+                    members = self.shared_round.members
+                    ...
+
+            coordinator = CombatCoordinator(MyHandler(client) for client in clients)
+            await coordinator.wait_for_combat()
+    """
+
+    def __init__(
+        self, handlers: Iterable[CombatHandler], *, deadline_margin: Optional[float] = None
+    ):
+        self.handlers: List[CombatHandler] = list(handlers)
+        self.deadline_margin = deadline_margin
+
+        # (duel id, round number) -> future of the round's SharedRound
+        self._rounds: Dict[Tuple[int, int], asyncio.Future] = {}
+
+    async def handle_combat(self):
+        """
+        Handles the current combat of every client
+
+        Raises:
+            Exception: The first exception raised by a client's round,
+                after every other client's combat is over
+        """
+        tasks = [
+            asyncio.ensure_future(self._handle_client_combat(handler))
+            for handler in self.handlers
+        ]
+        try:
+            await asyncio.wait(tasks)
+        finally:
+            await self._finish(tasks)
+
+    async def wait_for_combat(self):
+        """
+        Wait until a client is in combat then handle the combat of every client
+
+        Each client is handled as soon as it enters combat; clients that haven't entered
+        combat once every other client's combat is over aren't waited for anymore
+
+        Raises:
+            Exception: The first exception raised by a client's round,
+                after every other client's combat is over
+        """
+        entered = set()
+        tasks = {
+            asyncio.ensure_future(self._wait_for_client_combat(handler, entered)): handler
+            for handler in self.handlers
+        }
+        try:
+            pending = set(tasks)
+            while pending:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                # only clients that never entered the combat are left
+                if not any(tasks[task] in entered for task in pending):
+                    break
+        finally:
+            await self._finish(list(tasks))
+
+    async def _wait_for_client_combat(self, handler: CombatHandler, entered: set):
+        await handler.client.duel_watcher.wait_for_combat()
+        entered.add(handler)
+        await self._handle_client_combat(handler)
+
+    async def _finish(self, tasks: List[asyncio.Future]):
+        for task in tasks:
+            task.cancel()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        self._rounds.clear()
+
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+    async def _handle_client_combat(self, handler: CombatHandler):
+        loop = asyncio.get_event_loop()
+
+        while await handler.in_combat():
+            await handler.wait_for_planning_phase()
+            started = loop.time()
+
+            budget = await handler.start_round_budget(
+                started=started, margin=self.deadline_margin
+            )
+            with budget.phase("read_shared_round"):
+                shared_round = await self._get_shared_round(handler, budget)
+                handler.shared_round = shared_round._replace(
+                    members=await self._members_for(handler, shared_round.members)
+                )
+
+            try:
+                await handler.run_round(budget)
+            finally:
+                handler.shared_round = None
+
+            await handler.wait_until_next_round(budget.round_number)
+
+        handler._spell_check_boxes = None
+
+    async def _get_shared_round(
+        self, handler: CombatHandler, budget: RoundBudget
+    ) -> SharedRound:
+        key = (budget.duel_id, budget.round_number)
+
+        while True:
+            future = self._rounds.get(key)
+            if future is None:
+                return await self._read_shared_round(handler, key, budget)
+
+            try:
+                return await asyncio.shield(future)
+            except _SharedRoundFailed:
+                # the client reading it failed or was cancelled so read it here
+                continue
+
+    async def _read_shared_round(
+        self, handler: CombatHandler, key: Tuple[int, int], budget: RoundBudget
+    ) -> SharedRound:
+        # earlier rounds of this duel aren't needed anymore
+        for old_key in [k for k in self._rounds if k[0] == key[0] and k[1] < key[1]]:
+            del self._rounds[old_key]
+
+        future = self._rounds[key] = asyncio.get_event_loop().create_future()
+        try:
+            snapshot = await handler.get_combat_snapshot(cards=False)
+        except BaseException:
+            # let the waiting clients and the next client to get here try again
+            if self._rounds.get(key) is future:
+                del self._rounds[key]
+
+            future.set_exception(_SharedRoundFailed())
+            # retrieve it so an unawaited future doesn't warn
+            future.exception()
+            raise
+
+        shared_round = SharedRound(
+            key[0], key[1], budget.planning_timer, tuple(snapshot.members)
+        )
+        future.set_result(shared_round)
+        return shared_round
+
+    @staticmethod
+    async def _members_for(
+        handler: CombatHandler, members: Tuple[CombatMemberRecord, ...]
+    ) -> Tuple[CombatMemberRecord, ...]:
+        global_id = await handler.client.client_object.global_id_full()
+        return tuple(
+            member._replace(is_client=member.participant.owner_id_full == global_id)
+            for member in members
+        )
@@ -1,42 +1,227 @@
 import asyncio
-from typing import Callable, List
+from collections import deque
+from typing import Callable, List, Optional
 from warnings import warn
 
 from .member import CombatMember
 from .card import CombatCard
-from ..memory import DuelPhase, EffectTarget, SpellEffects, WindowFlags
-from wizwalker import utils, WizWalkerMemoryError
+from .budget import RoundBudget, RoundFallback, RoundMetrics
+from .snapshot import CombatSnapshot
+from wizwalker import MemoryReadError
+from ..memory import DuelPhase, EffectTarget, WindowFlags
+
+
+# card targets that are picked without clicking a member
+_UNTARGETED = (
+    EffectTarget.enemy_team,
+    EffectTarget.enemy_team_all_at_once,
+    EffectTarget.friendly_team,
+    EffectTarget.friendly_team_all_at_once,
+    EffectTarget.self,
+    EffectTarget.target_global,
+)
+
+# Duel fields read by start_round_budget, in RoundBudget.from_duel's order
+_BUDGET_FIELDS = ("round_num", "planning_timer", "disable_timer", "duel_id_full")
+
+
+# TODO: remove the sleep_time params in 2.0
+def _warn_sleep_time(sleep_time: float):
+    if sleep_time != 0.5:
+        warn(
+            "sleep_time is unused and will be removed in 2.0, the client's duel_watcher sets how often the duel is read",
+            DeprecationWarning,
+            stacklevel=3,
+        )
 
 
 class CombatHandler:
     """
     Handles client's battles
+
+    Rounds are only budgeted if round_fallback is set: handle_round is then cancelled
+    when it runs past the planning timer minus deadline_margin, any card it left
+    selected is unselected, and round_fallback is done in the time that is left
     """
 
+    # what to do when handle_round runs out of time, none to never cancel it
+    round_fallback = RoundFallback.none
+    # seconds before the planning timer ends that handle_round is cancelled at
+    deadline_margin = 1.0
+
     def __init__(self, client):
         self.client = client
 
         self._spell_check_boxes = None
+        # (spell window, graphical spell address) of a cast waiting for its target
+        self._selected_card = None
+        # set by CombatCoordinator while it handles this client's round
+        self.shared_round = None
+        # set while handle_round runs
+        self.round_budget: Optional[RoundBudget] = None
+        # timings of the last 100 handled rounds, oldest first
+        self.round_metrics = deque(maxlen=100)
 
     async def handle_round(self):
         """
         Called at the start of each round
+
+        round_budget has the time left before the round is cancelled
         """
         raise NotImplementedError()
 
+    async def handle_round_fallback(self):
+        """
+        Called when handle_round runs out of time, does round_fallback
+        """
+        if self.round_fallback is RoundFallback.none:
+            return
+
+        if self.round_fallback is RoundFallback.first_castable:
+            snapshot = await self.get_combat_snapshot(members=False)
+            for card in snapshot.cards:
+                if (
+                    card.is_castable
+                    and card.effects
+                    and all(effect.fields.effect_target in _UNTARGETED for effect in card.effects)
+                ):
+                    return await snapshot.card(card).cast(None)
+
+        await self.pass_button()
+
+    async def mark_card_selected(self, spell_window):
+        """
+        Record the card a cast is about to click so clear_card_selection can unselect it
+
+        Call it before clicking the card so a cast stopped during the click is still known
+
+        Args:
+            spell_window: The card's spell window
+        """
+        spell = await spell_window.maybe_graphical_spell()
+        self._selected_card = (spell_window, spell.base_address if spell else 0)
+
+    def mark_card_unselected(self):
+        """
+        Forget the card recorded by mark_card_selected, call it once the cast's target was clicked
+        """
+        self._selected_card = None
+
+    async def clear_card_selection(self):
+        """
+        Unselect the card of a cast that was stopped before its target was clicked
+
+        The card is only clicked if its window is still visible and holds the same card
+        """
+        if self._selected_card is None:
+            return
+
+        spell_window, spell_address = self._selected_card
+        self._selected_card = None
+
+        try:
+            spell = await spell_window.maybe_graphical_spell()
+            visible = await spell_window.is_visible()
+        except MemoryReadError:
+            return
+
+        # the card was cast or the window now holds another card that a click would select
+        if not visible or spell is None or spell.base_address != spell_address:
+            return
+
+        # clicking the selected card again unselects it
+        await self.client.mouse_handler.click_window(spell_window)
+
+    async def _run_fallback(self):
+        # handle_round might have been cancelled between clicking a card and its target
+        await self.clear_card_selection()
+        await self.handle_round_fallback()
+
     async def handle_combat(self):
         """
         Handles an entire combat interaction
         """
         while await self.in_combat():
             await self.wait_for_planning_phase()
-            round_number = await self.round_number()
-            # TODO: handle this taking longer than planning timer time
-            await self.handle_round()
-            await self.wait_until_next_round(round_number)
+            budget = await self.start_round_budget()
+            await self.run_round(budget)
+            await self.wait_until_next_round(budget.round_number)
 
         self._spell_check_boxes = None
 
+    async def start_round_budget(
+        self, *, started: Optional[float] = None, margin: Optional[float] = None
+    ) -> RoundBudget:
+        """
+        Read the planning timer and budget the current round
+
+        Args:
+            started: Event loop time the planning phase was seen at, now if None
+            margin: Seconds before the planning timer ends that the budget runs out at,
+                deadline_margin if None
+        """
+        if margin is None:
+            margin = self.deadline_margin
+
+        loop = asyncio.get_event_loop()
+        read_started = loop.time()
+
+        # only the fields the budget needs so unrelated fields can't fail the round
+        duel = self.client.duel
+        fields = [duel.get_snapshot_field(name) for name in _BUDGET_FIELDS]
+        values = await duel.read_values_from_offsets(
+            (field.offset, field.data_type) for field in fields
+        )
+        budget = RoundBudget.from_duel(*values, margin=margin, started=started)
+        budget.phases["read_timer"] = loop.time() - read_started
+        return budget
+
+    async def run_round(self, budget: RoundBudget) -> RoundMetrics:
+        """
+        Run handle_round within a budget, doing round_fallback if it runs out
+
+        handle_round is never cancelled when round_fallback is none.
+        The round's metrics are added to round_metrics
+
+        Args:
+            budget: The round's budget
+
+        Returns:
+            The round's metrics
+        """
+        timed_out = False
+        fallback = None
+
+        timeout = None
+        if self.round_fallback is not RoundFallback.none:
+            timeout = budget.remaining()
+
+        self._selected_card = None
+        self.round_budget = budget
+        try:
+            with budget.phase("handle_round"):
+                await asyncio.wait_for(self.handle_round(), timeout)
+
+        except asyncio.TimeoutError:
+            timed_out = True
+            fallback = self.round_fallback
+
+            # the rest of the planning timer; nothing can be done after it
+            with budget.phase("fallback"):
+                try:
+                    await asyncio.wait_for(
+                        self._run_fallback(), budget.timer_remaining()
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+        finally:
+            self.round_budget = None
+
+        metrics = budget.metrics(timed_out=timed_out, fallback=fallback)
+        self.round_metrics.append(metrics)
+        return metrics
+
     # TODO: remove in 2.0
     async def wait_for_hand_visible(self, sleep_time: float = 0.5):
         """
@@ -58,43 +243,33 @@ class CombatHandler:
         Wait for the duel to enter the planning phase
 
         Args:
-            sleep_time: Time to sleep between checks
+            sleep_time: Unused, the client's duel_watcher sets how often the phase is read
         """
-        while True:
-            try:
-                phase = await self.client.duel.duel_phase()
-                if phase in (DuelPhase.planning, DuelPhase.ended):
-                    break
-
-                await asyncio.sleep(sleep_time)
-
-            except WizWalkerMemoryError:
-                break
+        _warn_sleep_time(sleep_time)
+        await self.client.duel_watcher.wait_for_phase(DuelPhase.planning, DuelPhase.ended)
 
     async def wait_for_combat(self, sleep_time: float = 0.5):
         """
         Wait until in combat
+
+        Args:
+            sleep_time: Unused, the client's duel_watcher sets how often the duel is read
         """
-        await utils.maybe_wait_for_value_with_timeout(
-            self.client.duel.read_base_address,
-            value=0,
-            inverse_value=True,
-        )
-        await utils.wait_for_value(self.in_combat, True, sleep_time)
+        _warn_sleep_time(sleep_time)
+        await self.client.duel_watcher.wait_for_combat()
         await self.handle_combat()
 
     async def wait_until_next_round(self, current_round: int, sleep_time: float = 0.5):
         """
         Wait for the round number to change
-        """
-        # can't use wait_for_value bc of the special in_combat condition
-        # so we don't get stuck waiting if combat ends
-        while await self.in_combat():
-            new_round_number = await self.round_number()
-            if new_round_number > current_round:
-                return
 
-            await asyncio.sleep(sleep_time)
+        Args:
+            current_round: The round to wait to be over
+            sleep_time: Unused, the client's duel_watcher sets how often the round is read
+        """
+        _warn_sleep_time(sleep_time)
+        # also returns if combat ends so we don't get stuck waiting
+        await self.client.duel_watcher.wait_for_round_change(current_round)
 
     async def in_combat(self) -> bool:
         """
@@ -196,6 +371,21 @@ class CombatHandler:
 
         raise ValueError(f"Couldn't find a card display named {display_name}")
 
+    async def get_combat_snapshot(
+        self, *, cards: bool = True, members: bool = True
+    ) -> CombatSnapshot:
+        """
+        Read the visible cards and the combat members at once
+
+        Args:
+            cards: If cards should be read, the snapshot has no cards if False
+            members: If members should be read, the snapshot has no members if False
+
+        Returns:
+            A CombatSnapshot that can be filtered without further reads
+        """
+        return await CombatSnapshot.capture(self, cards=cards, members=members)
+
     # TODO: add allow_treasure_cards that defaults to False
     async def get_damaging_aoes(self, *, check_enchanted: bool = None):
         """
@@ -204,39 +394,11 @@ class CombatHandler:
         Keyword Args:
             check_enchanted: None -> don't check enchanted; False -> non-enchanted; True -> enchanted
         """
-
-        async def _pred(card):
-            if check_enchanted is True:
-                if not await card.is_enchanted():
-                    return False
-
-            elif check_enchanted is False:
-                if await card.is_enchanted():
-                    return False
-
-            if await card.type_name() != "AOE":
-                return False
-
-            effects = await card.get_spell_effects()
-
-            for effect in effects:
-                effect_type = await effect.maybe_read_type_name()
-                if any(substr in effect_type.lower() for substr in ("variable", "random")):
-                    for sub_effect in await effect.maybe_effect_list():
-                        if await sub_effect.effect_target() in (
-                            EffectTarget.enemy_team,
-                            EffectTarget.enemy_team_all_at_once,
-                        ):
-                            return True
-
-                else:
-                    if await effect.effect_target() in (
-                        EffectTarget.enemy_team,
-                        EffectTarget.enemy_team_all_at_once,
-                    ):
-                        return True
-
-        return await self.get_cards_with_predicate(_pred)
+        snapshot = await self.get_combat_snapshot(members=False)
+        return [
+            snapshot.card(record)
+            for record in snapshot.damaging_aoes(check_enchanted=check_enchanted)
+        ]
 
     async def get_damage_enchants(self, *, sort_by_damage: bool = False):
         """
@@ -245,27 +407,11 @@ class CombatHandler:
         Keyword Args:
             sort_by_damage: If enchants should be sorted by how much damage they add
         """
-
-        async def _pred(card):
-            if await card.type_name() != "Enchantment":
-                return False
-
-            for effect in await card.get_spell_effects():
-                if await effect.effect_type() == SpellEffects.modify_card_damage:
-                    return True
-
-            return False
-
-        damage_enchants = await self.get_cards_with_predicate(_pred)
-
-        if not sort_by_damage:
-            return damage_enchants
-
-        async def _sort_by_damage(card):
-            effect = (await card.get_spell_effects())[0]
-            return await effect.effect_param()
-
-        return await utils.async_sorted(damage_enchants, key=_sort_by_damage)
+        snapshot = await self.get_combat_snapshot(members=False)
+        return [
+            snapshot.card(record)
+            for record in snapshot.damage_enchants(sort_by_damage=sort_by_damage)
+        ]
 
     async def get_members(self) -> List[CombatMember]:
         """
@@ -453,37 +599,42 @@ class AoeHandler(CombatHandler):
     """
 
     async def handle_round(self):
-        enchanted_aoes = await self.get_damaging_aoes(check_enchanted=True)
+        snapshot = await self.get_combat_snapshot(members=False)
+
+        enchanted_aoes = snapshot.damaging_aoes(check_enchanted=True)
         if enchanted_aoes:
-            await enchanted_aoes[0].cast(None)
+            await snapshot.card(enchanted_aoes[0]).cast(None)
+            # the hand changed
+            snapshot = await self.get_combat_snapshot(members=False)
 
-        unenchanted_aoes = await self.get_damaging_aoes(check_enchanted=False)
-        enchants = await self.get_damage_enchants(sort_by_damage=True)
+        unenchanted_aoes = snapshot.damaging_aoes(check_enchanted=False)
+        enchants = snapshot.damage_enchants(sort_by_damage=True)
 
         # enchant card then cast card
         if enchants and unenchanted_aoes:
-            await enchants[0].cast(unenchanted_aoes[0])
-            enchanted_aoes = await self.get_damaging_aoes(check_enchanted=True)
+            await snapshot.card(enchants[0]).cast(snapshot.card(unenchanted_aoes[0]))
+            snapshot = await self.get_combat_snapshot(members=False)
+            enchanted_aoes = snapshot.damaging_aoes(check_enchanted=True)
 
             if not enchanted_aoes:
                 raise Exception("Enchant failure")
 
             to_cast = enchanted_aoes[0]
 
-            if await to_cast.is_castable():
-                await to_cast.cast(None)
+            if to_cast.is_castable:
+                await snapshot.card(to_cast).cast(None)
 
         # no enchants so just cast card
         elif not enchants and unenchanted_aoes:
             to_cast = unenchanted_aoes[0]
 
-            if await to_cast.is_castable():
-                await to_cast.cast(None)
+            if to_cast.is_castable:
+                await snapshot.card(to_cast).cast(None)
 
         # hand full of enchants or enchants + other cards
         elif enchants and not unenchanted_aoes:
-            if len(await self.get_cards()) == 7:
-                await enchants[0].discard()
+            if len(snapshot.cards) == 7:
+                await snapshot.card(enchants[0]).discard()
 
             # TODO: draw tc?
             else:
@@ -492,7 +643,7 @@ class AoeHandler(CombatHandler):
         # no enchants or aoes in hand
         else:
             # TODO: maybe flee instead?
-            if len(await self.get_cards()) == 0:
+            if len(snapshot.cards) == 0:
                 raise Exception("Out of cards")
 
             # TODO: add method for people to subclass for this?
@@ -0,0 +1,579 @@
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from .card import CombatCard
+from .member import CombatMember
+from ..memory import (
+    CombatParticipant,
+    DynamicWindow,
+    EffectTarget,
+    GameStats,
+    Spell,
+    SpellEffectRecord,
+    SpellEffects,
+    SpellTemplateCache,
+    WindowFlags,
+)
+from wizwalker import type_struct_dict
+
+
+# Window
+_FLAGS = 156
+_TEXT = 584
+_GRAPHICAL_SPELL = 952
+_SPELL_GRAYED = 1024
+_COMBAT_PARTICIPANT = 1656
+
+# Spell
+_SPELL_TEMPLATE = 120
+
+# CombatParticipant
+_GAME_STATS = 312
+
+# objects of one combat are allocated close together so nearby reads are merged
+_MAX_READ_GAP = 0x1000
+
+_UNSIGNED_INT = type_struct_dict["unsigned int"]
+_LONG_LONG = type_struct_dict["long long"]
+_BOOL = type_struct_dict["bool"]
+
+
+class CombatCardRecord(NamedTuple):
+    """
+    A card of a CombatSnapshot
+
+    Args:
+        window_address: Address of the card's SpellCheckBox window
+        spell_address: Address of the card's graphical spell
+        template_address: Address of the card's spell template, 0 if it has none
+        name: The card's (debug) name
+        display_name_code: Langcode of the card's display name
+        display_name: The card's display name, empty if it wasn't resolved
+        type_name: The card's type name i.e. AOE
+        magic_school_name: Name of the card's school
+        is_castable: If the card wasn't grayed out
+        spell: The graphical spell's Spell snapshot_fields
+        template: The template's SpellTemplate snapshot_fields, None if it has no template
+        effects: The template's effects, shared by every copy of the card
+    """
+
+    window_address: int
+    spell_address: int
+    template_address: int
+    name: str
+    display_name_code: str
+    display_name: str
+    type_name: str
+    magic_school_name: str
+    is_castable: bool
+    spell: tuple
+    template: Optional[tuple]
+    effects: Tuple[SpellEffectRecord, ...]
+
+    @property
+    def is_enchanted(self) -> bool:
+        return self.spell.enchantment != 0
+
+
+class CombatMemberRecord(NamedTuple):
+    """
+    A member of a CombatSnapshot
+
+    Args:
+        window_address: Address of the member's CombatantControl window
+        participant_address: Address of the member's combat participant
+        stats_address: Address of the member's game stats, 0 if it has none
+        name: Text of the member's name window
+        is_client: If the member is the local client
+        participant: The participant's CombatParticipant snapshot_fields
+        stats: The game stats' GameStats snapshot_fields, None if it has no stats
+    """
+
+    window_address: int
+    participant_address: int
+    stats_address: int
+    name: str
+    is_client: bool
+    participant: tuple
+    stats: Optional[tuple]
+
+    @property
+    def is_dead(self) -> bool:
+        return self.stats is not None and self.stats.current_hitpoints == 0
+
+    @property
+    def is_player(self) -> bool:
+        return self.participant.is_player
+
+    @property
+    def is_minion(self) -> bool:
+        return self.participant.is_minion
+
+    @property
+    def is_monster(self) -> bool:
+        return not self.is_player and not self.is_minion
+
+    @property
+    def is_boss(self) -> bool:
+        return self.participant.boss_mob
+
+    @property
+    def is_stunned(self) -> bool:
+        return self.participant.stunned != 0
+
+
+class CombatSnapshot:
+    """
+    The hand and combat members read once with batched reads
+
+    Records are plain values so filtering them needs no reads;
+    use card and member to get wrappers for casting
+
+    Args:
+        combat_handler: The combat handler the snapshot was captured with
+        round_number: The round the snapshot was captured in
+        cards: Visible cards, in the same order as CombatHandler.get_cards
+        members: Members, in the same order as CombatHandler.get_members
+
+    Examples:
+        .. code-block:: py
+
+            snapshot = await combat_handler.get_combat_snapshot()
+            castable = snapshot.find_cards(predicate=lambda card: card.is_castable)
+            boss = snapshot.find_members(predicate=lambda member: member.is_boss)
+    """
+
+    def __init__(
+        self,
+        combat_handler,
+        round_number: int,
+        cards: List[CombatCardRecord],
+        members: List[CombatMemberRecord],
+    ):
+        self.combat_handler = combat_handler
+        self.round_number = round_number
+        self.cards = cards
+        self.members = members
+
+    def card(self, record: CombatCardRecord) -> CombatCard:
+        """
+        Get the CombatCard of a card record
+        """
+        return CombatCard(
+            self.combat_handler,
+            DynamicWindow(self.combat_handler.client.hook_handler, record.window_address),
+        )
+
+    def member(self, record: CombatMemberRecord) -> CombatMember:
+        """
+        Get the CombatMember of a member record
+        """
+        return CombatMember(
+            self.combat_handler,
+            DynamicWindow(self.combat_handler.client.hook_handler, record.window_address),
+        )
+
+    def find_cards(
+        self,
+        *,
+        name: Optional[str] = None,
+        display_name: Optional[str] = None,
+        type_name: Optional[str] = None,
+        predicate: Optional[Callable[[CombatCardRecord], bool]] = None,
+    ) -> List[CombatCardRecord]:
+        """
+        Find cards matching every passed filter
+
+        Args:
+            name: Name the card must have, ignoring case
+            display_name: Text the card's display name must contain, ignoring case
+            type_name: Type name the card must have
+            predicate: Non async function taking a CombatCardRecord and returning if it matches
+
+        Returns:
+            The matching cards
+        """
+        cards = self.cards
+
+        if name is not None:
+            name = name.lower()
+            cards = [card for card in cards if card.name.lower() == name]
+
+        if display_name is not None:
+            display_name = display_name.lower()
+            cards = [card for card in cards if display_name in card.display_name.lower()]
+
+        if type_name is not None:
+            cards = [card for card in cards if card.type_name == type_name]
+
+        if predicate is not None:
+            cards = [card for card in cards if predicate(card)]
+
+        return list(cards)
+
+    def find_members(
+        self,
+        *,
+        name: Optional[str] = None,
+        predicate: Optional[Callable[[CombatMemberRecord], bool]] = None,
+    ) -> List[CombatMemberRecord]:
+        """
+        Find members matching every passed filter
+
+        Args:
+            name: Text the member's name must contain, ignoring case
+            predicate: Non async function taking a CombatMemberRecord and returning if it matches
+
+        Returns:
+            The matching members
+        """
+        members = self.members
+
+        if name is not None:
+            name = name.lower()
+            members = [member for member in members if name in member.name.lower()]
+
+        if predicate is not None:
+            members = [member for member in members if predicate(member)]
+
+        return list(members)
+
+    @property
+    def client_member(self) -> Optional[CombatMemberRecord]:
+        """
+        The local client's member, None if it wasn't found
+        """
+        for member in self.members:
+            if member.is_client:
+                return member
+
+        return None
+
+    def damaging_aoes(
+        self, *, check_enchanted: Optional[bool] = None
+    ) -> List[CombatCardRecord]:
+        """
+        The same as CombatHandler.get_damaging_aoes
+
+        Args:
+            check_enchanted: None -> don't check enchanted; False -> non-enchanted; True -> enchanted
+        """
+        enemy_targets = (EffectTarget.enemy_team, EffectTarget.enemy_team_all_at_once)
+
+        def _pred(card: CombatCardRecord) -> bool:
+            if check_enchanted is not None and card.is_enchanted != check_enchanted:
+                return False
+
+            if card.type_name != "AOE":
+                return False
+
+            for effect in card.effects:
+                if any(
+                    substr in effect.type_name.lower() for substr in ("variable", "random")
+                ):
+                    if any(
+                        sub_effect.fields.effect_target in enemy_targets
+                        for sub_effect in effect.effects
+                    ):
+                        return True
+
+                elif effect.fields.effect_target in enemy_targets:
+                    return True
+
+            return False
+
+        return self.find_cards(predicate=_pred)
+
+    def damage_enchants(self, *, sort_by_damage: bool = False) -> List[CombatCardRecord]:
+        """
+        The same as CombatHandler.get_damage_enchants
+
+        Args:
+            sort_by_damage: If enchants should be sorted by how much damage they add
+        """
+        enchants = self.find_cards(
+            type_name="Enchantment",
+            predicate=lambda card: any(
+                effect.fields.effect_type == SpellEffects.modify_card_damage
+                for effect in card.effects
+            ),
+        )
+
+        if sort_by_damage:
+            enchants.sort(key=lambda card: card.effects[0].fields.effect_param)
+
+        return enchants
+
+    @classmethod
+    async def capture(
+        cls, combat_handler, *, cards: bool = True, members: bool = True
+    ) -> "CombatSnapshot":
+        """
+        Read the visible cards and the combat members
+
+        Cards whose graphical spell isn't set yet and members without
+        a combat participant are left out
+
+        Args:
+            combat_handler: The combat handler of the client to read
+            cards: If cards should be read, the snapshot has no cards if False
+            members: If members should be read, the snapshot has no members if False
+
+        Returns:
+            The snapshot
+        """
+        client = combat_handler.client
+        hook_handler = client.hook_handler
+
+        card_windows = []
+        if cards:
+            # cards are ordered right to left so we need to flip them
+            card_windows = [
+                window.base_address
+                for window in (await combat_handler._get_card_windows())[::-1]
+            ]
+
+        # (combatant control, name window)
+        member_windows = []
+        if members:
+            # a full walk since combatant controls are recreated for every duel
+            # which window_index can miss
+            member_windows = await _find_member_windows(client)
+
+        # every object is read through the page cache so nearby fields
+        # read in separate steps cost a single process read
+        async with hook_handler.frame():
+            round_number = await combat_handler.round_number()
+            card_records = await cls._read_cards(client, card_windows)
+            member_records = await cls._read_members(client, member_windows)
+
+        # langcodes are read from the game's files so this is kept out of the frame
+        card_records = await cls._resolve_display_names(client, card_records)
+
+        return cls(combat_handler, round_number, card_records, member_records)
+
+    @staticmethod
+    async def _read_cards(client, card_windows: List[int]) -> List[CombatCardRecord]:
+        hook_handler = client.hook_handler
+
+        window_datas = await hook_handler.read_many(
+            (
+                range_
+                for address in card_windows
+                for range_ in (
+                    (address + _FLAGS, 4),
+                    (address + _GRAPHICAL_SPELL, 8),
+                    (address + _SPELL_GRAYED, 1),
+                )
+            ),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+
+        # (window, graphical spell, is castable)
+        visible_cards = []
+        for index, window in enumerate(card_windows):
+            flags, spell, grayed = window_datas[index * 3 : index * 3 + 3]
+            if flags is None or spell is None or grayed is None:
+                continue
+
+            if not _UNSIGNED_INT.unpack(flags)[0] & WindowFlags.visible.value:
+                continue
+
+            spell = _LONG_LONG.unpack(spell)[0]
+            if spell:
+                visible_cards.append((window, spell, not _BOOL.unpack(grayed)[0]))
+
+        spells = [spell for _, spell, _ in visible_cards]
+        spell_records = await Spell.snapshot_many(hook_handler, spells, max_gap=_MAX_READ_GAP)
+
+        # templates are shared by every copy of a card and don't change
+        # so only templates that aren't cached yet need their pointer read
+        template_cache = SpellTemplateCache.get_for(hook_handler)
+        missing = [
+            spell
+            for spell, spell_record in zip(spells, spell_records)
+            if spell_record is not None and spell_record.template_id not in template_cache
+        ]
+        template_datas = await hook_handler.read_many(
+            ((spell + _SPELL_TEMPLATE, 8) for spell in missing),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+        template_addresses = dict(
+            zip(
+                missing,
+                (
+                    _LONG_LONG.unpack(data)[0] if data is not None else 0
+                    for data in template_datas
+                ),
+            )
+        )
+        await template_cache.read(
+            hook_handler,
+            {
+                spell_record.template_id: template_addresses[spell]
+                for spell, spell_record in zip(spells, spell_records)
+                if spell in template_addresses
+            },
+        )
+
+        cards = []
+        for (window, spell, is_castable), spell_record in zip(visible_cards, spell_records):
+            if spell_record is None:
+                continue
+
+            template = template_cache.get(spell_record.template_id)
+            if template is None:
+                cards.append(
+                    CombatCardRecord(
+                        window, spell, 0, "", "", "", "", "", is_castable, spell_record, None, ()
+                    )
+                )
+                continue
+
+            cards.append(
+                CombatCardRecord(
+                    window,
+                    spell,
+                    template.address,
+                    template.name,
+                    template.display_name_code,
+                    # set by _resolve_display_names
+                    "",
+                    template.type_name,
+                    template.magic_school_name,
+                    is_castable,
+                    spell_record,
+                    template.fields,
+                    template.effects,
+                )
+            )
+
+        return cards
+
+    @staticmethod
+    async def _resolve_display_names(
+        client, cards: List[CombatCardRecord]
+    ) -> List[CombatCardRecord]:
+        codes = {card.display_name_code for card in cards if card.display_name_code}
+        if not codes:
+            return cards
+
+        display_names = await client.cache_handler.get_langcode_names(codes)
+        return [
+            card._replace(display_name=display_names.get(card.display_name_code) or "")
+            for card in cards
+        ]
+
+    @staticmethod
+    async def _read_members(
+        client, member_windows: List[Tuple[int, int]]
+    ) -> List[CombatMemberRecord]:
+        hook_handler = client.hook_handler
+
+        participant_datas = await hook_handler.read_many(
+            ((window + _COMBAT_PARTICIPANT, 8) for window, _ in member_windows),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+        # (window, participant)
+        participants = []
+        name_windows = []
+        for (window, name_window), data in zip(member_windows, participant_datas):
+            if data is None:
+                continue
+
+            participant = _LONG_LONG.unpack(data)[0]
+            if participant:
+                participants.append((window, participant))
+                name_windows.append(name_window)
+
+        participant_records = await CombatParticipant.snapshot_many(
+            hook_handler,
+            (participant for _, participant in participants),
+            max_gap=_MAX_READ_GAP,
+        )
+        stats_datas = await hook_handler.read_many(
+            ((participant + _GAME_STATS, 8) for _, participant in participants),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+        stats = [_LONG_LONG.unpack(data)[0] if data is not None else 0 for data in stats_datas]
+        stats_records = await GameStats.snapshot_many(
+            hook_handler, (address for address in stats if address), max_gap=_MAX_READ_GAP
+        )
+        stats_records = iter(stats_records)
+
+        names = await client.root_window.read_wide_strings(
+            (name_window + _TEXT for name_window in name_windows if name_window),
+            max_gap=_MAX_READ_GAP,
+        )
+        names = iter(names)
+
+        client_global_id = await client.client_object.global_id_full()
+
+        members = []
+        for (window, participant), participant_record, stats_address, name_window in zip(
+            participants, participant_records, stats, name_windows
+        ):
+            stats_record = next(stats_records) if stats_address else None
+            name = next(names) if name_window else ""
+
+            if participant_record is None:
+                continue
+
+            members.append(
+                CombatMemberRecord(
+                    window,
+                    participant,
+                    stats_address,
+                    name,
+                    participant_record.owner_id_full == client_global_id,
+                    participant_record,
+                    stats_record,
+                )
+            )
+
+        return members
+
+
+async def _find_member_windows(client) -> List[Tuple[int, int]]:
+    # (combatant control, name window) in the same order as CombatHandler.get_members
+    nodes = {}
+    controls = []
+    async for level in client.root_window.walk_tree():
+        for node in level:
+            nodes[node.window.base_address] = node
+            if node.name == "CombatantControl":
+                controls.append(node)
+
+    controls.sort(key=lambda node: (node.depth != 1, node.path))
+    return [
+        (control.window.base_address, _find_name_window(nodes, control))
+        for control in controls
+    ]
+
+
+def _find_name_window(nodes: dict, control_node) -> int:
+    # the same window as CombatMember.get_name_text_window
+    found = []
+    visited = {control_node.window.base_address}
+    to_visit = list(control_node.children)
+    while to_visit:
+        address = to_visit.pop()
+        node = nodes.get(address)
+        if node is None or address in visited:
+            continue
+
+        visited.add(address)
+
+        if node.name == "Name":
+            found.append(node)
+
+        to_visit.extend(node.children)
+
+    if not found:
+        return 0
+
+    found.sort(key=lambda node: (node.depth != control_node.depth + 1, node.path))
+    return found[0].window.base_address
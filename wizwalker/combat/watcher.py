@@ -0,0 +1,268 @@
+import asyncio
+from typing import AsyncIterator, Callable, List, NamedTuple, Optional, Tuple
+
+from ..memory import DuelPhase
+from wizwalker import ExceptionalTimeout, WizWalkerMemoryError
+
+
+class DuelState(NamedTuple):
+    """
+    The client's duel as of one watcher tick
+
+    Args:
+        base_address: Address of the current duel, 0 if there hasn't been one
+        phase: The duel's phase, ended if it couldn't be read
+        round_number: The duel's round number, 0 if there is no duel
+    """
+
+    base_address: int
+    phase: DuelPhase
+    round_number: int
+
+    @property
+    def in_combat(self) -> bool:
+        return self.phase is not DuelPhase.ended
+
+
+class DuelEvent(NamedTuple):
+    """
+    A change between two watcher ticks
+
+    Args:
+        previous: State before the change
+        current: State after the change
+    """
+
+    previous: DuelState
+    current: DuelState
+
+    @property
+    def phase_changed(self) -> bool:
+        return self.previous.phase is not self.current.phase
+
+    @property
+    def round_changed(self) -> bool:
+        return self.previous.round_number != self.current.round_number
+
+    @property
+    def base_changed(self) -> bool:
+        return self.previous.base_address != self.current.base_address
+
+
+_NO_DUEL = DuelState(0, DuelPhase.ended, 0)
+
+
+class DuelWatcher:
+    """
+    Polls a client's duel for every waiter at once
+
+    The duel base, phase, and round number are read together once per tick;
+    ticks run every interval while a waiter is in combat or right after a change
+    and otherwise back off to idle_interval. Nothing is read while nothing is waiting
+
+    Args:
+        client: The client to watch
+        interval: Shortest time between ticks
+        idle_interval: Longest time between ticks
+
+    Examples:
+        .. code-block:: py
+
+            async for event in client.duel_watcher.events():
+                if event.phase_changed:
+                    print(f"{event.previous.phase} -> {event.current.phase}")
+    """
+
+    def __init__(self, client, *, interval: float = 0.1, idle_interval: float = 0.5):
+        self.client = client
+        self.interval = interval
+        self.idle_interval = idle_interval
+
+        # last state read, None until the first tick
+        self.state: Optional[DuelState] = None
+
+        self._task = None
+        self._wake = None
+        # (predicate, future)
+        self._waiters: List[Tuple[Callable[[DuelState], bool], asyncio.Future]] = []
+        self._queues: List[asyncio.Queue] = []
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def _read_state(self) -> DuelState:
+        try:
+            (
+                base_address,
+                phase,
+                round_number,
+            ) = await self.client.hook_handler.read_current_duel_state()
+            return DuelState(base_address, DuelPhase(phase), round_number)
+        # the same as Client.in_battle
+        except (WizWalkerMemoryError, ValueError):
+            return _NO_DUEL
+
+    def _publish(self, state: DuelState) -> bool:
+        previous, self.state = self.state, state
+        changed = previous is not None and previous != state
+
+        if changed:
+            event = DuelEvent(previous, state)
+            for queue in self._queues:
+                queue.put_nowait(event)
+
+        for predicate, future in self._waiters:
+            if future.done():
+                continue
+
+            try:
+                if predicate(state):
+                    future.set_result(state)
+            except Exception as exc:
+                future.set_exception(exc)
+
+        return changed
+
+    def _fail(self, exc: BaseException):
+        for _, future in self._waiters:
+            if not future.done():
+                future.set_exception(exc)
+
+        for queue in self._queues:
+            queue.put_nowait(exc)
+
+    async def _run(self):
+        sleep_time = self.interval
+        try:
+            while True:
+                # nothing is awaited between the check and clearing _task
+                # so a new waiter either sees this loop running or starts another
+                if not self._waiters and not self._queues:
+                    self._task = None
+                    return
+
+                self._wake.clear()
+                state = await self._read_state()
+                changed = self._publish(state)
+
+                if changed or (state.in_combat and self._waiters):
+                    sleep_time = self.interval
+                else:
+                    sleep_time = min(sleep_time * 2, self.idle_interval)
+
+                try:
+                    await asyncio.wait_for(self._wake.wait(), sleep_time)
+                except asyncio.TimeoutError:
+                    pass
+
+        except Exception as exc:
+            self._fail(exc)
+
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+    def _ensure_running(self):
+        if self._wake is None:
+            self._wake = asyncio.Event()
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        else:
+            # new waiters are only checked against fresh reads
+            self._wake.set()
+
+    async def wait_for(
+        self,
+        predicate: Callable[[DuelState], bool],
+        *,
+        timeout: Optional[float] = None,
+    ) -> DuelState:
+        """
+        Wait for the duel to be in a state
+
+        Args:
+            predicate: Non async function taking a DuelState and returning if it is the wanted state
+            timeout: Time to wait before raising ExceptionalTimeout, None to wait forever
+
+        Raises:
+            ExceptionalTimeout: If timeout is passed
+
+        Returns:
+            The first state read after this was called that matched
+        """
+        future = asyncio.get_event_loop().create_future()
+        waiter = (predicate, future)
+        self._waiters.append(waiter)
+        self._ensure_running()
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise ExceptionalTimeout("Timed out waiting for duel state")
+        finally:
+            self._waiters.remove(waiter)
+
+    async def wait_for_phase(
+        self, *phases: DuelPhase, timeout: Optional[float] = None
+    ) -> DuelState:
+        """
+        Wait for the duel to be in one of phases
+
+        Args:
+            phases: The phases to wait for
+            timeout: Time to wait before raising ExceptionalTimeout, None to wait forever
+        """
+        return await self.wait_for(lambda state: state.phase in phases, timeout=timeout)
+
+    async def wait_for_round_change(
+        self, current_round: int, *, timeout: Optional[float] = None
+    ) -> DuelState:
+        """
+        Wait for the round number to pass current_round or combat to end
+
+        Args:
+            current_round: The round to wait for the end of
+            timeout: Time to wait before raising ExceptionalTimeout, None to wait forever
+        """
+        return await self.wait_for(
+            lambda state: not state.in_combat or state.round_number > current_round,
+            timeout=timeout,
+        )
+
+    async def wait_for_combat(self, *, timeout: Optional[float] = None) -> DuelState:
+        """
+        Wait for the client to be in combat
+
+        Args:
+            timeout: Time to wait before raising ExceptionalTimeout, None to wait forever
+        """
+        return await self.wait_for(
+            lambda state: state.base_address != 0 and state.in_combat, timeout=timeout
+        )
+
+    async def events(self) -> AsyncIterator[DuelEvent]:
+        """
+        Yield an event each time the duel base, phase, or round number changes
+
+        Examples:
+            .. code-block:: py
+
+                async for event in client.duel_watcher.events():
+                    if event.round_changed:
+                        print(f"round {event.current.round_number}")
+        """
+        queue = asyncio.Queue()
+        self._queues.append(queue)
+        self._ensure_running()
+
+        try:
+            while True:
+                event = await queue.get()
+                if isinstance(event, BaseException):
+                    raise event
+
+                yield event
+        finally:
+            self._queues.remove(queue)
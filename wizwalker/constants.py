@@ -1,11 +1,18 @@
 import ctypes
+import struct
+import sys
 from enum import Enum
+from functools import lru_cache
 
 
-user32 = ctypes.windll.user32
-kernel32 = ctypes.windll.kernel32
-gdi32 = ctypes.windll.gdi32
-ntdll = ctypes.windll.ntdll
+if sys.platform == "win32":
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+    gdi32 = ctypes.windll.gdi32
+    ntdll = ctypes.windll.ntdll
+else:
+    # only the platform independent parts (like SimulatedProcess) work here
+    user32 = kernel32 = gdi32 = ntdll = None
 
 
 # Number of units covered in 1 second
@@ -29,6 +36,31 @@ type_format_dict = {
     "double": "<d",
 }
 
+# precompiled structs for type_format_dict
+type_struct_dict = {
+    data_type: struct.Struct(type_format)
+    for data_type, type_format in type_format_dict.items()
+}
+
+
+@lru_cache(maxsize=None)
+def get_vector_struct(data_type: str, size: int) -> struct.Struct:
+    """
+    Get a precompiled struct for size consecutive values of data_type
+
+    Args:
+        data_type: The type of each value (defined in type_format_dict)
+        size: Number of values
+
+    Returns:
+        The cached struct.Struct
+    """
+    type_format = type_format_dict.get(data_type)
+    if type_format is None:
+        raise ValueError(f"{data_type} is not a valid data type")
+
+    return struct.Struct("<" + type_format.replace("<", "") * size)
+
 
 # noinspection PyPep8
 class Keycode(Enum):
@@ -2,7 +2,7 @@ import json
 from collections import defaultdict
 from functools import cached_property
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
 
 import aiofiles
 from loguru import logger
@@ -16,6 +16,9 @@ class CacheHandler:
         self._wad_cache = None
         self._template_ids = None
         self._node_cache = None
+        # langmap.json once loaded and the lang files checked for updates this run
+        self._langcode_map = None
+        self._checked_lang_files = set()
 
         self._root_wad = Wad.from_game_data("root")
 
@@ -153,6 +156,7 @@ class CacheHandler:
 
         lang_map = await self._get_langcode_map()
         lang_map.update(parsed_lang)
+        self._langcode_map = lang_map
         async with aiofiles.open(self.cache_dir / "langmap.json", "w+") as fp:
             json_data = json.dumps(lang_map)
             await fp.write(json_data)
@@ -171,15 +175,20 @@ class CacheHandler:
         await self.write_wad_cache()
         lang_map = await self._get_langcode_map()
         lang_map.update(parsed_lang_map)
+        self._langcode_map = lang_map
         async with aiofiles.open(self.cache_dir / "langmap.json", "w+") as fp:
             json_data = json.dumps(lang_map)
             await fp.write(json_data)
 
     async def _get_langcode_map(self) -> dict:
+        if self._langcode_map is not None:
+            return self._langcode_map
+
         try:
             async with aiofiles.open(self.cache_dir / "langmap.json") as fp:
                 data = await fp.read()
-                return json.loads(data)
+                self._langcode_map = json.loads(data)
+                return self._langcode_map
 
         # file not found
         except OSError:
@@ -246,6 +255,26 @@ class CacheHandler:
 
         return template_ids.get(str(template_id))
 
+    async def _cache_lang_file_by_name(self, lang_filename: str) -> bool:
+        # each lang file only needs to be checked for updates once per run
+        if lang_filename in self._checked_lang_files:
+            return True
+
+        lang_files = await self._get_all_lang_file_names(self._root_wad)
+
+        for filename in lang_files:
+            if filename == f"Locale/English/{lang_filename}.lang":
+                await self._cache_lang_file(self._root_wad, filename)
+                self._checked_lang_files.add(lang_filename)
+                return True
+
+        return False
+
+    @staticmethod
+    def _split_langcode(langcode: str):
+        split_point = langcode.find("_")
+        return langcode[:split_point], langcode[split_point + 1 :]
+
     async def get_langcode_name(self, langcode: str):
         """
         Get the langcode name from the langcode i.e Spells_00001
@@ -257,20 +286,9 @@ class CacheHandler:
             ValueError: If the langcode does not have a match
 
         """
-        split_point = langcode.find("_")
-        lang_filename = langcode[:split_point]
-        code = langcode[split_point + 1 :]
-
-        lang_files = await self._get_all_lang_file_names(self._root_wad)
+        lang_filename, code = self._split_langcode(langcode)
 
-        cached = False
-        for filename in lang_files:
-            if filename == f"Locale/English/{lang_filename}.lang":
-                await self._cache_lang_file(self._root_wad, filename)
-                cached = True
-                break
-
-        if not cached:
+        if not await self._cache_lang_file_by_name(lang_filename):
             raise ValueError(f"No lang file named {lang_filename}")
 
         langcode_map = await self.get_langcode_map()
@@ -286,6 +304,31 @@ class CacheHandler:
 
         return lang_name
 
+    async def get_langcode_names(self, langcodes: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Get the names of multiple langcodes, loading each lang file once
+
+        Args:
+            langcodes: Langcodes in the format filename_code
+
+        Returns:
+            Map of langcode to name, None for langcodes without a match
+        """
+        langcodes = set(langcodes)
+
+        lang_filenames = {self._split_langcode(langcode)[0] for langcode in langcodes}
+        for lang_filename in lang_filenames:
+            await self._cache_lang_file_by_name(lang_filename)
+
+        langcode_map = await self.get_langcode_map()
+
+        names = {}
+        for langcode in langcodes:
+            lang_filename, code = self._split_langcode(langcode)
+            names[langcode] = langcode_map.get(lang_filename, {}).get(code)
+
+        return names
+
     # async def get_nav_data(self, zone_name: str):
     #     """
     #
@@ -1,6 +1,15 @@
+from .backends import (
+    MemoryBackend,
+    MemoryRegion,
+    ModuleInfo,
+    PymemBackend,
+    SimulatedProcess,
+)
 from .handler import HookHandler
+from .module_image import ModuleImage, SectionInfo
+from .page_cache import PageCache
 from .hooks import *
 from .memory_object import MemoryObject
 from .memory_reader import MemoryReader
 from .memory_objects import *
-from .instance_finder import InstanceFinder
+from .instance_finder import InstanceFinder, InstanceIndex
@@ -0,0 +1,500 @@
+import bisect
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from wizwalker import MemoryReadError, MemoryWriteError, utils
+
+
+class MemoryRegion(NamedTuple):
+    """
+    A region of memory as returned by virtual_query
+
+    Args:
+        base_address: Start of the region
+        size: Size of the region in bytes
+        readable: If the region is committed and can be read
+    """
+
+    base_address: int
+    size: int
+    readable: bool
+
+
+class ModuleInfo(NamedTuple):
+    """
+    A module loaded in a process
+
+    Args:
+        name: Name of the module
+        base_address: Address the module is loaded at
+        size: Size of the module image
+    """
+
+    name: str
+    base_address: int
+    size: int
+
+
+class MemoryBackend:
+    """
+    Interface MemoryReader uses to access a process's memory
+
+    Backends raise MemoryReadError and MemoryWriteError when memory can't be accessed;
+    MemoryReader decides if that means the process closed.
+    """
+
+    # the object this backend wraps, if any
+    process = None
+
+    def is_running(self) -> bool:
+        """
+        If the process is still running
+        """
+        raise NotImplementedError()
+
+    def read_bytes(self, address: int, size: int) -> bytes:
+        """
+        Read size bytes from address
+        """
+        raise NotImplementedError()
+
+    def read_into(self, address: int, buffer: bytearray, size: int):
+        """
+        Read size bytes from address into the start of buffer
+
+        Backends that can read directly into a buffer should override this
+        """
+        memoryview(buffer)[:size] = self.read_bytes(address, size)
+
+    def write_bytes(self, address: int, data: bytes):
+        """
+        Write data to address
+        """
+        raise NotImplementedError()
+
+    def allocate(self, size: int) -> int:
+        """
+        Allocate size bytes and return their address
+        """
+        raise NotImplementedError()
+
+    def free(self, address: int):
+        """
+        Free memory returned by allocate
+        """
+        raise NotImplementedError()
+
+    def protect(self, address: int, size: int, protection: int) -> int:
+        """
+        Change the page protection of a range and return the old protection
+        """
+        raise NotImplementedError()
+
+    def virtual_query(self, address: int) -> MemoryRegion:
+        """
+        Get the region containing address
+        """
+        raise NotImplementedError()
+
+    def module_from_name(self, name: str) -> Optional[ModuleInfo]:
+        """
+        Get a loaded module by name or None if it isn't loaded
+        """
+        raise NotImplementedError()
+
+    def start_thread(self, address: int):
+        """
+        Start a thread at address
+        """
+        raise NotImplementedError()
+
+
+class PymemBackend(MemoryBackend):
+    """
+    Backend for a live process opened with pymem
+
+    Args:
+        process: The opened pymem process
+    """
+
+    def __init__(self, process):
+        # pymem is imported here so the rest of this module works without windows
+        import pymem.exception
+
+        self.process = process
+
+        self._read_error = pymem.exception.MemoryReadError
+        self._write_error = pymem.exception.MemoryWriteError
+
+    def is_running(self) -> bool:
+        return utils.check_if_process_running(self.process.process_handle)
+
+    def read_bytes(self, address: int, size: int) -> bytes:
+        try:
+            return self.process.read_bytes(address, size)
+        except self._read_error:
+            raise MemoryReadError(address)
+
+    def read_into(self, address: int, buffer: bytearray, size: int):
+        import ctypes
+
+        from wizwalker.constants import kernel32
+
+        bytes_read = ctypes.c_size_t()
+        result = kernel32.ReadProcessMemory(
+            ctypes.c_void_p(self.process.process_handle),
+            ctypes.c_void_p(address),
+            (ctypes.c_char * size).from_buffer(buffer),
+            ctypes.c_size_t(size),
+            ctypes.byref(bytes_read),
+        )
+
+        if result == 0 or bytes_read.value != size:
+            raise MemoryReadError(address)
+
+    def write_bytes(self, address: int, data: bytes):
+        try:
+            self.process.write_bytes(address, data, len(data))
+        except self._write_error:
+            raise MemoryWriteError(address)
+
+    def allocate(self, size: int) -> int:
+        return self.process.allocate(size)
+
+    def free(self, address: int):
+        self.process.free(address)
+
+    def protect(self, address: int, size: int, protection: int) -> int:
+        import ctypes
+        import ctypes.wintypes
+
+        from wizwalker.constants import kernel32
+
+        old_protection = ctypes.wintypes.DWORD()
+
+        result = kernel32.VirtualProtectEx(
+            self.process.process_handle,
+            ctypes.c_uint64(address),
+            size,
+            protection,
+            ctypes.byref(old_protection),
+        )
+
+        if result == 0:
+            raise RuntimeError(f"VirtualProtectEx failed for {hex(address)}")
+
+        return old_protection.value
+
+    def virtual_query(self, address: int) -> MemoryRegion:
+        import pymem.memory
+        import pymem.ressources.structure
+
+        structure = pymem.ressources.structure
+        allowed_protections = (
+            structure.MEMORY_PROTECTION.PAGE_EXECUTE_READ,
+            structure.MEMORY_PROTECTION.PAGE_EXECUTE_READWRITE,
+            structure.MEMORY_PROTECTION.PAGE_READWRITE,
+            structure.MEMORY_PROTECTION.PAGE_READONLY,
+        )
+
+        mbi = pymem.memory.virtual_query(self.process.process_handle, address)
+        readable = (
+            mbi.state == structure.MEMORY_STATE.MEM_COMMIT
+            and mbi.protect in allowed_protections
+        )
+
+        return MemoryRegion(mbi.BaseAddress, mbi.RegionSize, readable)
+
+    def module_from_name(self, name: str) -> Optional[ModuleInfo]:
+        import pymem.process
+
+        module = pymem.process.module_from_name(self.process.process_handle, name)
+        if module is None:
+            return None
+
+        return ModuleInfo(name, module.lpBaseOfDll, module.SizeOfImage)
+
+    def start_thread(self, address: int):
+        self.process.start_thread(address)
+
+
+class SimulatedProcess(MemoryBackend):
+    """
+    In-memory stand-in for a process, made of sparse bytearray regions
+
+    Useful for running the memory object layer without a client, for example
+    to benchmark it deterministically from a saved memory image
+
+    Args:
+        allocation_base: Address allocate starts handing out memory from
+    """
+
+    IMAGE_MAGIC = b"WWMI"
+    IMAGE_VERSION = 1
+
+    _image_header = struct.Struct("<4sIII")
+    _module_header = struct.Struct("<QQH")
+    _region_header = struct.Struct("<QQ")
+
+    def __init__(self, *, allocation_base: int = 0x7F0000000000):
+        # sorted region start addresses and the data for each
+        self._region_starts: List[int] = []
+        self._regions: Dict[int, bytearray] = {}
+        self._modules: Dict[str, ModuleInfo] = {}
+        self._next_allocation = allocation_base
+
+        self.running = True
+        self.protections: Dict[int, int] = {}
+        self.started_threads: List[int] = []
+        # each read is a ReadProcessMemory call on a real process
+        self.reads = 0
+
+    @property
+    def regions(self) -> Dict[int, bytearray]:
+        """
+        Mapping of region start address to region data
+        """
+        return self._regions
+
+    @property
+    def modules(self) -> Dict[str, ModuleInfo]:
+        """
+        Mapping of module name to module info
+        """
+        return self._modules
+
+    def add_region(self, address: int, data: Union[bytes, bytearray, int]) -> bytearray:
+        """
+        Map a new region
+
+        Args:
+            address: Start of the region
+            data: Initial contents or a size to zero fill
+
+        Returns:
+            The region's bytearray, writes to it are visible to readers
+
+        Raises:
+            ValueError: If the region overlaps an existing one
+        """
+        region = bytearray(data)
+        if not region:
+            raise ValueError("Regions can't be empty")
+
+        index = bisect.bisect_right(self._region_starts, address)
+        if index and self._region_end(index - 1) > address:
+            raise ValueError(f"Region at {hex(address)} overlaps an existing region")
+
+        if (
+            index < len(self._region_starts)
+            and self._region_starts[index] < address + len(region)
+        ):
+            raise ValueError(f"Region at {hex(address)} overlaps an existing region")
+
+        self._region_starts.insert(index, address)
+        self._regions[address] = region
+        return region
+
+    def remove_region(self, address: int):
+        """
+        Unmap the region starting at address
+        """
+        del self._regions[address]
+        self._region_starts.remove(address)
+
+    def add_module(self, name: str, base_address: int, size: int):
+        """
+        Register a module, its memory should be added with add_region
+        """
+        self._modules[name] = ModuleInfo(name, base_address, size)
+
+    def _region_end(self, index: int) -> int:
+        start = self._region_starts[index]
+        return start + len(self._regions[start])
+
+    def _find_region(self, address: int, size: int) -> Optional[Tuple[int, bytearray]]:
+        index = bisect.bisect_right(self._region_starts, address) - 1
+        if index < 0:
+            return None
+
+        start = self._region_starts[index]
+        region = self._regions[start]
+        if address + size > start + len(region):
+            return None
+
+        return start, region
+
+    def is_running(self) -> bool:
+        return self.running
+
+    def read_bytes(self, address: int, size: int) -> bytes:
+        self.reads += 1
+        found = self._find_region(address, size)
+        if found is None:
+            raise MemoryReadError(address)
+
+        start, region = found
+        offset = address - start
+        return bytes(region[offset : offset + size])
+
+    def read_into(self, address: int, buffer: bytearray, size: int):
+        self.reads += 1
+        found = self._find_region(address, size)
+        if found is None:
+            raise MemoryReadError(address)
+
+        start, region = found
+        offset = address - start
+        memoryview(buffer)[:size] = memoryview(region)[offset : offset + size]
+
+    def write_bytes(self, address: int, data: bytes):
+        found = self._find_region(address, len(data))
+        if found is None:
+            raise MemoryWriteError(address)
+
+        start, region = found
+        offset = address - start
+        region[offset : offset + len(data)] = data
+
+    def allocate(self, size: int) -> int:
+        address = self._next_allocation
+        self.add_region(address, max(size, 1))
+        # keep allocations page aligned like VirtualAllocEx
+        self._next_allocation += (size + 0xFFF) & ~0xFFF or 0x1000
+        return address
+
+    def free(self, address: int):
+        self.remove_region(address)
+
+    def protect(self, address: int, size: int, protection: int) -> int:
+        old_protection = self.protections.get(address, 0)
+        self.protections[address] = protection
+        return old_protection
+
+    def virtual_query(self, address: int) -> MemoryRegion:
+        index = bisect.bisect_right(self._region_starts, address) - 1
+        if index >= 0 and address < self._region_end(index):
+            start = self._region_starts[index]
+            return MemoryRegion(start, len(self._regions[start]), True)
+
+        # unmapped gap up to the next region
+        if index + 1 < len(self._region_starts):
+            next_start = self._region_starts[index + 1]
+        else:
+            next_start = 0x7FFFFFFF0000
+
+        return MemoryRegion(address, max(next_start - address, 0x1000), False)
+
+    def module_from_name(self, name: str) -> Optional[ModuleInfo]:
+        return self._modules.get(name)
+
+    def start_thread(self, address: int):
+        self.started_threads.append(address)
+
+    @classmethod
+    def capture(
+        cls,
+        backend: MemoryBackend,
+        ranges: Iterable[Tuple[int, int]],
+        *,
+        modules: Iterable[str] = (),
+    ) -> "SimulatedProcess":
+        """
+        Copy parts of another backend's memory into a new simulated process
+
+        Args:
+            backend: The backend to copy from
+            ranges: (address, size) pairs to copy; unreadable ranges are skipped
+            modules: Names of modules to copy whole
+
+        Returns:
+            The new simulated process
+        """
+        simulated = cls()
+
+        for name in modules:
+            module = backend.module_from_name(name)
+            if module is None:
+                raise ValueError(f"{name} module not found.")
+
+            simulated.add_module(module.name, module.base_address, module.size)
+            ranges = [*ranges, (module.base_address, module.size)]
+
+        for address, size in ranges:
+            try:
+                data = backend.read_bytes(address, size)
+            except MemoryReadError:
+                continue
+
+            simulated.add_region(address, data)
+
+        return simulated
+
+    def save(self, path: Union[str, Path]):
+        """
+        Save the regions and modules to a memory image file
+        """
+        with open(path, "wb") as fp:
+            fp.write(
+                self._image_header.pack(
+                    self.IMAGE_MAGIC,
+                    self.IMAGE_VERSION,
+                    len(self._modules),
+                    len(self._regions),
+                )
+            )
+
+            for module in self._modules.values():
+                encoded_name = module.name.encode()
+                fp.write(
+                    self._module_header.pack(
+                        module.base_address, module.size, len(encoded_name)
+                    )
+                )
+                fp.write(encoded_name)
+
+            for address in self._region_starts:
+                region = self._regions[address]
+                fp.write(self._region_header.pack(address, len(region)))
+                fp.write(region)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], **kwargs) -> "SimulatedProcess":
+        """
+        Load a memory image saved with save
+
+        Args:
+            path: Path to the image
+            kwargs: Passed to the constructor
+
+        Raises:
+            ValueError: If the file is not a memory image
+        """
+        simulated = cls(**kwargs)
+
+        with open(path, "rb") as fp:
+            header = fp.read(cls._image_header.size)
+            if len(header) != cls._image_header.size:
+                raise ValueError(f"{path} is not a memory image")
+
+            magic, version, module_count, region_count = cls._image_header.unpack(
+                header
+            )
+            if magic != cls.IMAGE_MAGIC or version != cls.IMAGE_VERSION:
+                raise ValueError(f"{path} is not a version {cls.IMAGE_VERSION} memory image")
+
+            for _ in range(module_count):
+                base_address, size, name_length = cls._module_header.unpack(
+                    fp.read(cls._module_header.size)
+                )
+                name = fp.read(name_length).decode()
+                simulated.add_module(name, base_address, size)
+
+            for _ in range(region_count):
+                address, size = cls._region_header.unpack(
+                    fp.read(cls._region_header.size)
+                )
+                simulated.add_region(address, fp.read(size))
+
+        return simulated
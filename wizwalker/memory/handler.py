@@ -1,12 +1,12 @@
 import asyncio
 import struct
-from typing import Any
+from collections import defaultdict
+from typing import Any, Tuple
 
-import pymem
-import pymem.exception
+import regex
 from loguru import logger
 
-from wizwalker import HookAlreadyActivated, HookNotActive, HookNotReady
+from wizwalker import HookAlreadyActivated, HookNotActive, HookNotReady, MemoryReadError
 from .hooks import (
     ClientHook,
     DuelHook,
@@ -18,6 +18,7 @@ from .hooks import (
     RenderContextHook,
     MovementTeleportHook,
 )
+from .backends import MemoryBackend
 from .memory_reader import MemoryReader
 
 
@@ -36,7 +37,7 @@ class HookHandler(MemoryReader):
     # rounded down
     AUTOBOT_SIZE = 3900
 
-    def __init__(self, process: pymem.Pymem, client):
+    def __init__(self, process: MemoryBackend, client):
         super().__init__(process)
 
         self.client = client
@@ -49,6 +50,9 @@ class HookHandler(MemoryReader):
         self._active_hooks = []
         self._base_addrs = {}
 
+        # (pattern, module): [(address, match length)] found by _prescan_hook_patterns
+        self._prescanned_patterns = {}
+
     async def _get_open_autobot_address(self, size: int) -> int:
         if self._autobot_pos + size > self.AUTOBOT_SIZE:
             raise RuntimeError("Somehow went over autobot size")
@@ -61,6 +65,67 @@ class HookHandler(MemoryReader):
         )
         return addr
 
+    async def pattern_scan(
+        self, pattern: bytes, *, module: str = None, return_multiple: bool = False
+    ):
+        prescanned = self._prescanned_patterns.get((pattern, module))
+        if prescanned is None:
+            return await super().pattern_scan(
+                pattern, module=module, return_multiple=return_multiple
+            )
+
+        found_addresses = []
+        for address, length in prescanned:
+            # hooks activated since the prescan may have overwritten a match
+            try:
+                data = await self.read_bytes(address, length)
+            except MemoryReadError:
+                continue
+
+            if regex.fullmatch(pattern, data, regex.DOTALL):
+                found_addresses.append(address)
+
+        return self._check_scan_results(pattern, found_addresses, return_multiple)
+
+    async def _prescan_hook_patterns(self, hook_types):
+        module_patterns = defaultdict(set)
+        if self._autobot_address is None:
+            module_patterns["WizardGraphicalClient.exe"].add(self.AUTOBOT_PATTERN)
+
+        for hook_type in hook_types:
+            for pattern, module in hook_type.get_scan_patterns():
+                module_patterns[module].add(pattern)
+
+        for module, patterns in module_patterns.items():
+            unknown_patterns = []
+            for pattern in patterns:
+                cached = None
+                if self.use_pattern_cache:
+                    cached = await self._get_cached_pattern_scan(pattern, module)
+
+                if cached is not None:
+                    self._prescanned_patterns[(pattern, module)] = [cached]
+                else:
+                    unknown_patterns.append(pattern)
+
+            if not unknown_patterns:
+                continue
+
+            found = await self._pattern_scan_with_lengths(
+                unknown_patterns, module=module
+            )
+
+            # (address, length) of patterns with one match
+            to_cache = {}
+            for pattern, pattern_found in zip(unknown_patterns, found):
+                self._prescanned_patterns[(pattern, module)] = pattern_found
+
+                if len(pattern_found) == 1:
+                    to_cache[pattern] = pattern_found[0]
+
+            if self.use_pattern_cache:
+                await self._cache_pattern_scans(module, to_cache)
+
     async def _get_autobot_address(self):
         addr = await self.pattern_scan(
             self.AUTOBOT_PATTERN, module="WizardGraphicalClient.exe"
@@ -146,7 +211,7 @@ class HookHandler(MemoryReader):
 
         try:
             return await self.read_typed(addr, "long long")
-        except pymem.exception.MemoryReadError:
+        except MemoryReadError:
             raise HookNotReady(hook_name)
 
     # wait for an addr to be set and not 0
@@ -158,7 +223,7 @@ class HookHandler(MemoryReader):
                     logger.debug(
                         f"Waiting for address {hex(address)}; got value {value}"
                     )
-                except pymem.exception.MemoryReadError:
+                except MemoryReadError:
                     pass
                 else:
                     if value != 0:
@@ -185,16 +250,37 @@ class HookHandler(MemoryReader):
             wait_for_ready: Wait for hook values to be written
             timeout: How long to wait for hook values to be written (None for no timeout)
         """
-        await self.activate_player_hook(wait_for_ready=False)
-        # duel is only written to on battle join
-        await self.activate_duel_hook()
-        # quest hook is not written if the quest arrow is off
-        await self.activate_quest_hook()
-        await self.activate_player_stat_hook(wait_for_ready=False)
-        await self.activate_client_hook(wait_for_ready=False)
-        await self.activate_root_window_hook(wait_for_ready=False)
-        await self.activate_render_context_hook(wait_for_ready=False)
-        await self.activate_movement_teleport_hook(wait_for_ready=False)
+        # every hook pattern is found with one read of the module
+        await self._prescan_hook_patterns(
+            [
+                hook_type
+                for hook_type in (
+                    PlayerHook,
+                    DuelHook,
+                    QuestHook,
+                    PlayerStatHook,
+                    ClientHook,
+                    RootWindowHook,
+                    RenderContextHook,
+                    MovementTeleportHook,
+                )
+                if not self._check_if_hook_active(hook_type)
+            ]
+        )
+
+        try:
+            await self.activate_player_hook(wait_for_ready=False)
+            # duel is only written to on battle join
+            await self.activate_duel_hook()
+            # quest hook is not written if the quest arrow is off
+            await self.activate_quest_hook()
+            await self.activate_player_stat_hook(wait_for_ready=False)
+            await self.activate_client_hook(wait_for_ready=False)
+            await self.activate_root_window_hook(wait_for_ready=False)
+            await self.activate_render_context_hook(wait_for_ready=False)
+            await self.activate_movement_teleport_hook(wait_for_ready=False)
+        finally:
+            self._prescanned_patterns = {}
 
         if wait_for_ready:
             wait_tasks = []
@@ -318,9 +404,44 @@ class HookHandler(MemoryReader):
 
         try:
             return await self.read_typed(addr, "unsigned int")
-        except pymem.exception.MemoryReadError:
+        except MemoryReadError:
             raise HookNotReady("Duel")
 
+    async def read_current_duel_state(self) -> Tuple[int, int, int]:
+        """
+        Read current duel base address, cached duel phase, and round number together
+
+        Returns:
+            (base address, duel phase, round number), round number is 0 if there is no duel
+        """
+        base_addr = self._base_addrs.get("current_duel")
+        phase_addr = self._base_addrs.get("current_duel_phase")
+        if base_addr is None or phase_addr is None:
+            raise HookNotActive("Duel")
+
+        try:
+            # the exports are merged into one read when they share a page
+            base_data, phase_data = await self.read_many(
+                ((base_addr, 8), (phase_addr, 4)), max_gap=0x1000
+            )
+        except MemoryReadError:
+            raise HookNotReady("Duel")
+
+        base = struct.unpack("<q", base_data)[0]
+        phase = struct.unpack("<I", phase_data)[0]
+
+        round_number = 0
+        if base:
+            # imported here since memory objects import this module
+            from .memory_objects.duel import Duel
+
+            round_num = Duel.get_snapshot_field("round_num")
+            round_number = await self.read_typed(
+                base + round_num.offset, round_num.data_type
+            )
+
+        return base, phase, round_number
+
     async def activate_quest_hook(
         self, *, wait_for_ready: bool = False, timeout: float = None
     ):
@@ -1,15 +1,12 @@
 import asyncio
-import ctypes
-import ctypes.wintypes
 import struct
-from typing import Any, Tuple
+from typing import Any, List, Tuple
 from contextlib import suppress
 import warnings
 
 from loguru import logger
 
 from .memory_reader import MemoryReader
-from wizwalker.constants import kernel32
 
 
 # TODO: 2.0 delete (useless)
@@ -23,7 +20,7 @@ def pack_to_int_or_longlong(num: int) -> bytes:
 
 class MemoryHook(MemoryReader):
     def __init__(self, hook_handler):
-        super().__init__(hook_handler.process)
+        super().__init__(hook_handler.backend)
         self.hook_handler = hook_handler
         self.jump_original_bytecode = None
 
@@ -56,6 +53,14 @@ class MemoryHook(MemoryReader):
         """
         pass
 
+    async def pattern_scan(
+        self, pattern: bytes, *, module: str = None, return_multiple: bool = False
+    ):
+        # the handler might already have scanned for this pattern
+        return await self.hook_handler.pattern_scan(
+            pattern, module=module, return_multiple=return_multiple
+        )
+
     async def get_jump_address(self, pattern: bytes, module: str = None) -> int:
         """
         gets the address to write jump at
@@ -155,6 +160,13 @@ class SimpleHook(AutoBotBaseHook):
     exports = None
     noops = 0
 
+    @classmethod
+    def get_scan_patterns(cls) -> List[Tuple[bytes, str]]:
+        """
+        (pattern, module) pairs scanned for while hooking, so they can be scanned for all at once
+        """
+        return [(cls.pattern, cls.module)]
+
     async def get_pattern(self):
         return self.pattern, self.module
 
@@ -173,7 +185,7 @@ class SimpleHook(AutoBotBaseHook):
         packed_exports = []
         for export in self.exports:
             # addr = self.alloc(export[1])
-            addr = self.hook_handler.process.allocate(export[1])
+            addr = self.hook_handler.backend.allocate(export[1])
             setattr(self, export[0], addr)
             packed_addr = struct.pack("<Q", addr)
             packed_exports.append((export[0], packed_addr))
@@ -374,27 +386,27 @@ class MovementTeleportHook(SimpleHook):
     # position vector = 12 + 1 for update bool + 8 for target object address
     exports = [("teleport_helper", 21)]
 
+    INSIDE_EVENT_JE_PATTERN = rb"\x74.\xF3\x0F\x10\x55\xA8"
+    EVENT_DISPATCH_JE_PATTERN = rb"\x74.\xF3\x0F\x10\x44\x24\x54\xF3\x0F"
+    # used by Client._get_je_instruction_forward_backwards
+    MOVEMENT_STATE_PATTERN = rb"\x8B\x5F\x70\xF3"
+
     _old_jes_bytes = None
     _old_collision_jes_bytes = None
     _collision_je_addrs = None
     _old_je_page_protection = None
 
-    def _set_page_protection(self, address: int, protections: int, size: int = 24) -> int:
-        old_protection = ctypes.wintypes.DWORD()
-        target_address_passable = ctypes.c_uint64(address)
-
-        result = kernel32.VirtualProtectEx(
-            self.hook_handler.process.process_handle,
-            target_address_passable,
-            size,
-            protections,
-            ctypes.byref(old_protection),
-        )
+    @classmethod
+    def get_scan_patterns(cls) -> List[Tuple[bytes, str]]:
+        return [
+            *super().get_scan_patterns(),
+            (cls.INSIDE_EVENT_JE_PATTERN, cls.module),
+            (cls.EVENT_DISPATCH_JE_PATTERN, cls.module),
+            (cls.MOVEMENT_STATE_PATTERN, cls.module),
+        ]
 
-        if result == 0:
-            raise RuntimeError(f"Movement teleport virtual protect returned 0 result={result}")
-
-        return old_protection.value
+    def _set_page_protection(self, address: int, protections: int, size: int = 24) -> int:
+        return self.hook_handler.backend.protect(address, size, protections)
 
     async def _wait_for_update_bool_unset_with_timeout(self):
         async def _inner():
@@ -415,11 +427,11 @@ class MovementTeleportHook(SimpleHook):
         target_address = jes[0]
 
         inside_event_je_addr = await self.pattern_scan(
-            rb"\x74.\xF3\x0F\x10\x55\xA8",
+            self.INSIDE_EVENT_JE_PATTERN,
             module="WizardGraphicalClient.exe",
         )
         event_dispatch_je_addr = await self.pattern_scan(
-            rb"\x74.\xF3\x0F\x10\x44\x24\x54\xF3\x0F",
+            self.EVENT_DISPATCH_JE_PATTERN,
             module="WizardGraphicalClient.exe",
         )
 
@@ -1,9 +1,23 @@
 import regex
 import struct
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
 
-from .memory_reader import MemoryReader
-from wizwalker import MemoryReadError, PatternFailed
+from .memory_reader import SCAN_CHUNK_SIZE, MemoryReader
+from .module_image import ModuleImage
+from wizwalker import MemoryReadError, PatternFailed, type_struct_dict
+
+
+# IMAGE_SCN_MEM_EXECUTE
+_SECTION_EXECUTE = 0x20000000
+
+_UNSIGNED_LONG_LONG = type_struct_dict["unsigned long long"]
+_INT = type_struct_dict["int"]
+
+# per thread reusable read buffers
+_index_buffers = threading.local()
 
 
 class InstanceFinder(MemoryReader):
@@ -19,11 +33,18 @@ class InstanceFinder(MemoryReader):
         super().__init__(process)
         self.class_name = class_name
 
+        self._module_image = None
         self._all_jmp_instructions = None
         self._all_type_name_functions = None
         self._type_name_function_map = None
         self._jmp_functions = None
 
+    async def get_exe_image(self) -> ModuleImage:
+        if self._module_image is None:
+            self._module_image = await self.get_module_image(self.EXE_NAME)
+
+        return self._module_image
+
     async def read_null_terminated_string(
         self, address: int, max_size: int = 20, encoding: str = "utf-8"
     ):
@@ -50,35 +71,48 @@ class InstanceFinder(MemoryReader):
         if self._all_jmp_instructions:
             return self._all_jmp_instructions
 
-        self._all_jmp_instructions = await self.pattern_scan(
-            b"\xE9", module=self.EXE_NAME, return_multiple=True
-        )
+        image = await self.get_exe_image()
+        # jmp thunks are only in code
+        section = ".text" if ".text" in image.sections else None
+
+        self._all_jmp_instructions = image.scan(b"\xE9", section=section)
         return self._all_jmp_instructions
 
     async def get_all_type_name_functions(self):
         if self._all_type_name_functions:
             return self._all_type_name_functions
 
-        self._all_type_name_functions = await self.pattern_scan(
-            self.GET_TYPE_NAME_PATTERN, module=self.EXE_NAME, return_multiple=True
-        )
+        image = await self.get_exe_image()
+
+        self._all_type_name_functions = image.scan(self.GET_TYPE_NAME_PATTERN)
         return self._all_type_name_functions
 
     async def get_type_name_function_map(self):
         if self._type_name_function_map:
             return self._type_name_function_map
 
+        image = await self.get_exe_image()
         func_name_map = defaultdict(lambda: list())
 
         for func in await self.get_all_type_name_functions():
             lea_instruction = func + 63
             lea_target = func + 66
-            rip_offset = await self.read_typed(lea_target, "int")
+            rip_offset = image.read_typed(lea_target, "int")
 
             type_name_addr = lea_instruction + rip_offset + 7
 
             # ClientShadowCreatureLevelTransitionCinematicAction is the longest class name
-            type_name = await self.read_null_terminated_string(type_name_addr, 60)
+            if image.contains(type_name_addr):
+                name_offset = image.address_to_offset(type_name_addr)
+                search_bytes = image.data[name_offset : name_offset + 60]
+                string_end = search_bytes.find(b"\x00")
+                if string_end == -1:
+                    raise MemoryReadError(type_name_addr)
+
+                type_name = search_bytes[:string_end].decode()
+            else:
+                type_name = await self.read_null_terminated_string(type_name_addr, 60)
+
             func_name_map[type_name].append(func)
 
         self._type_name_function_map = func_name_map
@@ -93,6 +127,7 @@ class InstanceFinder(MemoryReader):
         if self._jmp_functions:
             return self._jmp_functions
 
+        image = await self.get_exe_image()
         all_jmps = await self.get_all_jmp_instructions()
 
         type_name_funcs = await self.get_type_name_functions()
@@ -104,7 +139,7 @@ class InstanceFinder(MemoryReader):
             if len(jmp_funcs) == len(type_name_funcs):
                 break
 
-            offset = await self.read_typed(jmp + 1, "int")
+            offset = image.read_typed(jmp + 1, "int")
 
             for poss in type_name_funcs:
                 if (offset + 5) == poss - jmp:
@@ -129,3 +164,220 @@ class InstanceFinder(MemoryReader):
                 instances += vtable_pointers
 
         return instances
+
+
+class InstanceIndex(MemoryReader):
+    """
+    Index of every PropertyClass instance by class name, built with one pass over memory
+
+    Examples:
+        .. code-block:: py
+
+            index = InstanceIndex(client.hook_handler.backend)
+            await index.build()
+            windows = index.get_instances("Window")
+    """
+
+    GET_TYPE_NAME_PATTERN = InstanceFinder.GET_TYPE_NAME_PATTERN
+    EXE_NAME = InstanceFinder.EXE_NAME
+
+    def __init__(self, process):
+        super().__init__(process)
+
+        self._module_image = None
+        self._vtable_map = None
+        self._instances = None
+
+    async def get_exe_image(self) -> ModuleImage:
+        if self._module_image is None:
+            self._module_image = await self.get_module_image(self.EXE_NAME)
+
+        return self._module_image
+
+    @staticmethod
+    def _read_type_name(image: ModuleImage, function: int) -> str:
+        lea_instruction = function + 63
+        rip_offset = image.read_typed(function + 66, "int")
+        type_name_offset = image.address_to_offset(lea_instruction + rip_offset + 7)
+
+        # ClientShadowCreatureLevelTransitionCinematicAction is the longest class name
+        name_bytes = image.data[type_name_offset : type_name_offset + 60]
+        string_end = name_bytes.find(b"\x00")
+        if string_end == -1:
+            raise MemoryReadError(lea_instruction + rip_offset + 7)
+
+        return name_bytes[:string_end].decode()
+
+    @classmethod
+    def _build_function_map(cls, image: ModuleImage) -> Dict[int, str]:
+        function_map = {}
+        for function in image.scan(cls.GET_TYPE_NAME_PATTERN):
+            try:
+                function_map[function] = cls._read_type_name(image, function)
+            except (MemoryReadError, UnicodeDecodeError, ValueError, struct.error):
+                continue
+
+        # vtables can also point to a jmp to the type name function
+        text_section = image.sections.get(".text")
+        if text_section is not None:
+            start = text_section.offset
+            end = min(text_section.offset + text_section.size, image.size)
+        else:
+            start, end = 0, image.size
+
+        data = image.data
+
+        thunks = {}
+        jmp_offset = data.find(b"\xE9", start, end - 4)
+        while jmp_offset != -1:
+            target = image.base_address + jmp_offset + 5 + _INT.unpack_from(data, jmp_offset + 1)[0]
+            type_name = function_map.get(target)
+            if type_name is not None:
+                thunks[image.base_address + jmp_offset] = type_name
+
+            jmp_offset = data.find(b"\xE9", jmp_offset + 1, end - 4)
+
+        function_map.update(thunks)
+        return function_map
+
+    @staticmethod
+    def _build_vtable_map(image: ModuleImage, function_map: Dict[int, str]) -> Dict[int, str]:
+        # vtables live in the non executable sections
+        bounds = [
+            (section.offset, min(section.offset + section.size, image.size))
+            for section in image.sections.values()
+            if not section.characteristics & _SECTION_EXECUTE
+        ]
+        if not bounds:
+            bounds = [(0, image.size)]
+
+        vtable_map = {}
+        for start, end in bounds:
+            # vtables are 8 aligned
+            start = (start + 7) & ~7
+            end &= ~7
+            if end <= start:
+                continue
+
+            qwords = image.view[start:end].cast("Q")
+            for index, value in enumerate(qwords):
+                type_name = function_map.get(value)
+                if type_name is not None:
+                    vtable_map[image.base_address + start + index * 8] = type_name
+
+            qwords.release()
+
+        return vtable_map
+
+    async def get_vtable_map(self) -> Dict[int, str]:
+        """
+        Get a map of vtable address to class name, built from the exe once
+        """
+        if self._vtable_map is None:
+            image = await self.get_exe_image()
+
+            def _build():
+                return self._build_vtable_map(image, self._build_function_map(image))
+
+            self._vtable_map = await self.run_in_executor(_build)
+
+        return self._vtable_map
+
+    def _index_chunk(
+        self,
+        vtable_map: Dict[int, str],
+        high_patterns: list,
+        chunk: Tuple[int, int],
+    ) -> List[Tuple[str, int]]:
+        address, size = chunk
+
+        buffer = getattr(_index_buffers, "buffer", None)
+        if buffer is None or len(buffer) < size:
+            buffer = _index_buffers.buffer = bytearray(size)
+
+        try:
+            self.backend.read_into(address, buffer, size)
+        except MemoryReadError:
+            return []
+
+        found = []
+        for high_pattern in high_patterns:
+            # search for the high half of aligned qwords then check the whole value
+            for match in high_pattern.finditer(buffer, 4, size, concurrent=True):
+                qword_offset = match.start() - 4
+                if qword_offset & 7:
+                    continue
+
+                type_name = vtable_map.get(
+                    _UNSIGNED_LONG_LONG.unpack_from(buffer, qword_offset)[0]
+                )
+                if type_name is not None:
+                    found.append((type_name, address + qword_offset))
+
+        return found
+
+    def _build_index(self, vtable_map: Dict[int, str]) -> Dict[str, List[int]]:
+        high_patterns = [
+            regex.compile(regex.escape(struct.pack("<I", high)))
+            for high in {vtable >> 32 for vtable in vtable_map}
+        ]
+
+        chunks = []
+        for address, size in self._get_scan_regions():
+            # regions are page aligned so 8 byte alignment is kept in every chunk
+            for chunk_start in range(address, address + size, SCAN_CHUNK_SIZE):
+                chunks.append(
+                    (chunk_start, min(SCAN_CHUNK_SIZE, address + size - chunk_start))
+                )
+
+        instances = defaultdict(list)
+        with ThreadPoolExecutor() as executor:
+            for chunk_found in executor.map(
+                lambda chunk: self._index_chunk(vtable_map, high_patterns, chunk),
+                chunks,
+            ):
+                for type_name, instance in chunk_found:
+                    instances[type_name].append(instance)
+
+        return dict(instances)
+
+    async def build(self) -> Dict[str, List[int]]:
+        """
+        Scan memory for instances of every class
+
+        Returns:
+            Map of class name to instance addresses
+        """
+        vtable_map = await self.get_vtable_map()
+
+        if not vtable_map:
+            self._instances = {}
+        else:
+            self._instances = await self.run_in_executor(self._build_index, vtable_map)
+
+        return self._instances
+
+    @property
+    def is_built(self) -> bool:
+        return self._instances is not None
+
+    def get_class_names(self) -> List[str]:
+        """
+        Names of every class with at least one instance
+        """
+        if self._instances is None:
+            raise ValueError("Index has not been built yet")
+
+        return sorted(self._instances)
+
+    def get_instances(self, class_name: str) -> List[int]:
+        """
+        Get the instances of a class from the last build
+
+        Args:
+            class_name: Name of the class
+        """
+        if self._instances is None:
+            raise ValueError("Index has not been built yet")
+
+        return self._instances.get(class_name, [])
@@ -1,8 +1,24 @@
 import struct
+import sys
+from array import array
+from collections import namedtuple
+from contextlib import asynccontextmanager
 from enum import Enum
-from typing import Any, List, Type
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+from weakref import WeakKeyDictionary
 
-from wizwalker.constants import type_format_dict
+from wizwalker.constants import get_vector_struct, type_format_dict, type_struct_dict
 from wizwalker.errors import (
     AddressOutOfRange,
     MemoryReadError,
@@ -11,12 +27,120 @@ from wizwalker.errors import (
     PatternMultipleResults
 )
 from wizwalker.utils import XYZ
+from .backends import MemoryBackend
 from .handler import HookHandler
 from .memory_reader import MemoryReader
 
 
 MAX_STRING = 5_000
 
+# backend -> vtable -> type name, type names are fixed per vtable
+_type_name_caches: "WeakKeyDictionary[MemoryBackend, Dict[int, str]]" = WeakKeyDictionary()
+
+_INT = type_struct_dict["int"]
+_LONG_LONG = type_struct_dict["long long"]
+# begin and end pointers of a std::vector
+_VECTOR_BOUNDS = get_vector_struct("long long", 2)
+# next, previous, and value of a std::list node holding a pointer
+_LIST_NODE = get_vector_struct("long long", 3)
+# inline buffer or pointer, length, and capacity of a std::string
+STRING_HEADER_SIZE = 32
+
+
+class MemoryField(NamedTuple):
+    """
+    A single field of a memory object's layout
+
+    Args:
+        name: Name of the field in snapshot records
+        offset: Offset of the field from the object's base address
+        data_type: Type name from type_format_dict
+        count: Number of consecutive values; fields with a count other than 1 are read as tuples
+        enum: Enum to convert the read value to
+    """
+
+    name: str
+    offset: int
+    data_type: str
+    count: int = 1
+    enum: Optional[Type[Enum]] = None
+
+
+class SnapshotLayout:
+    """
+    Precompiled struct layout built from a field table
+
+    Args:
+        record_name: Name of the generated record type
+        fields: The fields to decode
+    """
+
+    def __init__(self, record_name: str, fields: Sequence[MemoryField]):
+        if not fields:
+            raise ValueError(f"{record_name} has no snapshot fields")
+
+        self.fields = tuple(sorted(fields, key=lambda field: field.offset))
+        self.start = self.fields[0].offset
+
+        format_string = "<"
+        position = self.start
+        for field in self.fields:
+            if field.data_type not in type_format_dict:
+                raise ValueError(f"{field.data_type} is not a valid data type")
+
+            if field.count < 1:
+                raise ValueError(f"Field {field.name} has invalid count {field.count}")
+
+            if field.offset < position:
+                raise ValueError(
+                    f"Field {field.name} at offset {field.offset} overlaps the previous field"
+                )
+
+            if field.offset > position:
+                format_string += f"{field.offset - position}x"
+
+            type_str = type_format_dict[field.data_type].replace("<", "")
+            format_string += type_str * field.count
+            position = field.offset + type_struct_dict[field.data_type].size * field.count
+
+        self.struct = struct.Struct(format_string)
+        self.size = self.struct.size
+        self.record_type = namedtuple(
+            record_name, [field.name for field in self.fields]
+        )
+
+    def unpack(self, data: bytes) -> tuple:
+        """
+        Decode a span of bytes starting at the layout's first field
+
+        Args:
+            data: The bytes to decode, must be exactly size long
+
+        Returns:
+            The decoded record
+        """
+        raw_values = self.struct.unpack(data)
+
+        values = []
+        index = 0
+        for field in self.fields:
+            if field.count == 1:
+                value = raw_values[index]
+            else:
+                value = raw_values[index : index + field.count]
+
+            index += field.count
+
+            if field.enum is not None:
+                try:
+                    value = field.enum(value)
+                except ValueError:
+                    raise ReadingEnumFailed(field.enum, value)
+
+            values.append(value)
+
+        return self.record_type._make(values)
+
 
 # TODO: add .find_instances that find instances of whichever class used it
 class MemoryObject(MemoryReader):
@@ -24,21 +148,209 @@ class MemoryObject(MemoryReader):
     Class for any represented classes from memory
     """
 
+    # fields read by snapshot
+    snapshot_fields: Sequence[MemoryField] = ()
+
+    _snapshot_layouts: Dict[type, SnapshotLayout] = {}
+
     def __init__(self, hook_handler: HookHandler):
-        super().__init__(hook_handler.process)
+        super().__init__(hook_handler.backend)
         self.hook_handler = hook_handler
 
         self._offset_lookup_cache = {}
 
+        self._pinned_base_address = None
+        self._pin_depth = 0
+
+    @classmethod
+    def _get_snapshot_layout(cls) -> SnapshotLayout:
+        # layouts are shared with subclasses that don't define their own fields
+        for klass in cls.__mro__:
+            if "snapshot_fields" in vars(klass):
+                break
+        else:
+            raise NotImplementedError(f"{cls.__name__} has no snapshot fields")
+
+        layout = MemoryObject._snapshot_layouts.get(klass)
+        if layout is None:
+            layout = SnapshotLayout(f"{klass.__name__}Snapshot", klass.snapshot_fields)
+            MemoryObject._snapshot_layouts[klass] = layout
+
+        return layout
+
+    @classmethod
+    def get_snapshot_field(cls, name: str) -> MemoryField:
+        """
+        Get a field of this object's snapshot layout by name
+
+        Args:
+            name: Name of the field
+
+        Raises:
+            ValueError: If the layout has no field with the name
+        """
+        for field in cls._get_snapshot_layout().fields:
+            if field.name == name:
+                return field
+
+        raise ValueError(f"{cls.__name__} has no snapshot field named {name}")
+
     async def read_base_address(self) -> int:
         raise NotImplementedError()
 
+    async def _resolve_base_address(self) -> int:
+        if self._pinned_base_address is not None:
+            return self._pinned_base_address
+
+        return await self.read_base_address()
+
+    @property
+    def is_pinned(self) -> bool:
+        """
+        If the base address is currently pinned
+        """
+        return self._pin_depth > 0
+
+    async def pin(self) -> int:
+        """
+        Resolve the base address once and reuse it for every read until unpinned
+
+        Pins can be nested, each pin needs a matching unpin;
+        the pinned address is not updated if the object moves, see repin
+
+        Returns:
+            The pinned base address
+        """
+        if self._pin_depth == 0:
+            self._pinned_base_address = await self.read_base_address()
+
+        self._pin_depth += 1
+        return self._pinned_base_address
+
+    def unpin(self):
+        """
+        Release a pin, the base address is read again once every pin is released
+        """
+        if self._pin_depth == 0:
+            raise RuntimeError(f"{type(self).__name__} is not pinned")
+
+        self._pin_depth -= 1
+        if self._pin_depth == 0:
+            self._pinned_base_address = None
+
+    async def repin(self) -> int:
+        """
+        Re-resolve the pinned base address without releasing the pin
+
+        Returns:
+            The new pinned base address
+        """
+        if self._pin_depth == 0:
+            raise RuntimeError(f"{type(self).__name__} is not pinned")
+
+        self._pinned_base_address = await self.read_base_address()
+        return self._pinned_base_address
+
+    @asynccontextmanager
+    async def pinned(self):
+        """
+        Pin the base address for the duration of the context
+
+        Examples:
+            .. code-block:: py
+
+                async with client.stats.pinned():
+                    health = await client.stats.current_hitpoints()
+                    mana = await client.stats.current_mana()
+
+        Yields:
+            The pinned base address
+        """
+        base_address = await self.pin()
+        try:
+            yield base_address
+        finally:
+            self.unpin()
+
+    async def snapshot(self) -> tuple:
+        """
+        Read every field in snapshot_fields with a single read
+
+        Returns:
+            An immutable record with an attribute for each field
+        """
+        layout = self._get_snapshot_layout()
+        base_address = await self._resolve_base_address()
+        data = await self.read_bytes(base_address + layout.start, layout.size)
+        return layout.unpack(data)
+
+    @classmethod
+    async def snapshot_many(
+        cls, reader: MemoryReader, addresses: Iterable[int], *, max_gap: int = 0x1000
+    ) -> List[Optional[tuple]]:
+        """
+        Read the snapshot_fields of many objects of this class with as few process reads as possible
+
+        Args:
+            reader: The reader to read with, usually a HookHandler
+            addresses: Base addresses of the objects
+            max_gap: Largest number of unrequested bytes between two objects
+                for them to still be read together
+
+        Returns:
+            A record for each address, None for objects that couldn't be read or decoded
+
+        Examples:
+            .. code-block:: py
+
+                records = await DynamicSpellEffect.snapshot_many(client.hook_handler, addresses)
+        """
+        layout = cls._get_snapshot_layout()
+        datas = await reader.read_many(
+            ((address + layout.start, layout.size) for address in addresses),
+            max_gap=max_gap,
+            ignore_errors=True,
+        )
+
+        records = []
+        for data in datas:
+            record = None
+            if data is not None:
+                try:
+                    record = layout.unpack(data)
+                except ReadingEnumFailed:
+                    pass
+
+            records.append(record)
+
+        return records
+
     async def read_value_from_offset(self, offset: int, data_type: str) -> Any:
-        base_address = await self.read_base_address()
+        base_address = await self._resolve_base_address()
         return await self.read_typed(base_address + offset, data_type)
 
+    async def read_values_from_offsets(
+        self, fields: Iterable[Tuple[int, str]], *, max_gap: int = 0x1000
+    ) -> List[Any]:
+        """
+        Read multiple values with one base address read and as few process reads as possible
+
+        Args:
+            fields: (offset, data_type) pairs to read
+            max_gap: Largest number of unrequested bytes between two fields
+                for them to still be read together
+
+        Returns:
+            The read values in the order they were passed
+        """
+        base_address = await self._resolve_base_address()
+        return await self.read_typed_many(
+            ((base_address + offset, data_type) for offset, data_type in fields),
+            max_gap=max_gap,
+        )
+
     async def write_value_to_offset(self, offset: int, value: Any, data_type: str):
-        base_address = await self.read_base_address()
+        base_address = await self._resolve_base_address()
         await self.write_typed(base_address + offset, value, data_type)
 
     async def pattern_scan_offset(
@@ -85,29 +397,125 @@ class MemoryObject(MemoryReader):
         string_bytes = search_bytes[:string_end]
         return string_bytes.decode(encoding)
 
-    async def read_wide_string(self, address: int, encoding: str = "utf-16") -> str:
-        string_len = await self.read_typed(address + 16, "int")
-        if string_len == 0:
-            return ""
+    @staticmethod
+    def _parse_string_header(
+        address: int, header: bytes, wide: bool
+    ) -> Optional[Tuple[int, int]]:
+        # (data address, data size) or None if the string is empty
+        string_len = _INT.unpack_from(header, 16)[0]
+
+        if wide:
+            if string_len <= 0:
+                return None
 
-        # wide chars take 2 bytes
-        string_len *= 2
+            # wide chars take 2 bytes
+            string_len *= 2
 
-        # wide strings larger than 8 bytes are pointers
-        if string_len >= 8:
-            string_address = await self.read_typed(address, "long long")
+            # wide strings larger than 8 bytes are pointers
+            if string_len >= 8:
+                return _LONG_LONG.unpack_from(header)[0], string_len
+
+            return address, string_len
+
+        if not 1 <= string_len <= MAX_STRING:
+            return None
+
+        # strings larger than 16 bytes are pointers
+        if string_len >= 16:
+            return _LONG_LONG.unpack_from(header)[0], string_len
+
+        return address, string_len
+
+    async def _read_string(self, address: int, encoding: str, wide: bool) -> str:
+        header = await self.read_bytes(address, STRING_HEADER_SIZE)
+        string_location = self._parse_string_header(address, header, wide)
+
+        if string_location is None:
+            return ""
+
+        string_address, string_len = string_location
+        if string_address == address:
+            # inline strings are already in the header
+            string_bytes = header[:string_len]
         else:
-            string_address = address
+            string_bytes = await self.read_bytes(string_address, string_len)
 
         try:
-            return (await self.read_bytes(string_address, string_len)).decode(encoding)
+            return string_bytes.decode(encoding)
         except UnicodeDecodeError:
             return ""
 
+    async def _read_strings(
+        self, addresses: Iterable[int], encoding: str, wide: bool, max_gap: int
+    ) -> List[str]:
+        addresses = list(addresses)
+        headers = await self.read_many(
+            ((address, STRING_HEADER_SIZE) for address in addresses),
+            max_gap=max_gap,
+            ignore_errors=True,
+        )
+
+        string_bytes = [b""] * len(addresses)
+        # index, data address, data size of strings stored outside their header
+        heap_strings = []
+        for idx, (address, header) in enumerate(zip(addresses, headers)):
+            if header is None:
+                continue
+
+            string_location = self._parse_string_header(address, header, wide)
+            if string_location is None:
+                continue
+
+            string_address, string_len = string_location
+            if string_address == address:
+                string_bytes[idx] = header[:string_len]
+            else:
+                heap_strings.append((idx, string_address, string_len))
+
+        heap_data = await self.read_many(
+            ((string_address, string_len) for _, string_address, string_len in heap_strings),
+            max_gap=max_gap,
+            ignore_errors=True,
+        )
+        for (idx, _, _), data in zip(heap_strings, heap_data):
+            if data is not None:
+                string_bytes[idx] = data
+
+        strings = []
+        for data in string_bytes:
+            try:
+                strings.append(data.decode(encoding))
+            except UnicodeDecodeError:
+                strings.append("")
+
+        return strings
+
+    async def read_wide_string(self, address: int, encoding: str = "utf-16") -> str:
+        return await self._read_string(address, encoding, True)
+
+    async def read_wide_strings(
+        self, addresses: Iterable[int], encoding: str = "utf-16", *, max_gap: int = 0
+    ) -> List[str]:
+        """
+        Read multiple wide strings with as few process reads as possible
+
+        Strings that can't be read are returned as empty strings
+
+        Args:
+            addresses: Addresses of the strings
+            encoding: Encoding of the strings
+            max_gap: Largest number of unrequested bytes between two reads
+                for them to still be read together
+
+        Returns:
+            The strings in the order their addresses were passed
+        """
+        return await self._read_strings(addresses, encoding, True, max_gap)
+
     async def read_wide_string_from_offset(
         self, offset: int, encoding: str = "utf-16"
     ) -> str:
-        base_address = await self.read_base_address()
+        base_address = await self._resolve_base_address()
         return await self.read_wide_string(base_address + offset, encoding)
 
     async def write_wide_string(
@@ -144,30 +552,40 @@ class MemoryObject(MemoryReader):
     async def write_wide_string_to_offset(
         self, offset: int, string: str, encoding: str = "utf-16"
     ):
-        base_address = await self.read_base_address()
+        base_address = await self._resolve_base_address()
         await self.write_wide_string(base_address + offset, string, encoding)
 
     async def read_string(self, address: int, encoding: str = "utf-8") -> str:
-        string_len = await self.read_typed(address + 16, "int")
+        return await self._read_string(address, encoding, False)
 
-        if not 1 <= string_len <= MAX_STRING:
-            return ""
+    async def read_strings(
+        self, addresses: Iterable[int], encoding: str = "utf-8", *, max_gap: int = 0
+    ) -> List[str]:
+        """
+        Read multiple strings with as few process reads as possible
 
-        # strings larger than 16 bytes are pointers
-        if string_len >= 16:
-            string_address = await self.read_typed(address, "long long")
-        else:
-            string_address = address
+        Strings that can't be read are returned as empty strings
 
-        try:
-            return (await self.read_bytes(string_address, string_len)).decode(encoding)
-        except UnicodeDecodeError:
-            return ""
+        Args:
+            addresses: Addresses of the strings
+            encoding: Encoding of the strings
+            max_gap: Largest number of unrequested bytes between two reads
+                for them to still be read together
+
+        Returns:
+            The strings in the order their addresses were passed
+
+        Examples:
+            .. code-block:: py
+
+                names = await window.read_strings(name_addresses)
+        """
+        return await self._read_strings(addresses, encoding, False, max_gap)
 
     async def read_string_from_offset(
         self, offset: int, encoding: str = "utf-8"
     ) -> str:
-        base_address = await self.read_base_address()
+        base_address = await self._resolve_base_address()
         return await self.read_string(base_address + offset, encoding)
 
     async def write_string(self, address: int, string: str, encoding: str = "utf-8"):
@@ -201,28 +619,25 @@ class MemoryObject(MemoryReader):
     async def write_string_to_offset(
         self, offset: int, string: str, encoding: str = "utf-8"
     ):
-        base_address = await self.read_base_address()
+        base_address = await self._resolve_base_address()
         await self.write_string(base_address + offset, string, encoding)
 
     # todo: rework this into from_offset and add read_vector which takes an address
     async def read_vector(self, offset: int, size: int = 3, data_type: str = "float"):
-        type_str = type_format_dict[data_type].replace("<", "")
-        size_per_type = struct.calcsize(type_str)
+        vector_struct = get_vector_struct(data_type, size)
 
-        base_address = await self.read_base_address()
-        vector_bytes = await self.read_bytes(
-            base_address + offset, size_per_type * size
-        )
+        base_address = await self._resolve_base_address()
+        vector_bytes = await self.read_bytes(base_address + offset, vector_struct.size)
 
-        return struct.unpack("<" + type_str * size, vector_bytes)
+        return vector_struct.unpack(vector_bytes)
 
     async def write_vector(
         self, offset: int, value: tuple, size: int = 3, data_type: str = "float"
     ):
-        type_str = type_format_dict[data_type].replace("<", "")
+        vector_struct = get_vector_struct(data_type, size)
 
-        base_address = await self.read_base_address()
-        packed_bytes = struct.pack("<" + type_str * size, *value)
+        base_address = await self._resolve_base_address()
+        packed_bytes = vector_struct.pack(*value)
 
         await self.write_bytes(base_address + offset, packed_bytes)
 
@@ -246,121 +661,194 @@ class MemoryObject(MemoryReader):
         await self.write_value_to_offset(offset, value.value, "int")
 
     async def read_shared_vector(
-        self, offset: int, *, max_size: int = 1000
-    ) -> List[int]:
-        start_address = await self.read_value_from_offset(offset, "long long")
-        end_address = await self.read_value_from_offset(offset + 8, "long long")
+        self, offset: int, *, max_size: int = 1000, as_array: bool = False
+    ) -> Union[List[int], array]:
+        """
+        Read the pointers held by a vector of shared pointers
+
+        Args:
+            offset: Offset of the vector
+            max_size: Largest number of elements to read
+            as_array: Return an array("q") instead of a list
+
+        Raises:
+            ValueError: If the vector is larger than max_size
+        """
+        start_address, end_address = await self._read_vector_bounds(offset)
         size = end_address - start_address
 
         element_number = size // 16
 
-        if size == 0:
-            return []
-
-        # dealloc
-        if size < 0:
-            return []
+        # empty or dealloc
+        if element_number <= 0:
+            return array("q") if as_array else []
 
         if element_number > max_size:
             raise ValueError(f"Size was {element_number} and the max was {max_size}")
 
         try:
-            shared_pointers_data = await self.read_bytes(start_address, size)
+            shared_pointers_data = await self.read_bytes(
+                start_address, element_number * 16
+            )
         except (ValueError, AddressOutOfRange, MemoryError):
-            return []
-
-        pointers = []
-        data_pos = 0
-        # Shared pointers are 16 in length
-        for _ in range(element_number):
-            # fmt: off
-            shared_pointer_data = shared_pointers_data[data_pos: data_pos + 16]
-            # fmt: on
+            return array("q") if as_array else []
 
-            # first 8 bytes are the address
-            pointers.append(struct.unpack("<q", shared_pointer_data[:8])[0])
+        # Shared pointers are 16 in length and the first 8 bytes are the address
+        if as_array:
+            return array("q", shared_pointers_data)[::2]
 
-            data_pos += 16
+        return memoryview(shared_pointers_data).cast("q")[::2].tolist()
 
-        return pointers
+    async def _read_vector_bounds(self, offset: int) -> Tuple[int, int]:
+        base_address = await self._resolve_base_address()
+        data = await self.read_bytes(base_address + offset, _VECTOR_BOUNDS.size)
+        return _VECTOR_BOUNDS.unpack(data)
 
     async def read_dynamic_vector(
-        self, offset: int, data_type: str = "long long"
-    ) -> List[int]:
+        self,
+        offset: int,
+        data_type: str = "long long",
+        *,
+        max_size: Optional[int] = None,
+    ) -> List[Any]:
         """
         Read a vector that changes in size
-        """
-        start_address = await self.read_value_from_offset(offset, "long long")
-        end_address = await self.read_value_from_offset(offset + 8, "long long")
 
-        type_str = type_format_dict[data_type].replace("<", "")
-        size_per_type = struct.calcsize(type_str)
+        Args:
+            offset: Offset of the vector
+            data_type: The type of each element
+            max_size: Largest number of elements to read, None for no limit
+
+        Raises:
+            ValueError: If max_size is given and the vector is larger than it
+        """
+        start_address, end_address = await self._read_vector_bounds(offset)
 
-        size = (end_address - start_address) // size_per_type
+        type_struct = type_struct_dict[data_type]
+        size = (end_address - start_address) // type_struct.size
 
-        if size == 0:
+        # empty or dealloc
+        if size <= 0:
             return []
 
-        current_address = start_address
-        pointers = []
-        for _ in range(size):
-            pointers.append(await self.read_typed(current_address, data_type))
-
-            current_address += size_per_type
+        if max_size is not None and size > max_size:
+            raise ValueError(f"Size was {size} and the max was {max_size}")
 
-        return pointers
+        data = await self.read_bytes(start_address, size * type_struct.size)
+        return [value for value, in type_struct.iter_unpack(data)]
 
     async def read_inlined_vector(
             self,
             offset: int,
             object_size: int,
             object_type: type,
+            *,
+            max_size: Optional[int] = None,
     ):
         start = await self.read_value_from_offset(offset, "unsigned long long")
         end = await self.read_value_from_offset(offset + 16, "unsigned long long")
 
         total_size = (end - start) // object_size
 
-        current_addr = start
+        if total_size <= 0:
+            return []
+
+        if max_size is not None and total_size > max_size:
+            raise ValueError(f"Size was {total_size} and the max was {max_size}")
 
-        res = []
-        for _ in total_size:
-            res.append(object_type(self.hook_handler, current_addr))
-            current_addr += object_size
+        return [
+            object_type(self.hook_handler, start + index * object_size)
+            for index in range(total_size)
+        ]
 
-        return res
+    async def _read_list_header(
+        self, offset: int, max_size: Optional[int]
+    ) -> Tuple[int, int]:
+        list_addr, list_size = await self.read_values_from_offsets(
+            ((offset, "long long"), (offset + 8, "int"))
+        )
 
-    async def read_shared_linked_list(self, offset: int):
-        list_addr = await self.read_value_from_offset(offset, "long long")
+        if max_size is not None and list_size > max_size:
+            raise ValueError(f"Size was {list_size} and the max was {max_size}")
 
-        addrs = []
-        # TODO: ensure this is always the case
-        # skip first node
-        next_node_addr = await self.read_typed(list_addr, "long long")
-        list_size = await self.read_value_from_offset(offset + 8, "int")
+        return list_addr, list_size
 
-        for i in range(list_size):
-            addr = await self.read_typed(next_node_addr + 16, "long long")
-            addrs.append(addr)
-            next_node_addr = await self.read_typed(next_node_addr, "long long")
+    async def read_shared_linked_list(
+        self, offset: int, *, max_size: Optional[int] = None
+    ) -> List[int]:
+        """
+        Read the pointers held by a linked list of shared pointers
+
+        The walk stops early if it reaches a node it has already visited
+
+        Args:
+            offset: Offset of the list
+            max_size: Largest number of nodes to read, None for no limit
+
+        Raises:
+            ValueError: If max_size is given and the list is larger than it
+        """
+        list_addr, list_size = await self._read_list_header(offset, max_size)
+
+        if list_size < 1:
+            return []
+
+        addrs = []
+        visited = {list_addr}
+        # nodes are usually allocated close together so are read by page
+        async with self.frame():
+            # TODO: ensure this is always the case
+            # skip first node
+            next_node_addr = await self.read_typed(list_addr, "long long")
+
+            for _ in range(list_size):
+                if next_node_addr in visited:
+                    break
+
+                visited.add(next_node_addr)
+                node_data = await self.read_bytes(next_node_addr, _LIST_NODE.size)
+                next_node_addr, _, addr = _LIST_NODE.unpack(node_data)
+                addrs.append(addr)
 
         return addrs
 
-    async def read_linked_list(self, offset: int) -> List[int]:
-        list_addr = await self.read_value_from_offset(offset, "long long")
-        list_size = await self.read_value_from_offset(offset + 8, "int")
+    async def read_linked_list(
+        self, offset: int, *, max_size: Optional[int] = None
+    ) -> List[int]:
+        """
+        Read the addresses of the objects held by a linked list
+
+        The walk stops early if it reaches a node it has already visited
+
+        Args:
+            offset: Offset of the list
+            max_size: Largest number of nodes to read, None for no limit
+
+        Raises:
+            ValueError: If max_size is given and the list is larger than it
+        """
+        list_addr, list_size = await self._read_list_header(offset, max_size)
 
         if list_size < 1:
             return []
 
         addrs = []
-        list_node = await self.read_typed(list_addr, "long long")
-        # object starts +16 from node
-        addrs.append(list_node + 16)
-        # -1 because we've already read one node
-        for _ in range(list_size - 1):
-            list_node = await self.read_typed(list_node, "long long")
-            addrs.append(list_node + 16)
+        visited = {list_addr}
+        # nodes are usually allocated close together so are read by page
+        async with self.frame():
+            list_node = await self.read_typed(list_addr, "long long")
+
+            for index in range(list_size):
+                if list_node in visited:
+                    break
+
+                visited.add(list_node)
+                # object starts +16 from node
+                addrs.append(list_node + 16)
+
+                # the last node's next pointer isn't needed
+                if index < list_size - 1:
+                    list_node = await self.read_typed(list_node, "long long")
 
         return addrs
 
@@ -394,15 +882,63 @@ class PropertyClass(MemoryObject):
         except (MemoryReadError, UnicodeDecodeError):
             return ""
 
+    @property
+    def type_name_cache(self) -> Dict[int, str]:
+        """
+        vtable -> type name cache shared by every PropertyClass of this process
+        """
+        return _type_name_caches.setdefault(self.backend, {})
+
     async def read_type_name(self) -> str:
         vtable = await self.read_value_from_offset(0, "long long")
+
+        # type names are fixed per vtable
+        type_name_cache = self.type_name_cache
+        type_name = type_name_cache.get(vtable)
+        if type_name is None:
+            type_name = sys.intern(await self._read_type_name_from_vtable(vtable))
+            type_name_cache[vtable] = type_name
+
+        return type_name
+
+    async def read_vtable_type_names(self, vtables: Iterable[int]) -> Dict[int, str]:
+        """
+        Get the type names of objects' vtables through the type name cache
+
+        Args:
+            vtables: The vtables
+
+        Returns:
+            vtable -> type name, empty if it couldn't be read
+        """
+        type_name_cache = self.type_name_cache
+
+        type_names = {}
+        for vtable in vtables:
+            if vtable in type_names:
+                continue
+
+            type_name = type_name_cache.get(vtable)
+            if type_name is None:
+                try:
+                    type_name = sys.intern(await self._read_type_name_from_vtable(vtable))
+                except (MemoryReadError, UnicodeDecodeError):
+                    type_name = ""
+                else:
+                    type_name_cache[vtable] = type_name
+
+            type_names[vtable] = type_name
+
+        return type_names
+
+    async def _read_type_name_from_vtable(self, vtable: int) -> str:
         # first function
         get_class_name = await self.read_typed(vtable, "long long")
         # sometimes is a function with a jmp, sometimes just a body pointer
         maybe_jmp = await self.read_bytes(get_class_name, 5)
         # 233 is 0xE9 (jmp)
         if maybe_jmp[0] == 233:
-            offset = struct.unpack("<i", maybe_jmp[1:])[0]
+            offset = _INT.unpack_from(maybe_jmp, 1)[0]
             # 5 is length of this jmp instruction
             actual_get_class_name = get_class_name + offset + 5
         else:
@@ -8,12 +8,21 @@ from .client_object import (
 from .combat_participant import CombatParticipant, DynamicCombatParticipant
 from .duel import CurrentDuel, Duel
 from .enums import *
-from .game_stats import CurrentGameStats
+from .game_stats import CurrentGameStats, DynamicGameStats, GameStats
 from .quest_position import CurrentQuestPosition
 from .spell_effect import SpellEffects, DynamicSpellEffect
 from .spell_template import SpellTemplate, DynamicSpellTemplate
 from .spell import DynamicHand, DynamicSpell, Hand, Spell
-from .window import CurrentRootWindow, DynamicWindow, Window
+from .spell_template_cache import (
+    SpellEffectRecord,
+    SpellTemplateCache,
+    SpellTemplateRecord,
+    walk_effects,
+)
+from .window import CurrentRootWindow, DynamicWindow, Window, WindowIndex, WindowNode
+from .ui_snapshot import UITreeSnapshot, UIWindowRecord
+from .entity_snapshot import EntityRecord, EntitySnapshot
+from .entity_index import EntityIndex
 from .render_context import RenderContext, CurrentRenderContext
 from .combat_resolver import CombatResolver, DynamicCombatResolver
 from .play_deck import PlayDeck, PlaySpellData, DynamicPlayDeck, DynamicPlaySpellData
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from wizwalker.memory.memory_object import DynamicMemoryObject, PropertyClass
+from wizwalker.memory.memory_object import DynamicMemoryObject, MemoryField, PropertyClass
 from .enums import PipAquiredByEnum
 from .game_stats import DynamicGameStats
 from .spell import DynamicHand
@@ -13,6 +13,74 @@ class CombatParticipant(PropertyClass):
     Base class for CombatParticipants
     """
 
+    snapshot_fields = (
+        MemoryField("owner_id_full", 112, "unsigned long long"),
+        MemoryField("template_id_full", 120, "unsigned long long"),
+        MemoryField("is_player", 128, "bool"),
+        MemoryField("zone_id_full", 136, "unsigned long long"),
+        MemoryField("team_id", 144, "int"),
+        MemoryField("primary_magic_school_id", 148, "int"),
+        MemoryField("num_pips", 152, "unsigned char"),
+        MemoryField("num_power_pips", 153, "unsigned char"),
+        MemoryField("num_shadow_pips", 154, "unsigned char"),
+        MemoryField("pips_suspended", 176, "bool"),
+        MemoryField("stunned", 180, "int"),
+        MemoryField("stunned_display", 184, "bool"),
+        MemoryField("confused", 188, "int"),
+        MemoryField("confusion_trigger", 192, "int"),
+        MemoryField("confusion_display", 196, "bool"),
+        MemoryField("confused_target", 197, "bool"),
+        MemoryField("untargetable", 198, "bool"),
+        MemoryField("untargetable_rounds", 200, "int"),
+        MemoryField("restricted_target", 204, "bool"),
+        MemoryField("exit_combat", 205, "bool"),
+        MemoryField("mindcontrolled", 208, "int"),
+        MemoryField("mindcontrolled_display", 212, "bool"),
+        MemoryField("original_team", 216, "int"),
+        MemoryField("clue", 220, "int"),
+        MemoryField("rounds_dead", 224, "int"),
+        MemoryField("aura_turn_length", 228, "int"),
+        MemoryField("polymorph_turn_length", 232, "int"),
+        MemoryField("player_health", 236, "int"),
+        MemoryField("max_player_health", 240, "int"),
+        MemoryField("hide_current_hp", 244, "bool"),
+        MemoryField("max_hand_size", 248, "int"),
+        MemoryField("saved_primary_magic_school_id", 304, "int"),
+        MemoryField("rotation", 332, "float"),
+        MemoryField("radius", 336, "float"),
+        MemoryField("subcircle", 340, "int"),
+        MemoryField("pvp", 344, "bool"),
+        MemoryField("accuracy_bonus", 388, "float"),
+        MemoryField("minion_sub_circle", 392, "int"),
+        MemoryField("is_minion", 396, "bool"),
+        MemoryField("is_monster", 400, "unsigned int"),
+        MemoryField("polymorph_spell_template_id", 568, "unsigned int"),
+        MemoryField("shadow_spells_disabled", 637, "bool"),
+        MemoryField("boss_mob", 638, "bool"),
+        MemoryField("hide_pvp_enemy_chat", 639, "bool"),
+        MemoryField("combat_trigger_ids", 664, "int"),
+        MemoryField("pet_combat_trigger", 680, "int"),
+        MemoryField("pet_combat_trigger_target", 684, "int"),
+        MemoryField("auto_pass", 688, "bool"),
+        MemoryField("vanish", 689, "bool"),
+        MemoryField("my_team_turn", 690, "bool"),
+        MemoryField("backlash", 692, "int"),
+        MemoryField("past_backlash", 696, "int"),
+        MemoryField("shadow_creature_level", 700, "int"),
+        MemoryField("past_shadow_creature_level", 704, "int"),
+        MemoryField("shadow_creature_level_count", 712, "int"),
+        MemoryField("rounds_since_shadow_pip", 768, "int"),
+        MemoryField("planning_phase_pip_aquired_type", 784, "int", enum=PipAquiredByEnum),
+        MemoryField("shadow_pip_rate_threshold", 808, "float"),
+        MemoryField("base_spell_damage", 812, "int"),
+        MemoryField("stat_damage", 816, "float"),
+        MemoryField("stat_resist", 820, "float"),
+        MemoryField("stat_pierce", 824, "float"),
+        MemoryField("mob_level", 828, "int"),
+        MemoryField("player_time_updated", 832, "bool"),
+        MemoryField("player_time_eliminated", 833, "bool"),
+    )
+
     def read_base_address(self) -> int:
         raise NotImplementedError()
 
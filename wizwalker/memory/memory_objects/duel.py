@@ -1,7 +1,7 @@
 from typing import List, Optional
 
 from wizwalker.utils import XYZ
-from wizwalker.memory.memory_object import PropertyClass
+from wizwalker.memory.memory_object import MemoryField, PropertyClass
 from .combat_participant import DynamicCombatParticipant
 from .enums import DuelExecutionOrder, DuelPhase, SigilInitiativeSwitchMode
 from .combat_resolver import DynamicCombatResolver
@@ -9,6 +9,54 @@ from .combat_resolver import DynamicCombatResolver
 
 # TODO: add m_gameEffectInfo and friends, and fix offsets
 class Duel(PropertyClass):
+    snapshot_fields = (
+        MemoryField("duel_id_full", 72, "unsigned long long"),
+        MemoryField("dynamic_turn", 120, "unsigned int"),
+        MemoryField("dynamic_turn_subcircles", 124, "unsigned int"),
+        MemoryField("dynamic_turn_counter", 128, "int"),
+        MemoryField("planning_timer", 144, "float"),
+        MemoryField("position", 148, "float", count=3),
+        MemoryField("yaw", 160, "float"),
+        MemoryField("pvp", 176, "bool"),
+        MemoryField("battleground", 177, "bool"),
+        MemoryField("disable_timer", 178, "bool"),
+        MemoryField("tutorial_mode", 179, "bool"),
+        MemoryField("first_team_to_act", 180, "int"),
+        MemoryField("original_first_team_to_act", 184, "int"),
+        MemoryField("round_num", 188, "int"),
+        MemoryField("duel_phase", 192, "int", enum=DuelPhase),
+        MemoryField("execution_phase_timer", 196, "float"),
+        MemoryField("initiative_switch_mode", 376, "int", enum=SigilInitiativeSwitchMode),
+        MemoryField("initiative_switch_rounds", 380, "int"),
+        MemoryField("alt_turn_counter", 448, "int"),
+        MemoryField("execution_order", 520, "int", enum=DuelExecutionOrder),
+        MemoryField("no_henchmen", 524, "bool"),
+        MemoryField("hide_noncombatant_distance", 528, "float"),
+        MemoryField("spell_truncation", 532, "bool"),
+        MemoryField("shadow_threshold_factor", 540, "float"),
+        MemoryField("shadow_pip_rating_factor", 544, "float"),
+        MemoryField("default_shadow_pip_rating", 548, "float"),
+        MemoryField("shadow_pip_threshold_team0", 552, "float"),
+        MemoryField("shadow_pip_threshold_team1", 556, "float"),
+        MemoryField("scalar_damage", 584, "float"),
+        MemoryField("scalar_resist", 588, "float"),
+        MemoryField("scalar_pierce", 592, "float"),
+        MemoryField("damage_limit", 596, "float"),
+        MemoryField("d_k0", 600, "float"),
+        MemoryField("d_n0", 604, "float"),
+        MemoryField("resist_limit", 608, "float"),
+        MemoryField("r_k0", 612, "float"),
+        MemoryField("r_n0", 616, "float"),
+        MemoryField("full_party_group", 620, "bool"),
+        MemoryField("is_player_timed_duel", 621, "bool"),
+        MemoryField("match_timer", 640, "float"),
+        MemoryField("bonus_time", 644, "int"),
+        MemoryField("pass_penalty", 648, "int"),
+        MemoryField("yellow_time", 652, "int"),
+        MemoryField("red_time", 656, "int"),
+        MemoryField("min_turn_time", 660, "int"),
+    )
+
     async def read_base_address(self) -> int:
         raise NotImplementedError()
 
@@ -0,0 +1,326 @@
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+from wizwalker import XYZ, get_vector_struct, type_struct_dict
+from .client_object import ClientObject, DynamicClientObject
+from .entity_snapshot import EntityRecord, EntitySnapshot
+
+
+# ClientObject
+_GLOBAL_ID = 72
+_CHILDREN = 384
+
+# ActorBody
+_POSITION = 88
+
+# entities are allocated close together so nearby reads are merged
+_MAX_READ_GAP = 0x1000
+
+_XYZ = get_vector_struct("float", 3)
+_UNSIGNED_LONG_LONG = type_struct_dict["unsigned long long"]
+
+
+class EntityIndex:
+    """
+    Grid over the positions of loaded entities for nearest and radius queries
+
+    Each refresh only captures entities that appeared since the last one and
+    rereads the positions of the rest from their cached actor body pointers;
+    entities whose global id changed are captured again since their address was reused,
+    as are entities that had no actor body yet
+
+    Args:
+        client_object: Client object whose parent's children are indexed, usually
+            the client's CurrentClientObject
+        cache_handler: CacheHandler used to resolve display names
+        cell_size: Width of each grid cell in world units
+
+    Examples:
+        .. code-block:: py
+
+            index = EntityIndex(client.client_object, cache_handler=client.cache_handler)
+            await index.refresh()
+            closest = index.nearest(await client.body.position(), 3)
+    """
+
+    def __init__(
+        self,
+        client_object: ClientObject,
+        *,
+        cache_handler=None,
+        cell_size: float = 500.0,
+    ):
+        if cell_size <= 0:
+            raise ValueError(f"Cell size must be positive not {cell_size}")
+
+        self.client_object = client_object
+        self.cache_handler = cache_handler
+        self.cell_size = cell_size
+
+        self._root_address = None
+        self._records: Dict[int, EntityRecord] = {}
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._entity_cells: Dict[int, Tuple[int, int]] = {}
+        # (min x, min y, max x, max y) of the occupied cells, None until the next query
+        self._cell_bounds: Optional[Tuple[int, int, int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _cell(self, position: XYZ) -> Tuple[int, int]:
+        return (
+            math.floor(position.x / self.cell_size),
+            math.floor(position.y / self.cell_size),
+        )
+
+    def _place(self, record: EntityRecord):
+        address = record.address
+        self._records[address] = record
+
+        cell = self._cell(record.position)
+        old_cell = self._entity_cells.get(address)
+        if old_cell == cell:
+            return
+
+        if old_cell is not None:
+            self._cells[old_cell].discard(address)
+            if not self._cells[old_cell]:
+                del self._cells[old_cell]
+
+        self._cells.setdefault(cell, set()).add(address)
+        self._entity_cells[address] = cell
+        self._cell_bounds = None
+
+    def _remove(self, address: int):
+        self._records.pop(address, None)
+        cell = self._entity_cells.pop(address, None)
+        if cell is not None:
+            self._cells[cell].discard(address)
+            if not self._cells[cell]:
+                del self._cells[cell]
+                self._cell_bounds = None
+
+    def _clear(self):
+        self._records.clear()
+        self._cells.clear()
+        self._entity_cells.clear()
+        self._cell_bounds = None
+
+    async def refresh(self):
+        """
+        Bring the index up to date with the loaded entities and their positions
+        """
+        root = await self.client_object.parent()
+        if root is None:
+            self._root_address = None
+            self._clear()
+            return
+
+        # a new root means a new zone
+        if root.base_address != self._root_address:
+            self._root_address = root.base_address
+            self._clear()
+
+        addresses = {
+            address for address in await root.read_shared_vector(_CHILDREN) if address
+        }
+
+        for address, record in list(self._records.items()):
+            # entities captured before their actor body was set are captured again
+            # so their position is read from the body once it has one
+            if address not in addresses or not record.actor_body:
+                self._remove(address)
+
+        known = list(self._records.values())
+        # the actor body pointer is cached so each position is a single read
+        datas = await root.read_many(
+            (
+                range_
+                for record in known
+                for range_ in (
+                    (record.address + _GLOBAL_ID, _UNSIGNED_LONG_LONG.size),
+                    (record.actor_body + _POSITION, _XYZ.size),
+                )
+            ),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+        for record, global_id_data, position_data in zip(known, datas[::2], datas[1::2]):
+            if global_id_data is None or position_data is None:
+                # freed without being removed from the children yet
+                self._remove(record.address)
+                continue
+
+            if _UNSIGNED_LONG_LONG.unpack(global_id_data)[0] != record.global_id:
+                # the address was reused by another entity, it's captured below
+                self._remove(record.address)
+                continue
+
+            self._place(record._replace(position=XYZ(*_XYZ.unpack(position_data))))
+
+        new_addresses = addresses - self._records.keys()
+        if new_addresses:
+            snapshot = await EntitySnapshot.capture(
+                root, cache_handler=self.cache_handler, addresses=new_addresses
+            )
+            for record in snapshot:
+                self._place(record)
+
+    def entity(self, record: EntityRecord) -> DynamicClientObject:
+        """
+        Get the client object of a record
+        """
+        return DynamicClientObject(self.client_object.hook_handler, record.address)
+
+    def get(self, address: int) -> Optional[EntityRecord]:
+        """
+        Get the record of an entity by its client object's address
+        """
+        return self._records.get(address)
+
+    def with_template(self, template_id: int) -> List[EntityRecord]:
+        """
+        Get every entity with a template id
+        """
+        return [
+            record for record in self._records.values() if record.template_id == template_id
+        ]
+
+    @staticmethod
+    def _distance_squared(record: EntityRecord, xyz: XYZ) -> float:
+        position = record.position
+        return (
+            (position.x - xyz.x) ** 2
+            + (position.y - xyz.y) ** 2
+            + (position.z - xyz.z) ** 2
+        )
+
+    def _ring(self, center: Tuple[int, int], ring: int):
+        center_x, center_y = center
+        if ring == 0:
+            yield center
+            return
+
+        for offset in range(-ring, ring + 1):
+            yield center_x + offset, center_y - ring
+            yield center_x + offset, center_y + ring
+
+        for offset in range(-ring + 1, ring):
+            yield center_x - ring, center_y + offset
+            yield center_x + ring, center_y + offset
+
+    def _get_cell_bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        if not self._cells:
+            return None
+
+        # only recomputed after the occupied cells changed
+        if self._cell_bounds is None:
+            cell_xs = [cell_x for cell_x, _ in self._cells]
+            cell_ys = [cell_y for _, cell_y in self._cells]
+            self._cell_bounds = (min(cell_xs), min(cell_ys), max(cell_xs), max(cell_ys))
+
+        return self._cell_bounds
+
+    def _max_ring(self, center: Tuple[int, int]) -> int:
+        bounds = self._get_cell_bounds()
+        if bounds is None:
+            return -1
+
+        min_x, min_y, max_x, max_y = bounds
+        return max(
+            center[0] - min_x, max_x - center[0], center[1] - min_y, max_y - center[1]
+        )
+
+    def nearest(
+        self, xyz: XYZ, k: int = 1, *, template_id: Optional[int] = None
+    ) -> List[EntityRecord]:
+        """
+        Find the entities closest to a point
+
+        Args:
+            xyz: The point
+            k: Number of entities to return
+            template_id: Only consider entities with this template id
+
+        Raises:
+            ValueError: If k is less than 1
+
+        Returns:
+            Up to k entities, closest first
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1 not {k}")
+
+        center = self._cell(xyz)
+        max_ring = self._max_ring(center)
+
+        # (distance squared, address)
+        found = []
+        ring = 0
+        while ring <= max_ring:
+            for cell in self._ring(center, ring):
+                for address in self._cells.get(cell, ()):
+                    record = self._records[address]
+                    if template_id is not None and record.template_id != template_id:
+                        continue
+
+                    found.append((self._distance_squared(record, xyz), address))
+
+            # anything in further rings is at least this far away
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= (ring * self.cell_size) ** 2:
+                    break
+
+            ring += 1
+
+        found.sort()
+        return [self._records[address] for _, address in found[:k]]
+
+    def within_radius(
+        self, xyz: XYZ, radius: float, *, template_id: Optional[int] = None
+    ) -> List[EntityRecord]:
+        """
+        Find the entities within a distance of a point
+
+        Args:
+            xyz: The point
+            radius: The distance
+            template_id: Only consider entities with this template id
+
+        Returns:
+            The entities, closest first
+        """
+        radius_squared = radius ** 2
+        min_cell = self._cell(XYZ(xyz.x - radius, xyz.y - radius, xyz.z))
+        max_cell = self._cell(XYZ(xyz.x + radius, xyz.y + radius, xyz.z))
+
+        square_size = (max_cell[0] - min_cell[0] + 1) * (max_cell[1] - min_cell[1] + 1)
+        if square_size > len(self._cells):
+            # a large radius covers more cells than are occupied
+            cells = [
+                cell
+                for cell in self._cells
+                if min_cell[0] <= cell[0] <= max_cell[0]
+                and min_cell[1] <= cell[1] <= max_cell[1]
+            ]
+        else:
+            cells = [
+                (cell_x, cell_y)
+                for cell_x in range(min_cell[0], max_cell[0] + 1)
+                for cell_y in range(min_cell[1], max_cell[1] + 1)
+            ]
+
+        found = []
+        for cell in cells:
+            for address in self._cells.get(cell, ()):
+                record = self._records[address]
+                if template_id is not None and record.template_id != template_id:
+                    continue
+
+                distance_squared = self._distance_squared(record, xyz)
+                if distance_squared <= radius_squared:
+                    found.append((distance_squared, address))
+
+        found.sort()
+        return [self._records[address] for _, address in found]
@@ -0,0 +1,397 @@
+import heapq
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from wizwalker import XYZ, get_vector_struct, type_struct_dict
+from .client_object import ClientObject, DynamicClientObject
+
+
+# ClientObject global id through inactive behaviors vector
+_ENTITY_START = 72
+_ENTITY_SIZE = 168
+_GLOBAL_ID = 72 - _ENTITY_START
+_OBJECT_TEMPLATE = 88 - _ENTITY_START
+_TEMPLATE_ID = 96 - _ENTITY_START
+_LOCATION = 168 - _ENTITY_START
+_BEHAVIORS = 224 - _ENTITY_START
+
+# WizGameObjectTemplate
+_OBJECT_NAME = 96
+_DISPLAY_NAME = 168
+
+# BehaviorInstance behavior template through AnimationBehavior's actor body
+_BEHAVIOR_START = 0x58
+_BEHAVIOR_SIZE = 0x20
+_ACTOR_BODY = 0x70 - _BEHAVIOR_START
+
+# BehaviorTemplate
+_BEHAVIOR_NAME = 72
+
+# ActorBody
+_POSITION = 88
+
+_CHILDREN = 384
+_MAX_BEHAVIORS = 1000
+# entities are allocated close together so nearby reads are merged
+_MAX_READ_GAP = 0x1000
+
+_UNSIGNED_LONG_LONG = type_struct_dict["unsigned long long"]
+_LONG_LONG = type_struct_dict["long long"]
+_VECTOR_BOUNDS = get_vector_struct("long long", 2)
+_XYZ = get_vector_struct("float", 3)
+
+
+class EntityRecord(NamedTuple):
+    """
+    One entity of an EntitySnapshot
+
+    Args:
+        address: Address of the entity's client object
+        global_id: The entity's global id
+        template_id: The entity's template id
+        object_name: Object name of the entity's template
+        display_name_code: Langcode of the entity's display name
+        display_name: The entity's display name, empty if it wasn't resolved
+        position: The entity's actor body position, or its location if it has no body
+        actor_body: Address of the entity's actor body, 0 if it has none
+    """
+
+    address: int
+    global_id: int
+    template_id: int
+    object_name: str
+    display_name_code: str
+    display_name: str
+    position: XYZ
+    actor_body: int
+
+
+class EntitySnapshot:
+    """
+    Columnar copy of the loaded entities
+
+    Strings are stored once in a string table and referenced by index
+
+    Args:
+        hook_handler: Hook handler used to create DynamicClientObjects for rows
+
+    Examples:
+        .. code-block:: py
+
+            snapshot = await client.get_entity_snapshot()
+            for row in snapshot.nearest(await client.body.position(), 5):
+                print(snapshot[row].display_name)
+    """
+
+    def __init__(self, hook_handler=None):
+        self.hook_handler = hook_handler
+
+        self.strings: List[str] = [""]
+        self._string_ids: Dict[str, int] = {"": 0}
+
+        self.addresses = array("Q")
+        self.global_ids = array("Q")
+        self.template_ids = array("Q")
+        self.actor_bodies = array("Q")
+        # x, y, z per row
+        self.positions = array("f")
+        self.object_names = array("I")
+        self.display_name_codes = array("I")
+        self.display_names = array("I")
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __getitem__(self, row: int) -> EntityRecord:
+        if not 0 <= row < len(self):
+            raise IndexError(f"Row {row} out of range")
+
+        return EntityRecord(
+            self.addresses[row],
+            self.global_ids[row],
+            self.template_ids[row],
+            self.strings[self.object_names[row]],
+            self.strings[self.display_name_codes[row]],
+            self.strings[self.display_names[row]],
+            self.position(row),
+            self.actor_bodies[row],
+        )
+
+    def __iter__(self) -> Iterator[EntityRecord]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def _string_id(self, string: str) -> int:
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = self._string_ids[string] = len(self.strings)
+            self.strings.append(string)
+
+        return string_id
+
+    def append(
+        self,
+        address: int,
+        global_id: int,
+        template_id: int,
+        object_name: str,
+        display_name_code: str,
+        display_name: str,
+        position: XYZ,
+        actor_body: int,
+    ) -> int:
+        """
+        Add an entity
+
+        Returns:
+            The entity's row
+        """
+        self.addresses.append(address)
+        self.global_ids.append(global_id)
+        self.template_ids.append(template_id)
+        self.object_names.append(self._string_id(object_name))
+        self.display_name_codes.append(self._string_id(display_name_code))
+        self.display_names.append(self._string_id(display_name))
+        self.positions.extend((position.x, position.y, position.z))
+        self.actor_bodies.append(actor_body)
+
+        return len(self.addresses) - 1
+
+    def position(self, row: int) -> XYZ:
+        """
+        Get the position of a row
+        """
+        return XYZ(*self.positions[row * 3 : row * 3 + 3])
+
+    def entity(self, row: int) -> DynamicClientObject:
+        """
+        Get the client object of a row
+        """
+        return DynamicClientObject(self.hook_handler, self.addresses[row])
+
+    def find(
+        self,
+        *,
+        object_name: Optional[str] = None,
+        display_name: Optional[str] = None,
+        template_id: Optional[int] = None,
+        predicate: Optional[Callable[[EntityRecord], bool]] = None,
+    ) -> List[int]:
+        """
+        Find rows matching every passed filter
+
+        Args:
+            object_name: Object name the entity must have
+            display_name: Text the entity's display name must contain, ignoring case
+            template_id: Template id the entity must have
+            predicate: Non async function taking an EntityRecord and returning if it matches
+
+        Returns:
+            The matching rows
+        """
+        rows = range(len(self))
+
+        if object_name is not None:
+            object_name_id = self._string_ids.get(object_name)
+            if object_name_id is None:
+                return []
+
+            rows = [row for row in rows if self.object_names[row] == object_name_id]
+
+        if display_name is not None:
+            display_name = display_name.lower()
+            # checked once per distinct name instead of once per row
+            matching_ids = {
+                string_id
+                for string_id, string in enumerate(self.strings)
+                if string and display_name in string.lower()
+            }
+            rows = [row for row in rows if self.display_names[row] in matching_ids]
+
+        if template_id is not None:
+            rows = [row for row in rows if self.template_ids[row] == template_id]
+
+        if predicate is not None:
+            rows = [row for row in rows if predicate(self[row])]
+
+        return list(rows)
+
+    def nearest(
+        self, xyz: XYZ, k: int = 1, *, rows: Optional[List[int]] = None
+    ) -> List[int]:
+        """
+        Find the rows closest to a point
+
+        Args:
+            xyz: The point
+            k: Number of rows to return
+            rows: Only consider these rows, i.e. the result of find
+
+        Returns:
+            Up to k rows, closest first
+        """
+        if rows is None:
+            rows = range(len(self))
+
+        positions = self.positions
+        x, y, z = xyz.x, xyz.y, xyz.z
+
+        def _distance(row: int) -> float:
+            offset = row * 3
+            return (
+                (positions[offset] - x) ** 2
+                + (positions[offset + 1] - y) ** 2
+                + (positions[offset + 2] - z) ** 2
+            )
+
+        return heapq.nsmallest(k, rows, key=_distance)
+
+    @classmethod
+    async def capture(
+        cls,
+        root: ClientObject,
+        *,
+        cache_handler=None,
+        addresses: Optional[Iterable[int]] = None,
+    ) -> "EntitySnapshot":
+        """
+        Read every child of a client object, usually the root client object
+
+        Args:
+            root: The client object whose children to read
+            cache_handler: CacheHandler used to resolve display names,
+                display names are left empty if not passed
+            addresses: Only read these client objects instead of root's children
+
+        Returns:
+            The snapshot
+        """
+        snapshot = cls(root.hook_handler)
+
+        if addresses is None:
+            addresses = await root.read_shared_vector(_CHILDREN)
+
+        addresses = [address for address in addresses if address]
+
+        entity_datas = await root.read_many(
+            ((address + _ENTITY_START, _ENTITY_SIZE) for address in addresses),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+        entities = [
+            (address, data) for address, data in zip(addresses, entity_datas) if data is not None
+        ]
+
+        # templates are shared by every entity of the same kind
+        templates = list(
+            {_LONG_LONG.unpack_from(data, _OBJECT_TEMPLATE)[0] for _, data in entities} - {0}
+        )
+        template_strings = await root.read_strings(
+            [template + _OBJECT_NAME for template in templates]
+            + [template + _DISPLAY_NAME for template in templates],
+            max_gap=_MAX_READ_GAP,
+        )
+        object_names = dict(zip(templates, template_strings[: len(templates)]))
+        display_name_codes = dict(zip(templates, template_strings[len(templates) :]))
+
+        display_names = {}
+        if cache_handler is not None:
+            codes = {code for code in display_name_codes.values() if code}
+            if codes:
+                display_names = await cache_handler.get_langcode_names(codes)
+
+        actor_bodies = await cls._read_actor_bodies(root, [data for _, data in entities])
+        positions = await root.read_many(
+            ((actor_body + _POSITION, _XYZ.size) for actor_body in actor_bodies if actor_body),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+        positions = iter(positions)
+
+        for (address, data), actor_body in zip(entities, actor_bodies):
+            position = None
+            if actor_body:
+                position_data = next(positions)
+                if position_data is not None:
+                    position = XYZ(*_XYZ.unpack(position_data))
+
+            if position is None:
+                position = XYZ(*_XYZ.unpack_from(data, _LOCATION))
+
+            template = _LONG_LONG.unpack_from(data, _OBJECT_TEMPLATE)[0]
+            display_name_code = display_name_codes.get(template, "")
+
+            snapshot.append(
+                address,
+                _UNSIGNED_LONG_LONG.unpack_from(data, _GLOBAL_ID)[0],
+                _UNSIGNED_LONG_LONG.unpack_from(data, _TEMPLATE_ID)[0],
+                object_names.get(template, ""),
+                display_name_code,
+                display_names.get(display_name_code) or "",
+                position,
+                actor_body,
+            )
+
+        return snapshot
+
+    @staticmethod
+    async def _read_actor_bodies(root: ClientObject, entity_datas: List[bytes]) -> List[int]:
+        # the same as ClientObject.actor_body for every entity at once
+        behavior_vectors = []
+        for data in entity_datas:
+            start, end = _VECTOR_BOUNDS.unpack_from(data, _BEHAVIORS)
+            behavior_count = (end - start) // 16
+            if 0 < behavior_count <= _MAX_BEHAVIORS:
+                behavior_vectors.append((start, behavior_count * 16))
+            else:
+                behavior_vectors.append((start, 0))
+
+        vector_datas = await root.read_many(
+            behavior_vectors, max_gap=_MAX_READ_GAP, ignore_errors=True
+        )
+        entity_behaviors = [
+            [behavior for behavior in memoryview(data).cast("q")[::2] if behavior]
+            if data
+            else []
+            for data in vector_datas
+        ]
+
+        behaviors = list({behavior for behaviors in entity_behaviors for behavior in behaviors})
+        behavior_datas = await root.read_many(
+            ((behavior + _BEHAVIOR_START, _BEHAVIOR_SIZE) for behavior in behaviors),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+        # behavior -> (behavior template, actor body)
+        behavior_info = {
+            behavior: (
+                _LONG_LONG.unpack_from(data)[0],
+                _UNSIGNED_LONG_LONG.unpack_from(data, _ACTOR_BODY)[0],
+            )
+            for behavior, data in zip(behaviors, behavior_datas)
+            if data is not None
+        }
+
+        behavior_templates = list({template for template, _ in behavior_info.values()} - {0})
+        behavior_names = dict(
+            zip(
+                behavior_templates,
+                await root.read_strings(
+                    (template + _BEHAVIOR_NAME for template in behavior_templates),
+                    max_gap=_MAX_READ_GAP,
+                ),
+            )
+        )
+
+        actor_bodies = []
+        for behaviors_of_entity in entity_behaviors:
+            actor_body = 0
+            for behavior in behaviors_of_entity:
+                template, body = behavior_info.get(behavior, (0, 0))
+                if behavior_names.get(template) == "AnimationBehavior":
+                    actor_body = body
+                    break
+
+            actor_bodies.append(actor_body)
+
+        return actor_bodies
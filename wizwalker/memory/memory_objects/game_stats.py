@@ -1,9 +1,108 @@
 from typing import List
 
-from wizwalker.memory.memory_object import DynamicMemoryObject, PropertyClass
+from wizwalker.memory.memory_object import DynamicMemoryObject, MemoryField, PropertyClass
 
 
 class GameStats(PropertyClass):
+    snapshot_fields = (
+        MemoryField("base_hitpoints", 80, "int"),
+        MemoryField("base_mana", 84, "int"),
+        MemoryField("base_gold_pouch", 88, "int"),
+        MemoryField("base_event_currency1_pouch", 92, "int"),
+        MemoryField("base_event_currency2_pouch", 96, "int"),
+        MemoryField("base_pvp_currency_pouch", 100, "int"),
+        MemoryField("energy_max", 104, "int"),
+        MemoryField("current_hitpoints", 108, "int"),
+        MemoryField("current_gold", 112, "int"),
+        MemoryField("current_event_currency1", 116, "int"),
+        MemoryField("current_event_currency2", 120, "int"),
+        MemoryField("current_pvp_currency", 124, "int"),
+        MemoryField("current_mana", 128, "int"),
+        MemoryField("current_arena_points", 132, "int"),
+        MemoryField("potion_max", 160, "float"),
+        MemoryField("potion_charge", 164, "float"),
+        MemoryField("bonus_hitpoints", 216, "int"),
+        MemoryField("bonus_mana", 220, "int"),
+        MemoryField("bonus_energy", 236, "int"),
+        MemoryField("critical_hit_percent_all", 240, "float"),
+        MemoryField("block_percent_all", 244, "float"),
+        MemoryField("critical_hit_rating_all", 248, "float"),
+        MemoryField("block_rating_all", 252, "float"),
+        MemoryField("pip_conversion_rating_all", 280, "float"),
+        MemoryField("pip_conversion_percent_all", 312, "float"),
+        MemoryField("reference_level", 316, "int"),
+        MemoryField("highest_character_level_on_account", 320, "int"),
+        MemoryField("pet_act_chance", 324, "int"),
+        MemoryField("dmg_bonus_percent_all", 688, "float"),
+        MemoryField("dmg_bonus_flat_all", 692, "float"),
+        MemoryField("acc_bonus_percent_all", 696, "float"),
+        MemoryField("ap_bonus_percent_all", 700, "float"),
+        MemoryField("dmg_reduce_percent_all", 704, "float"),
+        MemoryField("dmg_reduce_flat_all", 708, "float"),
+        MemoryField("acc_reduce_percent_all", 712, "float"),
+        MemoryField("heal_bonus_percent_all", 716, "float"),
+        MemoryField("heal_inc_bonus_percent_all", 720, "float"),
+        MemoryField("fishing_luck_bonus_percent_all", 724, "float"),
+        MemoryField("spell_charge_bonus_all", 728, "int"),
+        MemoryField("power_pip_base", 732, "float"),
+        MemoryField("pip_conversion_base_all_schools", 736, "int"),
+        MemoryField("power_pip_bonus_percent_all", 768, "float"),
+        MemoryField("shadow_pip_bonus_percent", 772, "float"),
+        MemoryField("xp_percent_increase", 776, "float"),
+        MemoryField("wisp_bonus_percent", 796, "float"),
+        MemoryField("balance_mastery", 804, "int"),
+        MemoryField("death_mastery", 808, "int"),
+        MemoryField("fire_mastery", 812, "int"),
+        MemoryField("ice_mastery", 816, "int"),
+        MemoryField("life_mastery", 820, "int"),
+        MemoryField("myth_mastery", 824, "int"),
+        MemoryField("storm_mastery", 828, "int"),
+        MemoryField("maximum_number_of_islands", 832, "int"),
+        MemoryField("gardening_level", 836, "unsigned char"),
+        MemoryField("gardening_xp", 840, "int"),
+        MemoryField("invisible_to_friends", 844, "bool"),
+        MemoryField("show_item_lock", 845, "bool"),
+        MemoryField("quest_finder_enabled", 846, "bool"),
+        MemoryField("buddy_list_limit", 848, "int"),
+        MemoryField("stun_resistance_percent", 852, "float"),
+        MemoryField("dont_allow_friend_finder_codes", 856, "bool"),
+        MemoryField("shadow_pip_max", 860, "int"),
+        MemoryField("shadow_magic_unlocked", 864, "bool"),
+        MemoryField("fishing_level", 865, "unsigned char"),
+        MemoryField("fishing_xp", 868, "int"),
+        MemoryField("subscriber_benefit_flags", 872, "unsigned int"),
+        MemoryField("elixir_benefit_flags", 876, "unsigned int"),
+        MemoryField("monster_magic_level", 880, "unsigned char"),
+        MemoryField("monster_magic_xp", 884, "int"),
+        MemoryField("player_chat_channel_is_public", 888, "bool"),
+        MemoryField("extra_inventory_space", 892, "int"),
+        MemoryField("remember_last_realm", 896, "bool"),
+        MemoryField("new_spellbook_layout_warning", 897, "bool"),
+        MemoryField("purchased_custom_emotes1", 900, "unsigned int"),
+        MemoryField("purchased_custom_teleport_effects1", 904, "unsigned int"),
+        MemoryField("equipped_teleport_effect", 908, "unsigned int"),
+        MemoryField("highest_world1_id", 912, "unsigned int"),
+        MemoryField("highest_world2_id", 916, "unsigned int"),
+        MemoryField("active_class_projects_list", 920, "unsigned int"),
+        MemoryField("disabled_item_slot_ids", 936, "unsigned int"),
+        MemoryField("adventure_power_cooldown_time", 952, "unsigned int"),
+        MemoryField("purchased_custom_emotes2", 956, "unsigned int"),
+        MemoryField("purchased_custom_teleport_effects2", 960, "unsigned int"),
+        MemoryField("purchased_custom_emotes3", 964, "unsigned int"),
+        MemoryField("purchased_custom_teleport_effects3", 968, "unsigned int"),
+        MemoryField("shadow_pip_rating", 972, "float"),
+        MemoryField("bonus_shadow_pip_rating", 976, "float"),
+        MemoryField("shadow_pip_rate_accumulated", 980, "float"),
+        MemoryField("shadow_pip_rate_threshold", 984, "float"),
+        MemoryField("shadow_pip_rate_percentage", 988, "int"),
+        MemoryField("friendly_player", 992, "bool"),
+        MemoryField("emoji_skin_tone", 996, "int"),
+        MemoryField("show_pvp_option", 1000, "unsigned int"),
+        MemoryField("favorite_slot", 1004, "int"),
+        MemoryField("cantrip_level", 1008, "unsigned char"),
+        MemoryField("cantrip_xp", 1012, "int"),
+    )
+
     async def read_base_address(self) -> int:
         raise NotImplementedError()
 
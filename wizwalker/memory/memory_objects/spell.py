@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Optional
 
-from wizwalker.memory.memory_object import DynamicMemoryObject, PropertyClass
+from wizwalker.memory.memory_object import DynamicMemoryObject, MemoryField, PropertyClass
 from .enums import DelayOrder
 from .spell_template import DynamicSpellTemplate
 from .spell_effect import DynamicSpellEffect
@@ -14,6 +14,31 @@ class RankStruct:
 
 
 class Spell(PropertyClass):
+    snapshot_fields = (
+        MemoryField("delay_enchantment_order", 72, "int", enum=DelayOrder),
+        MemoryField("enchantment_spell_is_item_card", 76, "bool"),
+        MemoryField("enchanted_this_combat", 77, "bool"),
+        MemoryField("enchantment", 80, "unsigned int"),
+        MemoryField("premutation_spell_id", 112, "unsigned int"),
+        MemoryField("template_id", 128, "unsigned int"),
+        MemoryField("accuracy", 132, "unsigned char"),
+        MemoryField("magic_school_id", 136, "unsigned int"),
+        MemoryField("regular_rank", 176 + 72, "unsigned char"),
+        MemoryField("shadow_rank", 176 + 73, "unsigned char"),
+        MemoryField("regular_adjust", 256, "int"),
+        MemoryField("shadow_adjust", 260, "int"),
+        MemoryField("cloaked", 264, "bool"),
+        MemoryField("treasure_card", 265, "bool"),
+        MemoryField("battle_card", 266, "bool"),
+        MemoryField("item_card", 267, "bool"),
+        MemoryField("side_board", 268, "bool"),
+        MemoryField("spell_id", 272, "unsigned int"),
+        MemoryField("leaves_play_when_cast_override", 284, "bool"),
+        MemoryField("delay_enchantment", 321, "bool"),
+        MemoryField("round_added_tc", 324, "int"),
+        MemoryField("pve", 328, "bool"),
+    )
+
     async def read_base_address(self) -> int:
         raise NotImplementedError()
 
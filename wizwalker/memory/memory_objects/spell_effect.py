@@ -1,10 +1,32 @@
 from typing import List
 
-from wizwalker.memory.memory_object import DynamicMemoryObject, PropertyClass
+from wizwalker.memory.memory_object import DynamicMemoryObject, MemoryField, PropertyClass
 from .enums import SpellEffects, EffectTarget, HangingDisposition
 
 
 class SpellEffect(PropertyClass):
+    snapshot_fields = (
+        MemoryField("effect_type", 72, "int", enum=SpellEffects),
+        MemoryField("effect_param", 76, "int"),
+        MemoryField("disposition", 80, "int", enum=HangingDisposition),
+        MemoryField("damage_type", 84, "unsigned int"),
+        MemoryField("spell_template_id", 120, "unsigned int"),
+        MemoryField("enchantment_spell_template_id", 124, "unsigned int"),
+        MemoryField("pip_num", 128, "int"),
+        MemoryField("act_num", 132, "int"),
+        MemoryField("act", 136, "bool"),
+        MemoryField("effect_target", 140, "int", enum=EffectTarget),
+        MemoryField("num_rounds", 144, "int"),
+        MemoryField("param_per_round", 148, "int"),
+        MemoryField("heal_modifier", 152, "float"),
+        MemoryField("cloaked", 157, "bool"),
+        MemoryField("armor_piercing_param", 160, "int"),
+        MemoryField("chance_per_target", 164, "int"),
+        MemoryField("protected", 168, "bool"),
+        MemoryField("converted", 169, "bool"),
+        MemoryField("rank", 208, "int"),
+    )
+
     async def read_base_address(self) -> int:
         raise NotImplementedError()
 
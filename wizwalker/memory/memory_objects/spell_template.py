@@ -1,11 +1,44 @@
 from typing import List
 
-from wizwalker.memory.memory_object import DynamicMemoryObject, PropertyClass
+from wizwalker.memory.memory_object import DynamicMemoryObject, MemoryField, PropertyClass
 from .enums import DelayOrder, SpellSourceType
 from .spell_effect import DynamicSpellEffect
 
 
 class SpellTemplate(PropertyClass):
+    snapshot_fields = (
+        MemoryField("base_cost", 200, "int"),
+        MemoryField("credits_cost", 204, "int"),
+        MemoryField("training_cost", 344, "int"),
+        MemoryField("accuracy", 348, "int"),
+        MemoryField("valid_target_spells", 352, "unsigned int"),
+        MemoryField("pvp", 368, "bool"),
+        MemoryField("pve", 369, "bool"),
+        MemoryField("no_pvp_enchant", 370, "bool"),
+        MemoryField("no_pve_enchant", 371, "bool"),
+        MemoryField("battlegrounds_only", 372, "bool"),
+        MemoryField("treasure", 373, "bool"),
+        MemoryField("no_discard", 374, "bool"),
+        MemoryField("image_index", 376, "int"),
+        MemoryField("use_gloss", 448, "bool"),
+        MemoryField("cloaked", 449, "bool"),
+        MemoryField("caster_invisible", 450, "bool"),
+        MemoryField("spell_source_type", 488, "int", enum=SpellSourceType),
+        MemoryField("leaves_play_when_cast", 492, "bool"),
+        MemoryField("display_index", 640, "int"),
+        MemoryField("hidden_from_effects_window", 644, "bool"),
+        MemoryField("ignore_charms", 645, "bool"),
+        MemoryField("always_fizzle", 646, "bool"),
+        MemoryField("show_polymorphed_name", 680, "bool"),
+        MemoryField("skip_truncation", 681, "bool"),
+        MemoryField("max_copies", 684, "unsigned int"),
+        MemoryField("level_restriction", 688, "int"),
+        MemoryField("delay_enchantment", 692, "bool"),
+        MemoryField("delay_enchantment_order", 696, "int", enum=DelayOrder),
+        MemoryField("ignore_dispel", 736, "bool"),
+        MemoryField("backrow_friendly", 737, "bool"),
+    )
+
     async def read_base_address(self) -> int:
         raise NotImplementedError()
 
@@ -0,0 +1,345 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from wizwalker import MemoryReadError, get_vector_struct, type_struct_dict
+from wizwalker.memory.memory_reader import MemoryReader
+from .spell import Spell
+from .spell_effect import DynamicSpellEffect
+from .spell_template import DynamicSpellTemplate
+
+
+# SpellTemplate
+_NAME = 96
+_DISPLAY_NAME = 136
+_EFFECTS = 240
+_MAGIC_SCHOOL_NAME = 272
+_TYPE_NAME = 312
+
+# SpellEffect
+_EFFECT_LIST = 224
+
+_MAX_EFFECTS = 1000
+# Random and Variable effects hold other effects, they aren't nested deeper than this
+_MAX_EFFECT_DEPTH = 8
+# templates are allocated close together so nearby reads are merged
+_MAX_READ_GAP = 0x1000
+
+_LONG_LONG = type_struct_dict["long long"]
+_VECTOR_BOUNDS = get_vector_struct("long long", 2)
+
+# backend -> the SpellTemplateCache shared by every reader of it
+_caches = WeakKeyDictionary()
+
+
+class SpellEffectRecord(NamedTuple):
+    """
+    A decoded spell effect
+
+    Args:
+        address: Address of the effect
+        type_name: The effect's type name i.e. RandomSpellEffect
+        fields: The effect's SpellEffect snapshot_fields
+        effects: Effects held by Random and Variable effects, empty for others
+    """
+
+    address: int
+    type_name: str
+    fields: tuple
+    effects: Tuple["SpellEffectRecord", ...]
+
+
+class SpellTemplateRecord(NamedTuple):
+    """
+    A decoded spell template
+
+    Args:
+        template_id: The template's id
+        address: Address of the template
+        name: The template's (debug) name
+        display_name_code: Langcode of the template's display name
+        type_name: The template's type name i.e. AOE
+        magic_school_name: Name of the template's school
+        fields: The template's SpellTemplate snapshot_fields
+        effects: The template's effects
+        flat_effects: effects and every effect held by them, depth first
+    """
+
+    template_id: int
+    address: int
+    name: str
+    display_name_code: str
+    type_name: str
+    magic_school_name: str
+    fields: tuple
+    effects: Tuple[SpellEffectRecord, ...]
+    flat_effects: Tuple[SpellEffectRecord, ...]
+
+
+def walk_effects(effects: Iterable[SpellEffectRecord]) -> Iterator[SpellEffectRecord]:
+    """
+    Yield effects and every effect held by them, depth first
+    """
+    for effect in effects:
+        yield effect
+        yield from walk_effects(effect.effects)
+
+
+class SpellTemplateCache:
+    """
+    Decoded spell templates of a process by template id
+
+    Templates don't change once loaded so entries are kept until cleared;
+    use get_for to get the cache shared by every reader of a process
+
+    Examples:
+        .. code-block:: py
+
+            cache = SpellTemplateCache.get_for(client.hook_handler)
+            template = await cache.read_for_spell(graphical_spell)
+            print(template.type_name, [effect.fields.effect_type for effect in template.flat_effects])
+    """
+
+    def __init__(self):
+        self._records: Dict[int, SpellTemplateRecord] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, template_id: int) -> bool:
+        return template_id in self._records
+
+    @classmethod
+    def get_for(cls, reader: MemoryReader) -> "SpellTemplateCache":
+        """
+        Get the cache shared by every reader of a reader's process
+        """
+        cache = _caches.get(reader.backend)
+        if cache is None:
+            cache = _caches[reader.backend] = cls()
+
+        return cache
+
+    def get(self, template_id: int) -> Optional[SpellTemplateRecord]:
+        """
+        Get a cached template without reading it
+        """
+        return self._records.get(template_id)
+
+    def clear(self):
+        """
+        Drop every cached template
+        """
+        self._records.clear()
+
+    async def read(self, reader, templates: Dict[int, int]) -> Dict[int, SpellTemplateRecord]:
+        """
+        Get templates, reading the ones that aren't cached with as few process reads as possible
+
+        Args:
+            reader: The reader to read with, usually a HookHandler
+            templates: Map of template id to template address
+
+        Returns:
+            Map of template id to record, templates that couldn't be read are left out
+        """
+        missing = {
+            template_id: address
+            for template_id, address in templates.items()
+            if template_id not in self._records and address
+        }
+        if missing:
+            await self._read_templates(reader, missing)
+
+        return {
+            template_id: self._records[template_id]
+            for template_id in templates
+            if template_id in self._records
+        }
+
+    async def read_for_spell(self, spell: Spell) -> Optional[SpellTemplateRecord]:
+        """
+        Get the template of a spell, only reading the template if it isn't cached
+
+        Args:
+            spell: The spell, usually a graphical spell
+
+        Returns:
+            The template's record, None if the spell has no template
+        """
+        template_id = await spell.template_id()
+        record = self._records.get(template_id)
+        if record is not None:
+            return record
+
+        template = await spell.spell_template()
+        if template is None:
+            return None
+
+        records = await self.read(spell.hook_handler, {template_id: template.base_address})
+        return records.get(template_id)
+
+    async def _read_templates(self, reader, templates: Dict[int, int]):
+        hook_handler = getattr(reader, "hook_handler", reader)
+        template_ids = list(templates)
+        addresses = [templates[template_id] for template_id in template_ids]
+
+        async with hook_handler.frame():
+            template_fields = await DynamicSpellTemplate.snapshot_many(
+                hook_handler, addresses, max_gap=_MAX_READ_GAP
+            )
+
+            # read_strings is only defined on memory objects
+            string_reader = DynamicSpellTemplate(hook_handler, addresses[0])
+            string_offsets = (_NAME, _DISPLAY_NAME, _TYPE_NAME, _MAGIC_SCHOOL_NAME)
+            strings = await string_reader.read_strings(
+                (address + offset for address in addresses for offset in string_offsets),
+                max_gap=_MAX_READ_GAP,
+            )
+
+            bound_datas = await hook_handler.read_many(
+                ((address + _EFFECTS, _VECTOR_BOUNDS.size) for address in addresses),
+                max_gap=_MAX_READ_GAP,
+                ignore_errors=True,
+            )
+            effect_vectors = await _read_shared_vectors(
+                hook_handler,
+                [
+                    _VECTOR_BOUNDS.unpack(data) if data is not None else (0, 0)
+                    for data in bound_datas
+                ],
+            )
+            effects = await _read_effect_trees(
+                hook_handler, [effect for vector in effect_vectors for effect in vector]
+            )
+
+        for index, (template_id, address, fields, effect_addresses) in enumerate(
+            zip(template_ids, addresses, template_fields, effect_vectors)
+        ):
+            if fields is None:
+                continue
+
+            name, display_name_code, type_name, magic_school_name = strings[
+                index * 4 : index * 4 + 4
+            ]
+            template_effects = tuple(
+                effects[effect] for effect in effect_addresses if effect in effects
+            )
+
+            self._records[template_id] = SpellTemplateRecord(
+                template_id,
+                address,
+                name,
+                display_name_code,
+                type_name,
+                magic_school_name,
+                fields,
+                template_effects,
+                tuple(walk_effects(template_effects)),
+            )
+
+
+async def _read_shared_vectors(
+    reader: MemoryReader, bounds: List[Tuple[int, int]]
+) -> List[List[int]]:
+    # the same as MemoryObject.read_shared_vector for many vectors at once
+    ranges = []
+    for start, end in bounds:
+        element_number = (end - start) // 16
+        if 0 < element_number <= _MAX_EFFECTS:
+            ranges.append((start, element_number * 16))
+        else:
+            ranges.append((start, 0))
+
+    datas = await reader.read_many(ranges, max_gap=_MAX_READ_GAP, ignore_errors=True)
+    return [
+        [pointer for pointer in memoryview(data).cast("q")[::2] if pointer] if data else []
+        for data in datas
+    ]
+
+
+async def _read_effect_trees(
+    hook_handler, addresses: List[int]
+) -> Dict[int, SpellEffectRecord]:
+    fields = {}
+    type_names = {}
+    children = {}
+
+    # effects are read level by level so each level is one batch
+    level = list(dict.fromkeys(address for address in addresses if address))
+    depth = 0
+    while level and depth < _MAX_EFFECT_DEPTH:
+        records = await DynamicSpellEffect.snapshot_many(
+            hook_handler, level, max_gap=_MAX_READ_GAP
+        )
+
+        # the vtables are on pages that were just read
+        vtable_datas = await hook_handler.read_many(
+            ((address, 8) for address in level), max_gap=_MAX_READ_GAP, ignore_errors=True
+        )
+        vtables = [
+            _LONG_LONG.unpack(data)[0] if data is not None else 0 for data in vtable_datas
+        ]
+        vtable_type_names = await DynamicSpellEffect(
+            hook_handler, level[0]
+        ).read_vtable_type_names(vtable for vtable in vtables if vtable)
+
+        next_level = []
+        for address, record, vtable in zip(level, records, vtables):
+            if record is None:
+                continue
+
+            type_name = vtable_type_names.get(vtable, "")
+
+            fields[address] = record
+            type_names[address] = type_name
+            children[address] = []
+
+            if any(substr in type_name.lower() for substr in ("variable", "random")):
+                effect = DynamicSpellEffect(hook_handler, address)
+                try:
+                    children[address] = await effect.read_shared_linked_list(
+                        _EFFECT_LIST, max_size=_MAX_EFFECTS
+                    )
+                except (ValueError, MemoryReadError):
+                    pass
+
+                next_level.extend(
+                    child for child in children[address] if child and child not in fields
+                )
+
+        level = list(dict.fromkeys(next_level))
+        depth += 1
+
+    # subtrees without a dropped back edge don't depend on the path to them
+    built = {}
+
+    def _build(address: int, ancestors: frozenset) -> Tuple[SpellEffectRecord, bool]:
+        record = built.get(address)
+        if record is not None:
+            return record, False
+
+        ancestors = ancestors | {address}
+        child_records = []
+        dropped = False
+        for child in children[address]:
+            if child not in fields:
+                continue
+
+            # a cycle back to an effect on the path is dropped
+            if child in ancestors:
+                dropped = True
+                continue
+
+            child_record, child_dropped = _build(child, ancestors)
+            child_records.append(child_record)
+            dropped = dropped or child_dropped
+
+        record = SpellEffectRecord(
+            address, type_names[address], fields[address], tuple(child_records)
+        )
+        if not dropped:
+            built[address] = record
+
+        return record, dropped
+
+    return {address: _build(address, frozenset())[0] for address in fields}
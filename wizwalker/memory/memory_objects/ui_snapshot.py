@@ -0,0 +1,285 @@
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from wizwalker.utils import Rectangle
+from .enums import WindowFlags
+
+
+class UIWindowRecord(NamedTuple):
+    """
+    One window of a UITreeSnapshot
+
+    Args:
+        address: Address of the window
+        parent: Row of the window's parent, -1 for the root
+        name: The window's name
+        type_name: The window's type name
+        flags: The window's flags
+        rectangle: The window's rectangle (x1, y1, x2, y2)
+        text: The window's text, empty for windows that aren't controls
+    """
+
+    address: int
+    parent: int
+    name: str
+    type_name: str
+    flags: WindowFlags
+    rectangle: Tuple[int, int, int, int]
+    text: str
+
+
+class UITreeSnapshot:
+    """
+    Columnar copy of a window tree, rows are in level order with the root at row 0
+
+    Strings are stored once in a string table and referenced by index
+
+    Examples:
+        .. code-block:: py
+
+            snapshot = await client.root_window.snapshot_ui_tree()
+            snapshot.save("ui.wwui")
+
+            for row in UITreeSnapshot.load("ui.wwui").find(name="Hand"):
+                print(snapshot[row])
+    """
+
+    MAGIC = b"WWUI"
+    VERSION = 1
+
+    _header = struct.Struct("<4sIII")
+    _string_header = struct.Struct("<I")
+
+    # column name, array typecode, values per row
+    _columns = (
+        ("addresses", "Q", 1),
+        ("parents", "q", 1),
+        ("names", "I", 1),
+        ("type_names", "I", 1),
+        ("flags", "I", 1),
+        ("rectangles", "i", 4),
+        ("texts", "I", 1),
+    )
+
+    def __init__(self):
+        self.strings: List[str] = [""]
+        self._string_ids: Dict[str, int] = {"": 0}
+
+        self.addresses = array("Q")
+        self.parents = array("q")
+        self.names = array("I")
+        self.type_names = array("I")
+        self.flags = array("I")
+        self.rectangles = array("i")
+        self.texts = array("I")
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __getitem__(self, row: int) -> UIWindowRecord:
+        if not 0 <= row < len(self):
+            raise IndexError(f"Row {row} out of range")
+
+        return UIWindowRecord(
+            self.addresses[row],
+            self.parents[row],
+            self.strings[self.names[row]],
+            self.strings[self.type_names[row]],
+            WindowFlags(self.flags[row]),
+            tuple(self.rectangles[row * 4 : row * 4 + 4]),
+            self.strings[self.texts[row]],
+        )
+
+    def __iter__(self) -> Iterator[UIWindowRecord]:
+        for row in range(len(self)):
+            yield self[row]
+
+    def _string_id(self, string: str) -> int:
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = self._string_ids[string] = len(self.strings)
+            self.strings.append(string)
+
+        return string_id
+
+    def append(
+        self,
+        address: int,
+        parent: int,
+        name: str,
+        type_name: str,
+        flags: int,
+        rectangle: Iterable[int],
+        text: str,
+    ) -> int:
+        """
+        Add a window
+
+        Returns:
+            The window's row
+        """
+        self.addresses.append(address)
+        self.parents.append(parent)
+        self.names.append(self._string_id(name))
+        self.type_names.append(self._string_id(type_name))
+        self.flags.append(int(flags))
+        self.rectangles.extend(rectangle)
+        self.texts.append(self._string_id(text))
+
+        return len(self.addresses) - 1
+
+    def rectangle(self, row: int) -> Rectangle:
+        """
+        Get the rectangle of a row
+        """
+        return Rectangle(*self.rectangles[row * 4 : row * 4 + 4])
+
+    def children(self, row: int) -> List[int]:
+        """
+        Get the rows of a row's children
+        """
+        return [child for child, parent in enumerate(self.parents) if parent == row]
+
+    def find(
+        self,
+        *,
+        name: Optional[str] = None,
+        type_name: Optional[str] = None,
+        flags: Optional[WindowFlags] = None,
+    ) -> List[int]:
+        """
+        Find rows matching every passed filter
+
+        Args:
+            name: Name the window must have
+            type_name: Type name the window must have
+            flags: Flags that must all be set on the window
+
+        Returns:
+            The matching rows
+        """
+        rows = range(len(self))
+
+        # strings that were never stored can't match
+        if name is not None:
+            name_id = self._string_ids.get(name)
+            if name_id is None:
+                return []
+
+            rows = [row for row in rows if self.names[row] == name_id]
+
+        if type_name is not None:
+            type_name_id = self._string_ids.get(type_name)
+            if type_name_id is None:
+                return []
+
+            rows = [row for row in rows if self.type_names[row] == type_name_id]
+
+        if flags is not None:
+            flags = int(flags)
+            rows = [row for row in rows if self.flags[row] & flags == flags]
+
+        return list(rows)
+
+    def diff(self, other: "UITreeSnapshot") -> Dict[str, List[int]]:
+        """
+        Compare to a later snapshot by window address
+
+        Returns:
+            Addresses that were added, removed, and changed
+        """
+        own_rows = {address: row for row, address in enumerate(self.addresses)}
+        other_rows = {address: row for row, address in enumerate(other.addresses)}
+
+        changed = []
+        for address, row in own_rows.items():
+            other_row = other_rows.get(address)
+            if other_row is None:
+                continue
+
+            own_record = self[row]
+            other_record = other[other_row]
+            # parent is compared by address since rows can move
+            own_parent = self.addresses[own_record.parent] if own_record.parent != -1 else 0
+            other_parent = (
+                other.addresses[other_record.parent] if other_record.parent != -1 else 0
+            )
+
+            if own_parent != other_parent or own_record[2:] != other_record[2:]:
+                changed.append(address)
+
+        return {
+            "added": [address for address in other_rows if address not in own_rows],
+            "removed": [address for address in own_rows if address not in other_rows],
+            "changed": changed,
+        }
+
+    def save(self, path: Union[str, Path]):
+        """
+        Save the snapshot to a file
+        """
+        with open(path, "wb") as fp:
+            fp.write(
+                self._header.pack(self.MAGIC, self.VERSION, len(self), len(self.strings))
+            )
+
+            for string in self.strings:
+                encoded = string.encode()
+                fp.write(self._string_header.pack(len(encoded)))
+                fp.write(encoded)
+
+            for column_name, _, _ in self._columns:
+                column = getattr(self, column_name)
+                if sys.byteorder == "big":
+                    column = array(column.typecode, column)
+                    column.byteswap()
+
+                fp.write(column.tobytes())
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "UITreeSnapshot":
+        """
+        Load a snapshot saved with save
+
+        Raises:
+            ValueError: If the file is not a ui tree snapshot
+        """
+        snapshot = cls()
+
+        with open(path, "rb") as fp:
+            header = fp.read(cls._header.size)
+            if len(header) != cls._header.size:
+                raise ValueError(f"{path} is not a ui tree snapshot")
+
+            magic, version, row_count, string_count = cls._header.unpack(header)
+            if magic != cls.MAGIC or version != cls.VERSION:
+                raise ValueError(f"{path} is not a version {cls.VERSION} ui tree snapshot")
+
+            snapshot.strings = []
+            for _ in range(string_count):
+                (string_length,) = cls._string_header.unpack(
+                    fp.read(cls._string_header.size)
+                )
+                snapshot.strings.append(fp.read(string_length).decode())
+
+            snapshot._string_ids = {
+                string: string_id for string_id, string in enumerate(snapshot.strings)
+            }
+
+            for column_name, typecode, per_row in cls._columns:
+                column = array(typecode)
+                column_size = row_count * per_row * column.itemsize
+                data = fp.read(column_size)
+                if len(data) != column_size:
+                    raise ValueError(f"{path} is truncated")
+
+                column.frombytes(data)
+                if sys.byteorder == "big":
+                    column.byteswap()
+
+                setattr(snapshot, column_name, column)
+
+        return snapshot
@@ -1,18 +1,85 @@
-import struct
-from typing import Callable, List, Optional
+from typing import AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Tuple
 from contextlib import suppress
 
 from loguru import logger
 
-from wizwalker.memory.memory_object import DynamicMemoryObject, PropertyClass
+from wizwalker.memory.memory_object import (
+    DynamicMemoryObject,
+    MemoryField,
+    MemoryObject,
+    PropertyClass,
+)
 from .enums import WindowFlags, WindowStyle
 from .spell import DynamicGraphicalSpell
 from .combat_participant import DynamicCombatParticipant
-from wizwalker import AddressOutOfRange, MemoryReadError, Rectangle, utils, type_format_dict
+from .ui_snapshot import UITreeSnapshot
+from wizwalker import (
+    AddressOutOfRange,
+    MemoryReadError,
+    Rectangle,
+    get_vector_struct,
+    type_struct_dict,
+    utils,
+)
+
+
+# vtable through flags, everything a tree walk needs from each window
+_WINDOW_HEADER_SIZE = 160
+_NAME_OFFSET = 80
+_CHILDREN_OFFSET = 112
+_FLAGS_OFFSET = 156
+_RECTANGLE_OFFSET = 160
+_TEXT_OFFSET = 584
+# same limit as read_shared_vector
+_MAX_CHILDREN = 1000
+# windows are allocated close together so nearby reads are merged
+_MAX_READ_GAP = 0x1000
+
+_LONG_LONG = type_struct_dict["long long"]
+_UNSIGNED_LONG = type_struct_dict["unsigned long"]
+_CHILDREN_BOUNDS = get_vector_struct("long long", 2)
+_RECTANGLE = get_vector_struct("int", 4)
+
+
+class WindowNode(NamedTuple):
+    """
+    A window read during a tree walk
+
+    Args:
+        window: The window
+        depth: Depth below the window the walk started at, its children are 1
+        path: Child indexes leading from the starting window to this one
+        name: The window's name
+        flags: The window's flags
+        type_name: The window's type name, empty if type names weren't read
+        children_bounds: Begin and end pointers of the children vector
+        children: Addresses of the window's children
+    """
+
+    window: "DynamicWindow"
+    depth: int
+    path: Tuple[int, ...]
+    name: str
+    flags: WindowFlags
+    type_name: str
+    children_bounds: Tuple[int, int]
+    children: Tuple[int, ...]
 
 
 # TODO: Window.click
 class Window(PropertyClass):
+    snapshot_fields = (
+        MemoryField("style", 152, "long", enum=WindowStyle),
+        MemoryField("flags", 156, "unsigned long", enum=WindowFlags),
+        MemoryField("window_rectangle", 160, "int", count=4),
+        MemoryField("parent_offset", 176, "int", count=4),
+        MemoryField("offset", 192, "int", count=2),
+        MemoryField("scale", 200, "float", count=2),
+        MemoryField("alpha", 208, "float"),
+        MemoryField("target_alpha", 212, "float"),
+        MemoryField("disabled_alpha", 216, "float"),
+    )
+
     async def read_base_address(self) -> int:
         raise NotImplementedError()
 
@@ -40,16 +107,213 @@ class Window(PropertyClass):
         return rect.scale_to_client(parent_rects, ui_scale)
 
     async def get_windows_with_type(self, type_name: str) -> List["DynamicWindow"]:
-        async def _pred(window):
-            return await window.maybe_read_type_name() == type_name
-
-        return await self.get_windows_with_predicate(_pred)
+        return await self.find_windows(type_name=type_name)
 
     async def get_windows_with_name(self, name: str) -> List["DynamicWindow"]:
-        async def _pred(window):
-            return await window.name() == name
+        return await self.find_windows(name=name)
+
+    async def _read_window_nodes(
+        self,
+        entries: List[Tuple[int, int, Tuple[int, ...]]],
+        read_type_names: bool,
+    ) -> List[WindowNode]:
+        # entries are (address, depth, path)
+        headers = await self.read_many(
+            ((address, _WINDOW_HEADER_SIZE) for address, _, _ in entries),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+
+        readable = []
+        # (entry index, name bytes or None, children bounds, child count)
+        decoded = []
+        # (entry index, is name, address, size) for everything not in the header
+        extra_ranges = []
+        for idx, header in enumerate(headers):
+            if header is None:
+                continue
+
+            address = entries[idx][0]
+
+            name_bytes = b""
+            name_location = MemoryObject._parse_string_header(
+                address + _NAME_OFFSET, header[_NAME_OFFSET:], False
+            )
+            if name_location is not None:
+                name_address, name_size = name_location
+                if name_address == address + _NAME_OFFSET:
+                    name_bytes = header[_NAME_OFFSET : _NAME_OFFSET + name_size]
+                else:
+                    name_bytes = None
+                    extra_ranges.append((len(readable), True, name_address, name_size))
+
+            children_bounds = _CHILDREN_BOUNDS.unpack_from(header, _CHILDREN_OFFSET)
+            child_count = (children_bounds[1] - children_bounds[0]) // 16
+            if 0 < child_count <= _MAX_CHILDREN:
+                extra_ranges.append(
+                    (len(readable), False, children_bounds[0], child_count * 16)
+                )
+
+            readable.append(idx)
+            decoded.append([name_bytes, children_bounds, ()])
+
+        extra_data = await self.read_many(
+            ((address, size) for _, _, address, size in extra_ranges),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+        for (decoded_idx, is_name, _, _), data in zip(extra_ranges, extra_data):
+            if is_name:
+                decoded[decoded_idx][0] = data
+            elif data is not None:
+                # shared pointers are 16 long and start with the address
+                decoded[decoded_idx][2] = tuple(memoryview(data).cast("q")[::2])
+
+        type_names = {}
+        if read_type_names:
+            type_names = await self.read_vtable_type_names(
+                _LONG_LONG.unpack_from(headers[idx])[0] for idx in readable
+            )
+
+        nodes = []
+        for idx, (name_bytes, children_bounds, children) in zip(readable, decoded):
+            address, depth, path = entries[idx]
+            header = headers[idx]
+
+            try:
+                name = name_bytes.decode() if name_bytes else ""
+            except UnicodeDecodeError:
+                name = ""
+
+            nodes.append(
+                WindowNode(
+                    DynamicWindow(self.hook_handler, address),
+                    depth,
+                    path,
+                    name,
+                    WindowFlags(_UNSIGNED_LONG.unpack_from(header, _FLAGS_OFFSET)[0]),
+                    type_names.get(_LONG_LONG.unpack_from(header)[0], ""),
+                    children_bounds,
+                    children,
+                )
+            )
+
+        return nodes
+
+    async def walk_tree(
+        self, *, read_type_names: bool = False, max_depth: Optional[int] = None
+    ) -> AsyncIterator[List[WindowNode]]:
+        """
+        Walk this window's descendants one level at a time
+
+        Each level is read with a few batched reads no matter how many windows it has,
+        windows that can't be read are skipped along with their children
+
+        Args:
+            read_type_names: If each node's type_name should be read
+            max_depth: Deepest level to walk, children are depth 1
+
+        Yields:
+            The WindowNodes of each level, in child order
+
+        Examples:
+            .. code-block:: py
+
+                async for level in client.root_window.walk_tree():
+                    for node in level:
+                        print(node.depth, node.name)
+        """
+        base_address = await self._resolve_base_address()
+
+        level = await self._read_window_nodes([(base_address, 0, ())], False)
+        async for level in self._walk_levels(level, read_type_names, max_depth):
+            yield level
+
+    async def _walk_levels(
+        self,
+        level: List[WindowNode],
+        read_type_names: bool,
+        max_depth: Optional[int] = None,
+    ) -> AsyncIterator[List[WindowNode]]:
+        # walk below already read nodes
+        visited = {node.window.base_address for node in level}
+
+        while level:
+            entries = []
+            for node in level:
+                if max_depth is not None and node.depth >= max_depth:
+                    continue
+
+                for child_idx, child in enumerate(node.children):
+                    if child == 0 or child in visited:
+                        continue
+
+                    visited.add(child)
+                    entries.append((child, node.depth + 1, node.path + (child_idx,)))
+
+            if not entries:
+                return
+
+            level = await self._read_window_nodes(entries, read_type_names)
+            yield level
+
+    async def find_windows(
+        self,
+        *,
+        name: Optional[str] = None,
+        type_name: Optional[str] = None,
+        flags: Optional[WindowFlags] = None,
+        predicate: Optional[Callable[[WindowNode], bool]] = None,
+        first: bool = False,
+        max_depth: Optional[int] = None,
+    ) -> List["DynamicWindow"]:
+        """
+        Find descendants of this window matching every passed filter
+
+        Filters are checked against nodes read by walk_tree instead of
+        reading each window separately
 
-        return await self.get_windows_with_predicate(_pred)
+        Args:
+            name: Name the window must have
+            type_name: Type name the window must have
+            flags: Flags that must all be set on the window
+            predicate: Non async function taking a WindowNode and returning if it matches
+            first: Stop at the first match, the shallowest matching window
+            max_depth: Deepest level to search, children are depth 1
+
+        Returns:
+            Matching windows in the same order as get_windows_with_predicate
+
+        Examples:
+            .. code-block:: py
+
+                hand = await client.root_window.find_windows(name="Hand", first=True)
+        """
+        matches = []
+        async for level in self.walk_tree(
+            read_type_names=type_name is not None, max_depth=max_depth
+        ):
+            for node in level:
+                if name is not None and node.name != name:
+                    continue
+
+                if type_name is not None and node.type_name != type_name:
+                    continue
+
+                if flags is not None and node.flags & flags != flags:
+                    continue
+
+                if predicate is not None and not predicate(node):
+                    continue
+
+                if first:
+                    return [node.window]
+
+                matches.append(node)
+
+        # children first then each child's subtree depth first
+        matches.sort(key=lambda node: (node.depth != 1, node.path))
+        return [node.window for node in matches]
 
     async def _recursive_get_windows_by_predicate(self, predicate, windows):
         with suppress(ValueError, MemoryReadError, AddressOutOfRange):
@@ -88,6 +352,66 @@ class Window(PropertyClass):
 
         return windows
 
+    async def snapshot_ui_tree(self) -> UITreeSnapshot:
+        """
+        Copy this window and all of its descendants into a UITreeSnapshot
+
+        Text is only read for windows with a type name starting with Control
+
+        Examples:
+            .. code-block:: py
+
+                snapshot = await client.root_window.snapshot_ui_tree()
+                snapshot.save("ui.wwui")
+        """
+        base_address = await self._resolve_base_address()
+
+        nodes = await self._read_window_nodes([(base_address, 0, ())], True)
+        async for level in self._walk_levels(nodes, True):
+            nodes.extend(level)
+
+        addresses = [node.window.base_address for node in nodes]
+
+        rectangles = await self.read_many(
+            ((address + _RECTANGLE_OFFSET, _RECTANGLE.size) for address in addresses),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+
+        # TODO: see if all types with .text have Control prefix (see maybe_text)
+        text_rows = [
+            row for row, node in enumerate(nodes) if node.type_name.startswith("Control")
+        ]
+        texts = [""] * len(nodes)
+        for row, text in zip(
+            text_rows,
+            await self.read_wide_strings(
+                (addresses[row] + _TEXT_OFFSET for row in text_rows),
+                max_gap=_MAX_READ_GAP,
+            ),
+        ):
+            texts[row] = text
+
+        rows = {}
+        parents = {}
+        snapshot = UITreeSnapshot()
+        for node, rectangle, text in zip(nodes, rectangles, texts):
+            address = node.window.base_address
+            rows[address] = snapshot.append(
+                address,
+                rows.get(parents.get(address), -1),
+                node.name,
+                node.type_name,
+                node.flags,
+                _RECTANGLE.unpack(rectangle) if rectangle is not None else (0, 0, 0, 0),
+                text,
+            )
+
+            for child in node.children:
+                parents.setdefault(child, address)
+
+        return snapshot
+
     async def get_parents(self) -> List["DynamicWindow"]:
         parents = []
         current = self
@@ -303,14 +627,11 @@ class SpellListControlSpellEntry(DynamicMemoryObject):
         return await self.read_value_from_offset(0x14, "unsigned int")
 
     async def _read_vector(self, address: int, size: int = 3, data_type: str = "float"):
-        type_str = type_format_dict[data_type].replace("<", "")
-        size_per_type = struct.calcsize(type_str)
+        vector_struct = get_vector_struct(data_type, size)
 
-        vector_bytes = await self.read_bytes(
-            address, size_per_type * size
-        )
+        vector_bytes = await self.read_bytes(address, vector_struct.size)
 
-        return struct.unpack("<" + type_str * size, vector_bytes)
+        return vector_struct.unpack(vector_bytes)
 
     async def window_rectangle(self) -> Rectangle:
         rect_addr = await self.read_value_from_offset(0x18, "unsigned long long")
@@ -368,3 +689,181 @@ class DynamicSpellListControl(DynamicWindow, SpellListControl):
 class CurrentRootWindow(Window):
     async def read_base_address(self) -> int:
         return await self.hook_handler.read_current_root_window_base()
+
+
+class WindowIndex:
+    """
+    Name and type name lookups over a window tree that refresh incrementally
+
+    Each refresh reads the children vector of every indexed window and
+    only rewalks subtrees whose children changed, so a window renamed without
+    its parent's children changing keeps its old name in the index, and a window
+    freed and recreated at the same address is kept as it was; use Window.get_windows_with_name
+    where a stale window would be acted on
+
+    Args:
+        root: The window to index the descendants of
+
+    Examples:
+        .. code-block:: py
+
+            index = WindowIndex(client.root_window)
+            await index.refresh()
+            hand = index.get_windows_with_name("Hand")
+    """
+
+    def __init__(self, root: Window):
+        self.root = root
+
+        self._root_address = None
+        # address -> node, the root is included
+        self._nodes: Dict[int, WindowNode] = {}
+        self._parents: Dict[int, int] = {}
+        self._by_name: Dict[str, Dict[int, None]] = {}
+        self._by_type_name: Dict[str, Dict[int, None]] = {}
+
+    def __len__(self) -> int:
+        # the root isn't a descendant
+        return max(len(self._nodes) - 1, 0)
+
+    def _add_node(self, node: WindowNode):
+        address = node.window.base_address
+        self._nodes[address] = node
+
+        for child in node.children:
+            self._parents[child] = address
+
+        if node.depth > 0:
+            self._by_name.setdefault(node.name, {})[address] = None
+            self._by_type_name.setdefault(node.type_name, {})[address] = None
+
+    def _remove_subtree(self, address: int):
+        to_remove = [address]
+        while to_remove:
+            node = self._nodes.pop(to_remove.pop(), None)
+            if node is None:
+                continue
+
+            node_address = node.window.base_address
+            self._by_name.get(node.name, {}).pop(node_address, None)
+            self._by_type_name.get(node.type_name, {}).pop(node_address, None)
+
+            # the subtree root's own parent entry is kept, its parent didn't change
+            for child in node.children:
+                if self._parents.get(child) == node_address:
+                    del self._parents[child]
+
+            to_remove.extend(node.children)
+
+    def _clear(self):
+        self._nodes.clear()
+        self._parents.clear()
+        self._by_name.clear()
+        self._by_type_name.clear()
+
+    async def _walk(self, level: List[WindowNode]):
+        for node in level:
+            self._add_node(node)
+
+        async for child_level in self.root._walk_levels(level, True):
+            for node in child_level:
+                self._add_node(node)
+
+    async def refresh(self) -> int:
+        """
+        Bring the index up to date with the window tree
+
+        Returns:
+            The number of subtrees that were rewalked
+        """
+        root_address = await self.root._resolve_base_address()
+
+        if root_address != self._root_address or not self._nodes:
+            self._clear()
+            self._root_address = root_address
+
+            root_node = await self.root._read_window_nodes([(root_address, 0, ())], True)
+            await self._walk(root_node)
+            return 1
+
+        addresses = list(self._nodes)
+        bounds = await self.root.read_many(
+            ((address + _CHILDREN_OFFSET, _CHILDREN_BOUNDS.size) for address in addresses),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+
+        changed = set()
+        # (address, children vector range) of windows whose bounds didn't change
+        unchanged = []
+        for address, data in zip(addresses, bounds):
+            if data is None or _CHILDREN_BOUNDS.unpack(data) != self._nodes[address].children_bounds:
+                changed.add(address)
+                continue
+
+            start, end = self._nodes[address].children_bounds
+            child_count = (end - start) // 16
+            if 0 < child_count <= _MAX_CHILDREN:
+                unchanged.append((address, (start, child_count * 16)))
+
+        # a child replaced without the vector growing or shrinking keeps the same bounds
+        children_datas = await self.root.read_many(
+            (children_range for _, children_range in unchanged),
+            max_gap=_MAX_READ_GAP,
+            ignore_errors=True,
+        )
+        for (address, _), data in zip(unchanged, children_datas):
+            if (
+                data is None
+                or tuple(memoryview(data).cast("q")[::2]) != self._nodes[address].children
+            ):
+                changed.add(address)
+
+        if not changed:
+            return 0
+
+        # subtrees inside other changed subtrees are rewalked with them
+        subtree_roots = []
+        for address in changed:
+            parent = self._parents.get(address)
+            while parent is not None and parent not in changed:
+                parent = self._parents.get(parent)
+
+            if parent is None:
+                subtree_roots.append(address)
+
+        entries = []
+        for address in subtree_roots:
+            node = self._nodes[address]
+            entries.append((address, node.depth, node.path))
+            self._remove_subtree(address)
+
+        await self._walk(await self.root._read_window_nodes(entries, True))
+        return len(subtree_roots)
+
+    def get_node(self, address: int) -> Optional[WindowNode]:
+        """
+        Get the indexed node of a window
+
+        Args:
+            address: The window's address
+        """
+        return self._nodes.get(address)
+
+    def _sorted_windows(self, addresses: Dict[int, None]) -> List[DynamicWindow]:
+        nodes = [self._nodes[address] for address in addresses]
+        # same order as Window.find_windows
+        nodes.sort(key=lambda node: (node.depth != 1, node.path))
+        return [node.window for node in nodes]
+
+    def get_windows_with_name(self, name: str) -> List[DynamicWindow]:
+        """
+        Get indexed windows with a name, in the same order as Window.get_windows_with_name
+        """
+        return self._sorted_windows(self._by_name.get(name, {}))
+
+    def get_windows_with_type(self, type_name: str) -> List[DynamicWindow]:
+        """
+        Get indexed windows with a type name, in the same order as Window.get_windows_with_type
+        """
+        return self._sorted_windows(self._by_type_name.get(type_name, {}))
@@ -1,14 +1,25 @@
 import asyncio
 import functools
 import regex
-import struct
-from typing import Any, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from weakref import WeakKeyDictionary
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import pefile
-import pymem
-import pymem.exception
-import pymem.process
-import pymem.ressources.structure
 from loguru import logger
 
 from wizwalker import (
@@ -18,9 +29,35 @@ from wizwalker import (
     MemoryWriteError,
     PatternFailed,
     PatternMultipleResults,
-    type_format_dict,
+    type_struct_dict,
     utils,
 )
+from .backends import MemoryBackend, ModuleInfo, PymemBackend
+from .module_image import ModuleImage
+from .page_cache import PageCache
+from .pattern_cache import pattern_cache
+
+if TYPE_CHECKING:
+    import pymem
+
+
+# highest user mode address
+MAX_USER_ADDRESS = 0x7FFFFFFF0000
+# largest number of bytes searched at once while pattern scanning
+SCAN_CHUNK_SIZE = 0x400000
+# bytes read past the end of each chunk so matches crossing chunk boundaries are found
+SCAN_CHUNK_OVERLAP = 0x1000
+
+# per thread reusable read buffers
+_scan_buffers = threading.local()
+
+# backend -> page cache of the innermost open frame; tasks only see frames
+# opened by themselves or by the task that created them
+_frame_caches: ContextVar[Dict[MemoryBackend, PageCache]] = ContextVar(
+    "frame_caches", default={}
+)
+# backend -> page caches of every open frame on it, writes invalidate them all
+_open_page_caches: "WeakKeyDictionary[MemoryBackend, Set[PageCache]]" = WeakKeyDictionary()
 
 
 class MemoryReader:
@@ -28,8 +65,17 @@ class MemoryReader:
     Represents anything that needs to read/write from/to memory
     """
 
-    def __init__(self, process: pymem.Pymem):
-        self.process = process
+    # if single result module scans should be saved to and read from the pattern cache
+    use_pattern_cache = True
+
+    def __init__(self, process: Union["pymem.Pymem", MemoryBackend]):
+        if isinstance(process, MemoryBackend):
+            self.backend = process
+        else:
+            self.backend = PymemBackend(process)
+
+        # the wrapped pymem process if there is one
+        self.process = self.backend.process
 
         self._symbol_table = {}
 
@@ -38,7 +84,67 @@ class MemoryReader:
         """
         If the process we're reading/writing to/from is running
         """
-        return utils.check_if_process_running(self.process.process_handle)
+        return self.backend.is_running()
+
+    @property
+    def page_cache(self) -> Optional[PageCache]:
+        """
+        The page cache of the frame this task has open on this process, None if there isn't one
+        """
+        cache = _frame_caches.get().get(self.backend)
+        if cache is not None and cache.active:
+            return cache
+
+        return None
+
+    @asynccontextmanager
+    async def frame(self):
+        """
+        Cache reads by page until the outermost frame exits
+
+        Frames can be nested and are shared with every reader of this process,
+        but only reads made by the task that opened the frame (and tasks it creates
+        while the frame is open) are cached; other tasks keep reading the process directly
+
+        Examples:
+            .. code-block:: py
+
+                async with client.stats.frame() as cache:
+                    await client.stats.current_hitpoints()
+                    await client.stats.current_mana()
+
+                print(cache.hits, cache.misses)
+
+        Yields:
+            The PageCache
+        """
+        cache = self.page_cache
+        if cache is not None:
+            cache.depth += 1
+            try:
+                yield cache
+            finally:
+                self._close_frame(cache)
+
+            return
+
+        cache = PageCache(self.backend)
+        cache.depth = 1
+        _open_page_caches.setdefault(self.backend, set()).add(cache)
+        token = _frame_caches.set({**_frame_caches.get(), self.backend: cache})
+        try:
+            yield cache
+        finally:
+            _frame_caches.reset(token)
+            self._close_frame(cache)
+
+    def _close_frame(self, cache: PageCache):
+        cache.depth -= 1
+        # tasks created in the frame can still be in a nested frame after the
+        # outermost one exits so whichever frame exits last drops the cache
+        if cache.depth == 0:
+            _open_page_caches[self.backend].discard(cache)
+            cache.clear()
 
     @staticmethod
     async def run_in_executor(func, *args, **kwargs):
@@ -74,67 +180,254 @@ class MemoryReader:
         self._symbol_table[file_path] = symbols
         return symbols
 
+    def _get_scan_regions(
+        self, start: int = 0, end: int = MAX_USER_ADDRESS
+    ) -> List[Tuple[int, int]]:
+        regions = []
+
+        address = start
+        while address < end:
+            region = self.backend.virtual_query(address)
+            region_end = region.base_address + region.size
+
+            # shouldn't happen but would loop forever
+            if region_end <= address:
+                break
+
+            if region.readable:
+                regions.append((address, min(region_end, end) - address))
+
+            address = region_end
+
+        return regions
+
     @staticmethod
-    def _scan_page_return_all(handle, address, pattern):
-        mbi = pymem.memory.virtual_query(handle, address)
-        next_region = mbi.BaseAddress + mbi.RegionSize
-        allowed_protections = [
-            pymem.ressources.structure.MEMORY_PROTECTION.PAGE_EXECUTE_READ,
-            pymem.ressources.structure.MEMORY_PROTECTION.PAGE_EXECUTE_READWRITE,
-            pymem.ressources.structure.MEMORY_PROTECTION.PAGE_READWRITE,
-            pymem.ressources.structure.MEMORY_PROTECTION.PAGE_READONLY,
-        ]
-        if (
-            mbi.state != pymem.ressources.structure.MEMORY_STATE.MEM_COMMIT
-            or mbi.protect not in allowed_protections
-        ):
-            return next_region, None
-
-        page_bytes = pymem.memory.read_bytes(handle, address, mbi.RegionSize)
-
-        found = []
-
-        for match in regex.finditer(pattern, page_bytes, regex.DOTALL):
-            found_address = address + match.span()[0]
-            found.append(found_address)
-
-        return next_region, found
-
-    def _scan_all(
-        self,
-        handle: int,
-        pattern: bytes,
-        return_multiple: bool = False,
-    ):
-        next_region = 0
+    def _split_scan_regions(
+        regions: Iterable[Tuple[int, int]], chunk_size: int, overlap: int
+    ) -> List[Tuple[int, int, int]]:
+        # (address, size matches can start in, size to read)
+        chunks = []
+        for address, size in regions:
+            region_end = address + size
+
+            while address < region_end:
+                match_size = min(chunk_size, region_end - address)
+                read_size = min(match_size + overlap, region_end - address)
+                chunks.append((address, match_size, read_size))
+                address += match_size
+
+        return chunks
+
+    def _scan_chunk(
+        self, compiled_patterns: list, chunk: Tuple[int, int, int]
+    ) -> List[List[Tuple[int, int]]]:
+        address, match_size, read_size = chunk
+
+        buffer = getattr(_scan_buffers, "buffer", None)
+        if buffer is None or len(buffer) < read_size:
+            buffer = _scan_buffers.buffer = bytearray(read_size)
 
-        found = []
-        while next_region < 0x7FFFFFFF0000:
-            next_region, page_found = self._scan_page_return_all(
-                handle, next_region, pattern
-            )
-            if page_found:
-                found += page_found
+        try:
+            self.backend.read_into(address, buffer, read_size)
+        except MemoryReadError:
+            # the region was freed after it was enumerated
+            return [[] for _ in compiled_patterns]
+
+        results = []
+        for compiled_pattern in compiled_patterns:
+            found = []
+            for match in compiled_pattern.finditer(
+                buffer, 0, read_size, concurrent=True
+            ):
+                match_start, match_end = match.span()
+                # matches past this are found by the next chunk
+                if match_start >= match_size:
+                    break
+
+                found.append((address + match_start, match_end - match_start))
+
+            results.append(found)
+
+        return results
 
-            if not return_multiple and found:
+    def _scan_regions(
+        self,
+        patterns: Sequence[bytes],
+        regions: List[Tuple[int, int]],
+        return_multiple: bool = True,
+    ) -> List[List[Tuple[int, int]]]:
+        # (address, match length) for each pattern
+        compiled_patterns = [regex.compile(pattern, regex.DOTALL) for pattern in patterns]
+        chunks = self._split_scan_regions(regions, SCAN_CHUNK_SIZE, SCAN_CHUNK_OVERLAP)
+
+        found = [[] for _ in patterns]
+        if return_multiple and len(chunks) > 1:
+            # reads and regex searches release the gil so chunks can be searched in parallel
+            with ThreadPoolExecutor() as executor:
+                for chunk_found in executor.map(
+                    functools.partial(self._scan_chunk, compiled_patterns), chunks
+                ):
+                    for pattern_found, pattern_chunk_found in zip(found, chunk_found):
+                        pattern_found += pattern_chunk_found
+
+            return found
+
+        region_end = None
+        for chunk in chunks:
+            # stop after the region every pattern was first found in
+            # like the previous scanner did
+            if region_end is not None and chunk[0] >= region_end:
                 break
 
+            chunk_found = self._scan_chunk(compiled_patterns, chunk)
+            for pattern_found, pattern_chunk_found in zip(found, chunk_found):
+                pattern_found += pattern_chunk_found
+
+            if region_end is None and not return_multiple and all(found):
+                region_end = next(
+                    address + size
+                    for address, size in regions
+                    if address <= chunk[0] < address + size
+                )
+
         return found
 
-    def _scan_entire_module(self, handle, module, pattern):
-        base_address = module.lpBaseOfDll
-        max_address = module.lpBaseOfDll + module.SizeOfImage
-        page_address = base_address
+    def _scan(
+        self,
+        patterns: Sequence[bytes],
+        module: Optional[ModuleInfo],
+        return_multiple: bool,
+    ) -> List[List[Tuple[int, int]]]:
+        if module:
+            # modules are always scanned fully
+            return ModuleImage.capture(self.backend, module).scan_many(patterns)
+
+        return self._scan_regions(patterns, self._get_scan_regions(), return_multiple)
+
+    async def _pattern_scan_with_lengths(
+        self,
+        patterns: Sequence[bytes],
+        *,
+        module: str = None,
+        return_multiple: bool = False,
+    ) -> List[List[Tuple[int, int]]]:
+        if module:
+            module_object = self.backend.module_from_name(module)
+
+            if module_object is None:
+                raise ValueError(f"{module} module not found.")
+
+        else:
+            module_object = None
+
+        # this can take a long time to run when collecting multiple results
+        # so must be run in an executor
+        return await self.run_in_executor(
+            self._scan, patterns, module_object, return_multiple
+        )
 
-        found = []
-        while page_address < max_address:
-            page_address, page_found = self._scan_page_return_all(
-                handle, page_address, pattern
+    async def _get_module_key(self, module: ModuleInfo) -> Optional[str]:
+        # the pe timestamp and image size change with every game patch
+        try:
+            pe_header = module.base_address + await self.read_typed(
+                module.base_address + 0x3C, "unsigned int"
             )
-            if page_found:
-                found += page_found
+            timestamp = await self.read_typed(pe_header + 8, "unsigned int")
+            # optional header starts at 24 and SizeOfImage is 56 into it
+            size_of_image = await self.read_typed(pe_header + 80, "unsigned int")
+        except (MemoryReadError, AddressOutOfRange):
+            return None
 
-        return found
+        return f"{module.name.lower()}:{timestamp:08x}:{size_of_image:08x}"
+
+    async def _get_cached_pattern_scan(
+        self, pattern: bytes, module: str
+    ) -> Optional[Tuple[int, int]]:
+        module_object = self.backend.module_from_name(module)
+        if module_object is None:
+            return None
+
+        module_key = await self._get_module_key(module_object)
+        if module_key is None:
+            return None
+
+        entry = await pattern_cache.get(module_key, pattern)
+        if entry is None:
+            return None
+
+        offset, length = entry
+        address = module_object.base_address + offset
+
+        # make sure the bytes still match before trusting the entry
+        try:
+            data = await self.read_bytes(address, length)
+        except (MemoryReadError, AddressOutOfRange):
+            data = b""
+
+        if not regex.fullmatch(pattern, data, regex.DOTALL):
+            await pattern_cache.remove(module_key, pattern)
+            return None
+
+        return address, length
+
+    async def _cache_pattern_scan(
+        self, pattern: bytes, module: str, address: int, length: int
+    ):
+        await self._cache_pattern_scans(module, {pattern: (address, length)})
+
+    async def _cache_pattern_scans(
+        self, module: str, results: Dict[bytes, Tuple[int, int]]
+    ):
+        module_object = self.backend.module_from_name(module)
+        if module_object is None:
+            return
+
+        module_key = await self._get_module_key(module_object)
+        if module_key is None:
+            return
+
+        await pattern_cache.set_many(
+            module_key,
+            {
+                pattern: (address - module_object.base_address, length)
+                for pattern, (address, length) in results.items()
+            },
+        )
+
+    async def get_module_image(self, module: str) -> ModuleImage:
+        """
+        Read a module's whole image into one buffer
+
+        Args:
+            module: Name of the module
+
+        Raises:
+            ValueError: If the module isn't loaded
+
+        Returns:
+            The ModuleImage
+        """
+        module_object = self.backend.module_from_name(module)
+
+        if module_object is None:
+            raise ValueError(f"{module} module not found.")
+
+        return await self.run_in_executor(
+            ModuleImage.capture, self.backend, module_object
+        )
+
+    @staticmethod
+    def _check_scan_results(
+        pattern: bytes, found_addresses: List[int], return_multiple: bool
+    ) -> Union[list, int]:
+        if (found_length := len(found_addresses)) == 0:
+            raise PatternFailed(pattern)
+        elif found_length > 1 and not return_multiple:
+            raise PatternMultipleResults(f"Got {found_length} results for {pattern}")
+        elif return_multiple:
+            return found_addresses
+        else:
+            return found_addresses[0]
 
     async def pattern_scan(
         self, pattern: bytes, *, module: str = None, return_multiple: bool = False
@@ -154,37 +447,62 @@ class MemoryReader:
         Returns:
             A list of results if return_multple is True otherwise one result
         """
-        if module:
-            module_object = pymem.process.module_from_name(self.process.process_handle, module)
+        use_pattern_cache = module and not return_multiple and self.use_pattern_cache
 
-            if module_object is None:
-                raise ValueError(f"{module} module not found.")
+        if use_pattern_cache:
+            cached = await self._get_cached_pattern_scan(pattern, module)
+            if cached is not None:
+                return cached[0]
 
-            # this can take a long time to run when collecting multiple results
-            # so must be run in an executor
-            found_addresses = await self.run_in_executor(
-                self._scan_entire_module,
-                self.process.process_handle,
-                module_object,
-                pattern,
-            )
+        (found,) = await self._pattern_scan_with_lengths(
+            [pattern], module=module, return_multiple=return_multiple
+        )
+        result = self._check_scan_results(
+            pattern, [address for address, _ in found], return_multiple
+        )
 
-        else:
-            found_addresses = await self.run_in_executor(
-                self._scan_all,
-                self.process.process_handle,
-                pattern,
+        if use_pattern_cache:
+            await self._cache_pattern_scan(pattern, module, *found[0])
+
+        return result
+
+    async def pattern_scan_many(
+        self,
+        patterns: Dict[str, bytes],
+        *,
+        module: str = None,
+        return_multiple: bool = False,
+    ) -> Dict[str, Union[list, int]]:
+        """
+        Scan for multiple patterns while only reading memory once
+
+        Args:
+            patterns: Mapping of names to byte patterns to search for
+            module: What module to search or None to search all
+            return_multiple: If multiple results should be returned
+
+        Raises:
+            PatternFailed: If a pattern returned no results
+            PatternMultipleResults: If a pattern returned multiple results and return_multple is False
+
+        Returns:
+            Mapping of names to a list of results if return_multple is True otherwise one result
+        """
+        names = list(patterns)
+        found = await self._pattern_scan_with_lengths(
+            [patterns[name] for name in names],
+            module=module,
+            return_multiple=return_multiple,
+        )
+
+        return {
+            name: self._check_scan_results(
+                patterns[name],
+                [address for address, _ in pattern_found],
                 return_multiple,
             )
-
-        if (found_length := len(found_addresses)) == 0:
-            raise PatternFailed(pattern)
-        elif found_length > 1 and not return_multiple:
-            raise PatternMultipleResults(f"Got {found_length} results for {pattern}")
-        elif return_multiple:
-            return found_addresses
-        else:
-            return found_addresses[0]
+            for name, pattern_found in zip(names, found)
+        }
 
     async def get_address_from_symbol(
         self,
@@ -224,11 +542,11 @@ class MemoryReader:
         if not (symbol := symbols.get(symbol_name)):
             raise ValueError(f"No symbol named {symbol_name} in module {module_name}")
 
-        module = pymem.process.module_from_name(
-            self.process.process_handle, module_name
-        )
+        module = self.backend.module_from_name(module_name)
+        if module is None:
+            raise ValueError(f"{module_name} module not found.")
 
-        return module.lpBaseOfDll + symbol
+        return module.base_address + symbol
 
     async def allocate(self, size: int) -> int:
         """
@@ -240,7 +558,7 @@ class MemoryReader:
         Returns:
             The allocated address
         """
-        return self.process.allocate(size)
+        return self.backend.allocate(size)
 
     async def free(self, address: int):
         """
@@ -249,7 +567,7 @@ class MemoryReader:
         Args:
              address: The address to free
         """
-        self.process.free(address)
+        self.backend.free(address)
 
     # TODO: figure out how params works
     async def start_thread(self, address: int):
@@ -259,7 +577,7 @@ class MemoryReader:
         Args:
             address: The address to start the thread at
         """
-        await self.run_in_executor(self.process.start_thread, address)
+        await self.run_in_executor(self.backend.start_thread, address)
 
     async def read_bytes(self, address: int, size: int) -> bytes:
         """
@@ -277,15 +595,139 @@ class MemoryReader:
         if not 0 < address <= 0x7FFFFFFFFFFFFFFF:
             raise AddressOutOfRange(address)
 
+        cache = self.page_cache
         try:
-            return self.process.read_bytes(address, size)
-        except pymem.exception.MemoryReadError:
+            if cache is not None:
+                return cache.read(address, size)
+
+            return self.backend.read_bytes(address, size)
+        except MemoryReadError:
             # we don't want to run is running for every read
             # so we just check after we error
             if not self.is_running():
                 raise ClientClosedError()
             else:
-                raise MemoryReadError(address)
+                raise
+
+    async def read_many(
+        self,
+        ranges: Iterable[Tuple[int, int]],
+        *,
+        max_gap: int = 0,
+        ignore_errors: bool = False,
+    ) -> List[Optional[bytes]]:
+        """
+        Read multiple ranges of memory, coalescing adjacent or overlapping
+        ranges into as few process reads as possible
+
+        Args:
+            ranges: (address, size) pairs to read
+            max_gap: Largest number of unrequested bytes between two ranges
+                for them to still be read together
+            ignore_errors: If ranges that can't be read should be None instead of raising
+
+        Raises:
+            ClientClosedError: If the client is closed
+            MemoryReadError: If there was an error reading memory and ignore_errors is False
+            AddressOutOfRange: If an address is out of bounds and ignore_errors is False
+
+        Returns:
+            The read bytes for each range in the order they were passed
+        """
+        ranges = list(ranges)
+        results = [None] * len(ranges)
+
+        # [start, end, range indexes]
+        groups = []
+        for idx in sorted(range(len(ranges)), key=lambda i: ranges[i][0]):
+            address, size = ranges[idx]
+
+            if size <= 0:
+                results[idx] = b""
+                continue
+
+            if groups and address <= groups[-1][1] + max_gap:
+                group = groups[-1]
+                group[1] = max(group[1], address + size)
+                group[2].append(idx)
+            else:
+                groups.append([address, address + size, [idx]])
+
+        for start, end, indexes in groups:
+            try:
+                data = await self.read_bytes(start, end - start)
+            except MemoryReadError:
+                if len(indexes) == 1:
+                    if ignore_errors:
+                        continue
+
+                    raise
+
+                # the merged read might have crossed into unreadable memory
+                # so each range is retried on its own
+                for idx in indexes:
+                    address, size = ranges[idx]
+                    try:
+                        results[idx] = await self.read_bytes(address, size)
+                    except MemoryReadError:
+                        if not ignore_errors:
+                            raise
+
+                continue
+
+            for idx in indexes:
+                address, size = ranges[idx]
+                data_offset = address - start
+                results[idx] = data[data_offset : data_offset + size]
+
+        return results
+
+    async def read_typed_many(
+        self,
+        reads: Iterable[Tuple[int, str]],
+        *,
+        max_gap: int = 0,
+        ignore_errors: bool = False,
+    ) -> List[Any]:
+        """
+        Read multiple typed values from memory with as few process reads as possible
+
+        Args:
+            reads: (address, data_type) pairs to read (data types defined in constants)
+            max_gap: Largest number of unrequested bytes between two values
+                for them to still be read together
+            ignore_errors: If values that can't be read should be None instead of raising
+
+        Returns:
+            The converted values in the order they were passed
+        """
+        reads = list(reads)
+
+        type_structs = []
+        for _, data_type in reads:
+            type_struct = type_struct_dict.get(data_type)
+            if type_struct is None:
+                raise ValueError(f"{data_type} is not a valid data type")
+
+            type_structs.append(type_struct)
+
+        datas = await self.read_many(
+            (
+                (address, type_struct.size)
+                for (address, _), type_struct in zip(reads, type_structs)
+            ),
+            max_gap=max_gap,
+            ignore_errors=ignore_errors,
+        )
+
+        values = []
+        for data, type_struct in zip(datas, type_structs):
+            if data is None:
+                values.append(None)
+            else:
+                values.append(type_struct.unpack(data)[0])
+
+        return values
 
     async def write_bytes(self, address: int, value: bytes):
         """
@@ -295,16 +737,18 @@ class MemoryReader:
             address: The address to write to
             value: The bytes to write
         """
-        size = len(value)
+        # every task's open frame could have the written pages
+        for cache in _open_page_caches.get(self.backend, ()):
+            cache.invalidate(address, len(value))
 
         try:
-            self.process.write_bytes(address, value, size)
-        except pymem.exception.MemoryWriteError:
+            self.backend.write_bytes(address, value)
+        except MemoryWriteError:
             # see read_bytes
             if not self.is_running():
                 raise ClientClosedError()
             else:
-                raise MemoryWriteError(address)
+                raise
 
     async def read_typed(self, address: int, data_type: str) -> Any:
         """
@@ -317,12 +761,12 @@ class MemoryReader:
         Returns:
             The converted data type
         """
-        type_format = type_format_dict.get(data_type)
-        if type_format is None:
+        type_struct = type_struct_dict.get(data_type)
+        if type_struct is None:
             raise ValueError(f"{data_type} is not a valid data type")
 
-        data = await self.read_bytes(address, struct.calcsize(type_format))
-        return struct.unpack(type_format, data)[0]
+        data = await self.read_bytes(address, type_struct.size)
+        return type_struct.unpack(data)[0]
 
     async def write_typed(self, address: int, value: Any, data_type: str):
         """
@@ -333,9 +777,9 @@ class MemoryReader:
             value: The value to convert and then write
             data_type: The data type to convert to
         """
-        type_format = type_format_dict.get(data_type)
-        if type_format is None:
+        type_struct = type_struct_dict.get(data_type)
+        if type_struct is None:
             raise ValueError(f"{data_type} is not a valid data type")
 
-        packed_data = struct.pack(type_format, value)
+        packed_data = type_struct.pack(value)
         await self.write_bytes(address, packed_data)
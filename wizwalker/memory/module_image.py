@@ -0,0 +1,229 @@
+import struct
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import regex
+
+from wizwalker import MemoryReadError, type_struct_dict
+from .backends import MemoryBackend, ModuleInfo
+
+
+_section_header = struct.Struct("<8sIIIIIIHHI")
+
+
+class SectionInfo(NamedTuple):
+    """
+    A section of a module's image
+
+    Args:
+        name: Name of the section
+        offset: Offset of the section from the module base (its rva)
+        size: Size of the section when mapped
+        characteristics: The section's characteristics flags
+    """
+
+    name: str
+    offset: int
+    size: int
+    characteristics: int
+
+
+class ModuleImage:
+    """
+    A copy of a module's mapped image in a single buffer
+
+    Args:
+        module: The module the image is of
+        data: The image bytes
+    """
+
+    def __init__(self, module: ModuleInfo, data: bytearray):
+        self.module = module
+        self.data = data
+        self.view = memoryview(data)
+
+        self.sections = self._parse_sections()
+
+    @property
+    def base_address(self) -> int:
+        return self.module.base_address
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @classmethod
+    def capture(cls, backend: MemoryBackend, module: ModuleInfo) -> "ModuleImage":
+        """
+        Read a module's image, unreadable parts are left zeroed
+
+        Args:
+            backend: The backend to read from
+            module: The module to read
+        """
+        data = bytearray(module.size)
+        view = memoryview(data)
+
+        module_end = module.base_address + module.size
+        address = module.base_address
+        while address < module_end:
+            region = backend.virtual_query(address)
+            region_end = min(region.base_address + region.size, module_end)
+
+            # shouldn't happen but would loop forever
+            if region_end <= address:
+                break
+
+            if region.readable:
+                offset = address - module.base_address
+                try:
+                    backend.read_into(
+                        address,
+                        view[offset : offset + region_end - address],
+                        region_end - address,
+                    )
+                except MemoryReadError:
+                    pass
+
+            address = region_end
+
+        return cls(module, data)
+
+    def _parse_sections(self) -> Dict[str, SectionInfo]:
+        try:
+            pe_header = type_struct_dict["unsigned int"].unpack_from(self.data, 0x3C)[0]
+            if self.data[pe_header : pe_header + 4] != b"PE\x00\x00":
+                return {}
+
+            section_count = struct.unpack_from("<H", self.data, pe_header + 6)[0]
+            optional_header_size = struct.unpack_from("<H", self.data, pe_header + 20)[0]
+
+            sections = {}
+            section_table = pe_header + 24 + optional_header_size
+            for index in range(section_count):
+                (
+                    raw_name,
+                    virtual_size,
+                    virtual_address,
+                    *_,
+                    characteristics,
+                ) = _section_header.unpack_from(
+                    self.data, section_table + index * _section_header.size
+                )
+
+                name = raw_name.rstrip(b"\x00").decode(errors="replace")
+                sections[name] = SectionInfo(
+                    name, virtual_address, virtual_size, characteristics
+                )
+        except struct.error:
+            return {}
+
+        return sections
+
+    def contains(self, address: int) -> bool:
+        """
+        If an address is inside this image
+        """
+        return self.base_address <= address < self.base_address + self.size
+
+    def address_to_offset(self, address: int) -> int:
+        """
+        Convert an address in the module to an offset into the image
+
+        Raises:
+            ValueError: If the address is outside of the module
+        """
+        if not self.contains(address):
+            raise ValueError(f"{hex(address)} is not in {self.module.name}")
+
+        return address - self.base_address
+
+    def offset_to_address(self, offset: int) -> int:
+        """
+        Convert an offset into the image to an address
+        """
+        return self.base_address + offset
+
+    def section_view(self, name: str) -> memoryview:
+        """
+        Get a view of a section without copying it
+
+        Raises:
+            ValueError: If there is no section with that name
+        """
+        section = self.sections.get(name)
+        if section is None:
+            raise ValueError(f"{self.module.name} has no section named {name}")
+
+        return self.view[section.offset : section.offset + section.size]
+
+    def read_bytes(self, address: int, size: int) -> bytes:
+        """
+        Read bytes from the image by address
+        """
+        offset = self.address_to_offset(address)
+        if offset + size > self.size:
+            raise ValueError(f"{hex(address)} + {size} is past the end of {self.module.name}")
+
+        return bytes(self.view[offset : offset + size])
+
+    def read_typed(self, address: int, data_type: str) -> Any:
+        """
+        Read a typed value from the image by address
+        """
+        type_struct = type_struct_dict.get(data_type)
+        if type_struct is None:
+            raise ValueError(f"{data_type} is not a valid data type")
+
+        return type_struct.unpack_from(self.data, self.address_to_offset(address))[0]
+
+    def _get_bounds(self, section: Optional[str]) -> Tuple[int, int]:
+        if section is None:
+            return 0, self.size
+
+        section_info = self.sections.get(section)
+        if section_info is None:
+            raise ValueError(f"{self.module.name} has no section named {section}")
+
+        return section_info.offset, min(section_info.offset + section_info.size, self.size)
+
+    def scan_many(
+        self, patterns: Sequence[bytes], *, section: str = None
+    ) -> List[List[Tuple[int, int]]]:
+        """
+        Search the image for multiple patterns
+
+        Args:
+            patterns: The patterns to search for
+            section: Only search this section
+
+        Returns:
+            (address, match length) pairs for each pattern
+        """
+        start, end = self._get_bounds(section)
+
+        results = []
+        for pattern in patterns:
+            compiled_pattern = regex.compile(pattern, regex.DOTALL)
+            results.append(
+                [
+                    (self.base_address + match.start(), match.end() - match.start())
+                    for match in compiled_pattern.finditer(
+                        self.data, start, end, concurrent=True
+                    )
+                ]
+            )
+
+        return results
+
+    def scan(self, pattern: bytes, *, section: str = None) -> List[int]:
+        """
+        Search the image for a pattern
+
+        Args:
+            pattern: The pattern to search for
+            section: Only search this section
+
+        Returns:
+            Addresses of every match
+        """
+        return [address for address, _ in self.scan_many([pattern], section=section)[0]]
@@ -0,0 +1,143 @@
+from typing import Dict
+
+from wizwalker import MemoryReadError
+
+
+PAGE_SIZE = 0x1000
+
+
+class PageCache:
+    """
+    Page granular read cache of one MemoryReader.frame
+
+    The cache is only used by the task that opened the frame (and tasks it created)
+    while the frame is open, pages are dropped when the outermost frame closes
+
+    Args:
+        backend: The backend to read pages from
+        page_size: Size of a page, must be a power of two
+    """
+
+    def __init__(self, backend, *, page_size: int = PAGE_SIZE):
+        if page_size <= 0 or page_size & (page_size - 1):
+            raise ValueError(f"Page size must be a power of two not {page_size}")
+
+        self.backend = backend
+        self.page_size = page_size
+
+        self.pages: Dict[int, bytes] = {}
+        self.depth = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def active(self) -> bool:
+        """
+        If a frame is currently open
+        """
+        return self.depth > 0
+
+    def reset_stats(self):
+        """
+        Reset the hit and miss counters
+        """
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """
+        Drop all cached pages
+        """
+        self.pages.clear()
+
+    def invalidate(self, address: int, size: int):
+        """
+        Drop cached pages overlapping a range
+
+        Args:
+            address: Start of the range
+            size: Size of the range
+        """
+        if not self.pages or size <= 0:
+            return
+
+        mask = ~(self.page_size - 1)
+        for page_address in range(
+            address & mask, ((address + size - 1) & mask) + 1, self.page_size
+        ):
+            self.pages.pop(page_address, None)
+
+    def _load_pages(self, start: int, count: int):
+        data = self.backend.read_bytes(start, count * self.page_size)
+
+        for index in range(count):
+            data_offset = index * self.page_size
+            self.pages[start + data_offset] = data[
+                data_offset : data_offset + self.page_size
+            ]
+
+    def read(self, address: int, size: int) -> bytes:
+        """
+        Read through the cache
+
+        Args:
+            address: The address to read from
+            size: The number of bytes to read
+
+        Raises:
+            MemoryReadError: If the range can't be read
+        """
+        page_size = self.page_size
+        mask = ~(page_size - 1)
+        first_page = address & mask
+        last_page = (address + size - 1) & mask
+
+        # most reads are small and stay within one page
+        if first_page == last_page:
+            page = self.pages.get(first_page)
+            if page is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                try:
+                    self._load_pages(first_page, 1)
+                except MemoryReadError:
+                    # the page is only partially readable
+                    return self.backend.read_bytes(address, size)
+
+                page = self.pages[first_page]
+
+            page_offset = address - first_page
+            return page[page_offset : page_offset + size]
+
+        page_addresses = range(first_page, last_page + 1, page_size)
+
+        # load each run of missing pages with one read
+        run_start = None
+        run_length = 0
+        try:
+            for page_address in page_addresses:
+                if page_address in self.pages:
+                    self.hits += 1
+                    if run_start is not None:
+                        self._load_pages(run_start, run_length)
+                        run_start = None
+
+                    continue
+
+                self.misses += 1
+                if run_start is None:
+                    run_start = page_address
+                    run_length = 1
+                else:
+                    run_length += 1
+
+            if run_start is not None:
+                self._load_pages(run_start, run_length)
+        except MemoryReadError:
+            return self.backend.read_bytes(address, size)
+
+        data = b"".join(self.pages[page_address] for page_address in page_addresses)
+        data_offset = address - first_page
+        return data[data_offset : data_offset + size]
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import aiofiles
+
+from wizwalker import utils
+
+
+class PatternCache:
+    """
+    Module relative pattern scan results saved across runs
+
+    Entries are keyed by a module key (see MemoryReader._get_module_key) so a game
+    patch starts a new set of entries
+
+    Args:
+        path: File to store the cache in, defaults to pattern_cache.json in the cache folder
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path
+        # {module key: {pattern hex: [offset, length]}}
+        self._entries: Optional[Dict[str, Dict[str, list]]] = None
+        self._lock = None
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            self._path = utils.get_cache_folder() / "pattern_cache.json"
+
+        return self._path
+
+    async def _load(self):
+        if self._entries is not None:
+            return
+
+        try:
+            async with aiofiles.open(self.path) as fp:
+                data = await fp.read()
+
+            entries = json.loads(data)
+        except (OSError, ValueError):
+            entries = {}
+
+        if not isinstance(entries, dict):
+            entries = {}
+
+        # another call could have loaded and changed them while this one read the file
+        if self._entries is None:
+            self._entries = entries
+
+    async def get(self, module_key: str, pattern: bytes) -> Optional[Tuple[int, int]]:
+        """
+        Get a cached result
+
+        Args:
+            module_key: Key of the module the pattern was scanned in
+            pattern: The pattern
+
+        Returns:
+            (module offset, match length) or None if there is no entry
+        """
+        await self._load()
+
+        entry = self._entries.get(module_key, {}).get(pattern.hex())
+        if entry is None:
+            return None
+
+        offset, length = entry
+        return offset, length
+
+    async def set(self, module_key: str, pattern: bytes, offset: int, length: int):
+        """
+        Save a result
+
+        Args:
+            module_key: Key of the module the pattern was scanned in
+            pattern: The pattern
+            offset: Offset of the match from the module's base address
+            length: Length of the match
+        """
+        await self.set_many(module_key, {pattern: (offset, length)})
+
+    async def set_many(self, module_key: str, results: Dict[bytes, Tuple[int, int]]):
+        """
+        Save the results of several patterns scanned in the same module
+        with one write of the cache file
+
+        Args:
+            module_key: Key of the module the patterns were scanned in
+            results: Mapping of patterns to (module offset, match length)
+        """
+        if not results:
+            return
+
+        await self._load()
+
+        # entries for older versions of the module are dropped
+        module_name = module_key.split(":", 1)[0]
+        for key in list(self._entries):
+            if key != module_key and key.split(":", 1)[0] == module_name:
+                del self._entries[key]
+
+        module_entries = self._entries.setdefault(module_key, {})
+        for pattern, (offset, length) in results.items():
+            module_entries[pattern.hex()] = [offset, length]
+
+        await self.save()
+
+    async def remove(self, module_key: str, pattern: bytes):
+        """
+        Remove an entry that turned out to be invalid
+        """
+        await self._load()
+
+        if self._entries.get(module_key, {}).pop(pattern.hex(), None) is not None:
+            await self.save()
+
+    async def save(self):
+        """
+        Write the cache file
+        """
+        await self._load()
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            data = json.dumps(self._entries)
+
+            # every client's process shares the file so it's replaced whole
+            # instead of rewritten in place where another process could read half of it
+            fd, temp_path = tempfile.mkstemp(
+                prefix=f"{self.path.name}.", suffix=".tmp", dir=self.path.parent
+            )
+            os.close(fd)
+            try:
+                async with aiofiles.open(temp_path, "w") as fp:
+                    await fp.write(data)
+
+                os.replace(temp_path, self.path)
+            except OSError:
+                # another process is replacing it, the cache is only an optimization
+                with suppress(OSError):
+                    os.remove(temp_path)
+
+
+# shared by every client
+pattern_cache = PatternCache()
@@ -68,6 +68,7 @@ class MouseHandler:
         Raises:
             ValueError: If no or too many windows where found
         """
+        # a full walk so renamed or recreated windows aren't missed like with window_index
         possible_window = await self.client.root_window.get_windows_with_name(name)
 
         if not possible_window:
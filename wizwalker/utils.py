@@ -5,9 +5,7 @@ import io
 import math
 import struct
 import subprocess
-
-# noinspection PyCompatibility
-import winreg
+import sys
 import zlib
 from pathlib import Path
 from typing import Any, Callable, Iterable, List, Optional
@@ -17,6 +15,10 @@ import appdirs
 from wizwalker import ExceptionalTimeout
 from wizwalker.constants import Keycode, kernel32, user32, gdi32
 
+if sys.platform == "win32":
+    # noinspection PyCompatibility
+    import winreg
+
 
 DEFAULT_INSTALL = "C:/ProgramData/KingsIsle Entertainment/Wizard101"
 